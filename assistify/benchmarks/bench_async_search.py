@@ -0,0 +1,135 @@
+"""
+Concurrent search benchmark: a thread per query with blocking ``requests``
+(how ``main.py`` used to search) against ``AsyncSearchManager`` on one
+event loop, both hitting a local server that answers with fixed latency.
+
+    python -m benchmarks.bench_async_search --queries 200 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+import requests
+from benchmarks import corpus
+from modules.async_search import AsyncHTTPClient, AsyncSearchManager
+from modules.search import WebSearch, YouTubeSearch
+from modules.wikipedia_client import WikipediaClient
+
+
+def start_server(latency):
+    """
+    Serve the saved result pages and a MediaWiki-style JSON reply after ``latency`` seconds.
+
+    Returns:
+        tuple: (base URL, stop function)
+    """
+    from aiohttp import web
+
+    pages = {name: corpus.load_html(name) for name in ("bing", "youtube")}
+    wiki = {"query": {"pages": [{"index": 1, "title": "Benchmark", "extract": "Benchmark summary."}]}}
+
+    async def page(request):
+        await asyncio.sleep(latency)
+        return web.Response(text=pages[request.match_info["name"]], content_type="text/html")
+
+    async def api(request):
+        await asyncio.sleep(latency)
+        return web.json_response(wiki)
+
+    app = web.Application()
+    app.router.add_get("/api.php", api)
+    app.router.add_get("/{name}", page)
+
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(app)
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    loop.run_until_complete(site.start())
+    port = site._server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    def stop():
+        asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+    return f"http://127.0.0.1:{port}", stop
+
+
+def threaded_search(base, queries):
+    """One thread per query, each source fetched in turn with ``requests``."""
+    peak = [threading.active_count()]
+
+    def search(query):
+        requests.get(f"{base}/api.php", params={"q": query}, timeout=30).json()
+        WebSearch.parse_bing(requests.get(f"{base}/bing", params={"q": query}, timeout=30).text)
+        YouTubeSearch.parse_results_page(requests.get(f"{base}/youtube", params={"q": query}, timeout=30).text)
+
+    threads = [threading.Thread(target=search, args=(q,), daemon=True) for q in queries]
+    for thread in threads:
+        thread.start()
+    peak[0] = max(peak[0], threading.active_count())
+    for thread in threads:
+        thread.join()
+    return peak[0]
+
+
+def async_search(base, queries, concurrency):
+    """All queries on one event loop through the shared client (one host, so the per-host cap is lifted)."""
+    async def search_all():
+        manager = AsyncSearchManager(AsyncHTTPClient(concurrency, max_connections=concurrency, max_per_host=concurrency))
+        manager.wikipedia.wiki = WikipediaClient(f"{base}/api.php")
+        client = manager.client
+
+        async def one(query):
+            await manager.wikipedia.get_summary(query)
+            WebSearch.parse_bing((await client.get_text(f"{base}/bing", params={"q": query}))[1])
+            YouTubeSearch.parse_results_page((await client.get_text(f"{base}/youtube", params={"q": query}))[1])
+
+        try:
+            await asyncio.gather(*(one(q) for q in queries))
+        finally:
+            await manager.close()
+        return threading.active_count()
+    return asyncio.run(search_all())
+
+
+def run(queries=200, latency=0.2, concurrency=200):
+    """
+    Time both approaches on the same workload.
+
+    Returns:
+        dict: Mapping of approach to seconds, queries/sec and peak thread count
+    """
+    base, stop = start_server(latency)
+    names = [f"query {i}" for i in range(queries)]
+    results = {}
+    try:
+        for label, func in (("threads + requests", lambda: threaded_search(base, names)),
+                            ("asyncio + aiohttp", lambda: async_search(base, names, concurrency))):
+            start = time.perf_counter()
+            threads = func()
+            seconds = time.perf_counter() - start
+            results[label] = {"seconds": seconds, "queries_per_sec": queries / seconds, "threads": threads}
+    finally:
+        stop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent search: threads against asyncio")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated server latency (s)")
+    parser.add_argument("--concurrency", type=int, default=200, help="Async requests in flight")
+    args = parser.parse_args()
+
+    results = run(args.queries, args.latency, args.concurrency)
+    print(f"\n{args.queries} queries x 3 sources, {args.latency * 1000:.0f} ms simulated latency")
+    print(f"{'approach':<22}{'seconds':>10}{'queries/s':>12}{'peak threads':>14}")
+    for label, r in results.items():
+        print(f"{label:<22}{r['seconds']:>10.2f}{r['queries_per_sec']:>12.1f}{r['threads']:>14}")
+
+
+if __name__ == "__main__":
+    main()
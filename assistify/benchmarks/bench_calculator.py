@@ -0,0 +1,55 @@
+"""
+Calculator benchmark: the original regex + ``eval`` path against the
+cached expression engine.
+"""
+
+import math
+import re
+from utils.calculator import ExpressionEngine
+from benchmarks.harness import measure, report
+
+EXPRESSIONS = [
+    "2 + 3 * 4",
+    "(12.5 - 3) / 4",
+    "2 ** 10 + 7 // 2",
+    "((1 + 2) * (3 + 4) - 5) / 6",
+    "100 - 99 + 98 - 97 + 96 - 95 + 94 - 93",
+]
+
+
+def legacy_safe_eval(expr):
+    """The regex-checked ``eval`` path the engine replaced."""
+    if not re.match(r"^[\d+\-*/().\s]+$", expr):
+        return None
+    try:
+        return eval(expr, {"__builtins__": None}, {"sqrt": math.sqrt, "pow": pow})
+    except Exception:
+        return None
+
+
+def run(number=2000):
+    """
+    Run the calculator benchmark.
+    
+    Returns:
+        dict: Mapping of case name to timing stats
+    """
+    cached = ExpressionEngine()
+    uncached = ExpressionEngine(cache_size=0)
+    
+    def run_all(evaluate):
+        return lambda: [evaluate(e) for e in EXPRESSIONS]
+    
+    return {
+        "legacy eval": measure(run_all(legacy_safe_eval), number=number),
+        "engine (no cache)": measure(run_all(uncached.evaluate), number=number),
+        "engine (cached)": measure(run_all(cached.evaluate), number=number),
+    }
+
+
+def main():
+    report(f"Calculator: {len(EXPRESSIONS)} expressions per call", run())
+
+
+if __name__ == "__main__":
+    main()
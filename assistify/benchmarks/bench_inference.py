@@ -0,0 +1,139 @@
+"""
+Inference thread sweep: summarization latency for torch intra-/inter-op
+thread counts, with and without pinning to cores, to find the best
+``INFERENCE_*`` settings for this machine.
+
+    python -m benchmarks.bench_inference
+    python -m benchmarks.bench_inference --interop 1 2 --pin --busy 2
+    python -m benchmarks.bench_inference --model facebook/bart-large-cnn --repeat 3
+
+Each configuration runs in a fresh interpreter, since torch only accepts
+its inter-op thread count before the first model call. ``--busy`` spins
+Python threads next to the model to stand in for the UI, speech and
+search threads.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from config.settings import BENCH_SUMMARIZER_MODEL
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _busy(stop):
+    """Pure Python work that holds the GIL between model ops."""
+    n = 0
+    while not stop.is_set():
+        n = (n * 31 + 7) % 1000003
+
+
+def run_config(model, threads, interop, cores, repeat, busy):
+    """
+    Time ``AISummarizer.summarize`` in this process with one configuration.
+
+    Returns:
+        dict: 'median_s', 'min_s' and the resolved 'plan'
+    """
+    from benchmarks import corpus
+    from modules.pdf_summarizer import AISummarizer
+    from utils.inference import InferenceResources
+    resources = InferenceResources(threads=threads, interop_threads=interop, cores=cores, reserved=0)
+    summarizer = AISummarizer(model, resources=resources, profile="quality")
+    text = "\n".join(line for page in corpus.document_text(2) for line in page)
+    summarizer.summarize(text)  # load and warm up
+
+    stop = threading.Event()
+    workers = [threading.Thread(target=_busy, args=(stop,), daemon=True) for _ in range(busy)]
+    for worker in workers:
+        worker.start()
+    times = []
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            summarizer.summarize(text)
+            times.append(time.perf_counter() - start)
+    finally:
+        stop.set()
+    return {"median_s": statistics.median(times), "min_s": min(times), "plan": resources.plan()}
+
+
+def sweep_configs(interops, pin):
+    """Thread counts (powers of two, the physical and the logical core count) x inter-op x pinning."""
+    from utils.inference import available_cores, physical_cores
+    cores = available_cores()
+    counts = {len(cores), physical_cores(cores)}
+    count = 1
+    while count < len(cores):
+        counts.add(count)
+        count *= 2
+    configs = []
+    for threads in sorted(counts):
+        for interop in interops:
+            configs.append((threads, interop, None))
+            if pin and threads < len(cores):
+                configs.append((threads, interop, ",".join(str(c) for c in cores[:threads])))
+    return configs
+
+
+def measure_config(model, threads, interop, cores, repeat, busy):
+    """Run one configuration in a fresh interpreter."""
+    args = [sys.executable, "-m", "benchmarks.bench_inference", "--child", "--model", model,
+            "--threads", str(threads), "--interop", str(interop), "--repeat", str(repeat), "--busy", str(busy)]
+    if cores:
+        args += ["--cores", cores]
+    proc = subprocess.run(args, cwd=APP_DIR, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "child failed")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Torch inference thread sweep")
+    parser.add_argument("--model", default=BENCH_SUMMARIZER_MODEL, help="Summarization model")
+    parser.add_argument("--interop", type=int, nargs="+", default=[1], help="Inter-op thread counts to try")
+    parser.add_argument("--pin", action="store_true", help="Also try pinning to the first N cores")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--busy", type=int, default=0, help="Busy Python threads competing with the model")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--threads", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--cores", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_config(args.model, args.threads, args.interop[0], args.cores, args.repeat, args.busy)))
+        return
+
+    missing = [name for name in ("torch", "transformers") if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"Skipped: {', '.join(missing)} not installed")
+        return
+
+    results = []
+    print(f"\nInference sweep ({args.model}, {args.busy} busy threads)")
+    print(f"{'threads':>8}{'interop':>9}{'cores':>12}{'median (s)':>12}{'min (s)':>10}")
+    for threads, interop, cores in sweep_configs(args.interop, args.pin):
+        try:
+            result = measure_config(args.model, threads, interop, cores, args.repeat, args.busy)
+        except RuntimeError as e:
+            print(f"{threads:>8}{interop:>9}{cores or '-':>12}  ❌ {e}")
+            continue
+        results.append((result["median_s"], threads, interop, cores))
+        print(f"{threads:>8}{interop:>9}{cores or '-':>12}{result['median_s']:>12.3f}{result['min_s']:>10.3f}")
+
+    if results:
+        median, threads, interop, cores = min(results)
+        print(f"\nBest: {median:.3f}s. In config/settings.py:")
+        print(f"INFERENCE_THREADS = {threads}")
+        print(f"INFERENCE_INTEROP_THREADS = {interop}")
+        print(f"INFERENCE_CPU_CORES = {cores!r}" if cores else "INFERENCE_CPU_CORES = None")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+OCR fallback benchmark: pages/sec for the scanned pages of a generated PDF
+(every other page an image without a text layer) with OCR in this process
+and across pool sizes, then again from a warm cache, plus word recall
+against the text the pages were drawn from.
+
+    python -m benchmarks.bench_ocr
+    python -m benchmarks.bench_ocr --pages 80 --workers 1 2 4 --dpi 300
+
+Cold cases use a fresh cache directory each, so every scanned page is
+rendered and read; the warm case reuses the last one.
+"""
+
+import argparse
+import importlib.util
+import re
+import shutil
+import tempfile
+import time
+from collections import Counter
+from benchmarks import corpus
+from config.settings import PDF_OCR_WORKERS, PDF_OCR_DPI
+
+
+def word_recall(pages, reference_pages):
+    """Share of reference words (with repeats) found on the OCR pages."""
+    found = Counter(re.findall(r"\w+", " ".join(pages).lower()))
+    wanted = Counter(re.findall(r"\w+", " ".join(" ".join(lines) for lines in reference_pages).lower()))
+    return sum((found & wanted).values()) / max(1, sum(wanted.values()))
+
+
+def run_case(path, scanned, reference, workers, dpi, cache_dir):
+    """
+    Read the PDF with OCR for its empty pages.
+
+    Returns:
+        dict: OCR stats (see ``OCRPipeline.stats``), 'wall_s' and 'recall'
+    """
+    from modules.pdf_ocr import OCRPipeline
+    from modules.pdf_summarizer import PDFProcessor
+    ocr = OCRPipeline(workers=workers, dpi=dpi, cache_dir=cache_dir)
+    start = time.perf_counter()
+    pages = list(ocr.iter_pages(path, PDFProcessor.iter_pages(path)))
+    result = ocr.stats()
+    result["wall_s"] = time.perf_counter() - start
+    result["recall"] = word_recall([pages[i] for i in scanned], reference)
+    return result
+
+
+def run(pages=40, workers=None, dpi=PDF_OCR_DPI):
+    """
+    Run the cold cases and a warm one.
+
+    Args:
+        pages (int): Pages in the generated PDF (half of them scanned)
+        workers (iterable or None): Pool sizes (0: in process; default: 0, 1
+            and powers of two up to ``PDF_OCR_WORKERS``)
+        dpi (int): Render resolution
+
+    Returns:
+        dict: Case name -> result of ``run_case``
+    """
+    if workers is None:
+        workers = [0, 1]
+        while workers[-1] * 2 <= PDF_OCR_WORKERS:
+            workers.append(workers[-1] * 2)
+        if workers[-1] != PDF_OCR_WORKERS:
+            workers.append(PDF_OCR_WORKERS)
+    path = corpus.ensure_scanned_pdf(pages)
+    scanned = list(corpus.scanned_pages(pages))
+    text = corpus.document_text(pages)
+    reference = [text[i] for i in scanned]
+
+    results = {}
+    cache_dir = None
+    try:
+        for count in workers:
+            if cache_dir:
+                shutil.rmtree(cache_dir, ignore_errors=True)
+            cache_dir = tempfile.mkdtemp(prefix="assistify-ocr-")
+            name = "in-process" if count == 0 else f"{count} workers"
+            results[name] = run_case(path, scanned, reference, count, dpi, cache_dir)
+        results["warm cache"] = run_case(path, scanned, reference, workers[-1], dpi, cache_dir)
+    finally:
+        if cache_dir:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR fallback benchmark")
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--workers", type=int, nargs="+", help="Pool sizes (0: in process)")
+    parser.add_argument("--dpi", type=int, default=PDF_OCR_DPI)
+    args = parser.parse_args()
+
+    missing = [name for name in ("PIL", "pypdfium2", "pytesseract") if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"Skipped: {', '.join(missing)} not installed")
+        return
+    from modules.pdf_ocr import ocr_available
+    available, reason = ocr_available()
+    if not available:
+        print(f"Skipped: {reason}")
+        return
+
+    results = run(args.pages, args.workers, args.dpi)
+    print(f"\nOCR fallback, {args.pages} pages ({len(corpus.scanned_pages(args.pages))} scanned, {args.dpi} dpi)")
+    print(f"{'case':<14}{'OCR':>6}{'cached':>8}{'seconds':>10}{'pages/s':>10}{'recall':>8}")
+    for name, r in results.items():
+        print(f"{name:<14}{r['pages']:>6}{r['cached']:>8}{r['seconds']:>10.2f}{r['pages_per_second']:>10.2f}"
+              f"{r['recall']:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+PDF memory benchmark: peak RSS growth while turning a generated long PDF
+into summary chunks, before (whole text and chunk list in memory) and
+after (lazy pages, chunks cut on the fly, parsed objects dropped at the
+limit), and for what a batch worker does with the same PDF.
+
+    python -m benchmarks.bench_pdf_memory --pages 2000
+    python -m benchmarks.bench_pdf_memory --pages 2000 --limit 8
+
+Each case runs in a fresh interpreter so peaks do not carry over.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+from config.settings import PDF_CHUNK_SIZE, PDF_MAX_CHUNKS, PDF_MEMORY_LIMIT_MB
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CASES = ("eager", "lazy", "lazy-limit", "summary-input", "batch-worker")
+
+
+def eager_chunks(path):
+    """The previous pipeline: whole text, then every chunk in a list."""
+    from PyPDF2 import PdfReader
+    reader = PdfReader(path)
+    text = "".join(page + "\n" for page in (p.extract_text() or "" for p in reader.pages) if page)
+    return [text[i:i + PDF_CHUNK_SIZE] for i in range(0, len(text), PDF_CHUNK_SIZE)]
+
+
+def run_case(case, path, limit):
+    """
+    Run one case in this process.
+
+    Returns:
+        dict: 'chunks', 'seconds' and RSS 'growth_mb' (peak minus the RSS before the case)
+    """
+    from modules.pdf_batch import scan_document
+    from modules.pdf_summarizer import PDFProcessor, iter_chunks
+    from utils.memory import rss_mb, peak_rss_mb
+    import PyPDF2  # noqa: F401 - imported before the baseline is taken
+    if case == "batch-worker":
+        from modules.pdf_ocr import ocr_available
+        ocr_available()  # imports the OCR packages (when installed) before the baseline too
+
+    baseline = rss_mb()
+    start = time.perf_counter()
+    if case == "eager":
+        chunks = len(eager_chunks(path))
+    elif case == "batch-worker":
+        scanned = scan_document(path)
+        if scanned["error"]:
+            raise RuntimeError(scanned["error"])
+        # The chunks the summarizer will cut (every page ends in "\n")
+        chunks = -(-(scanned["chars"] + scanned["pages"]) // PDF_CHUNK_SIZE)
+    else:
+        pages = PDFProcessor.iter_pages(path, limit if case == "lazy-limit" else None)
+        stream = iter_chunks(page + "\n" for page in pages if page)
+        if case == "summary-input":
+            stream = itertools.islice(stream, PDF_MAX_CHUNKS)
+        chunks = sum(1 for _ in stream)
+    seconds = time.perf_counter() - start
+    return {"chunks": chunks, "seconds": seconds, "growth_mb": peak_rss_mb() - baseline}
+
+
+def measure_case(case, path, limit):
+    """Run a case in a fresh interpreter and return its result."""
+    proc = subprocess.run([sys.executable, "-m", "benchmarks.bench_pdf_memory", "--child", case,
+                           "--path", path, "--limit", str(limit)], cwd=APP_DIR, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else case)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run(pages=2000, limit=PDF_MEMORY_LIMIT_MB):
+    """
+    Run every case on the generated benchmark PDF.
+
+    Returns:
+        dict: Mapping of case name to result
+    """
+    from benchmarks import corpus
+    path = corpus.ensure_pdf(pages)
+    return {case: measure_case(case, path, limit) for case in CASES}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF memory benchmark")
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--limit", type=float, default=PDF_MEMORY_LIMIT_MB, help="Reader reset limit (MB)")
+    parser.add_argument("--child", choices=CASES, help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_case(args.child, args.path, args.limit)))
+        return
+
+    results = run(args.pages, args.limit)
+    print(f"\nPDF memory, {args.pages} pages (limit {args.limit:g} MB)")
+    print(f"{'case':<20}{'peak growth (MB)':>18}{'seconds':>10}{'chunks':>9}")
+    for case, result in results.items():
+        print(f"{case:<20}{result['growth_mb']:>18.1f}{result['seconds']:>10.2f}{result['chunks']:>9}")
+    print()
+    # The limit applies after the PDF is opened; summary-input is little more than opening it
+    for case in ("lazy-limit", "batch-worker"):
+        growth = results[case]["growth_mb"] - results["summary-input"]["growth_mb"]
+        within = growth <= args.limit
+        print(f"{'✅' if within else '❌'} {case} grew {growth:.1f} MB after opening the PDF "
+              f"({'within' if within else 'above'} the {args.limit:g} MB limit)")
+
+
+if __name__ == "__main__":
+    main()
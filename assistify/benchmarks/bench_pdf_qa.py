@@ -0,0 +1,86 @@
+"""
+PDF question answering benchmark: indexing throughput on the generated
+benchmark PDF and top-k query latency as the memory-mapped index grows.
+
+    python -m benchmarks.bench_pdf_qa                    # hashing embedder
+    python -m benchmarks.bench_pdf_qa --embedder sentence-transformers/all-MiniLM-L6-v2
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+from benchmarks import corpus
+from benchmarks.harness import measure, report
+from modules.pdf_qa import EmbeddingIndex, get_embedder
+
+
+def index_document(embedder, pages, directory):
+    """Index the benchmark PDF once; returns (chunks, seconds)."""
+    index = EmbeddingIndex(directory, embedder)
+    start = time.perf_counter()
+    chunks = index.add_document(corpus.ensure_pdf(pages))
+    return index, chunks, time.perf_counter() - start
+
+
+def grow_index(index, rows):
+    """Append random unit vectors until the index has ``rows`` rows (query cost depends only on size)."""
+    dim = index._load()[0].shape[1]
+    start = len(index)
+    missing = rows - start
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((missing, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    with open(index._vectors_path, "ab") as f:
+        f.write(vectors.tobytes())
+    with open(index._chunks_path, "a", encoding="utf-8") as f:
+        f.write('{"doc": "synthetic", "page": 0, "text": ""}\n' * missing)
+    index.documents[f"synthetic-{rows}"] = {"name": "synthetic", "path": "", "start": start, "count": missing,
+                                            "chunks_end": os.path.getsize(index._chunks_path)}
+    index._matrix, index._chunks = None, None
+
+
+def run(embedder_name="hashing", pages=100, sizes=(10_000, 100_000)):
+    """
+    Run the benchmark.
+
+    Returns:
+        dict: Mapping of case name to timing stats
+    """
+    embedder = get_embedder(embedder_name)
+    directory = tempfile.mkdtemp(prefix="assistify-pdfqa-")
+    results = {}
+    try:
+        index, chunks, seconds = index_document(embedder, pages, directory)
+        results[f"index {pages} pages ({chunks} chunks)"] = {
+            "mean_us": seconds * 1e6, "min_us": seconds * 1e6, "median_us": seconds * 1e6,
+            "max_us": seconds * 1e6, "ops_per_sec": chunks / seconds,
+        }
+        results["skip re-index (hash)"] = measure(lambda: index.add_document(corpus.ensure_pdf(pages)), number=5)
+        question = "which method improved the measurement of the signal"
+        results[f"ask, {len(index):,} chunks"] = measure(lambda: index.search(question), number=20)
+        for rows in sizes:
+            if rows > len(index):
+                grow_index(index, rows)
+                index.search(question)  # map the grown file before timing
+                results[f"ask, {rows:,} chunks"] = measure(lambda: index.search(question), number=20)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF question answering benchmark")
+    parser.add_argument("--embedder", default="hashing", help='"hashing" or a Hugging Face model name')
+    parser.add_argument("--pages", type=int, default=100)
+    args = parser.parse_args()
+    results = run(args.embedder, args.pages)
+    report(f"PDF question answering ({args.embedder})", results)
+    first = next(iter(results))
+    print(f"{first}: {results[first]['ops_per_sec']:,.0f} chunks/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Speech recognition benchmark: replays WAV fixtures through each backend and
+reports latency, real-time factor (processing time / audio length) and
+word error rate against the sidecar ``.txt`` transcripts.
+
+    python -m benchmarks.bench_speech --backends fake vosk --fixtures path/to/wavs
+
+When the fixture directory has no WAV files, synthetic tone fixtures are
+generated so the fake backend can run out of the box; real engines need
+real recordings.
+"""
+
+import argparse
+import math
+import os
+import statistics
+import struct
+import time
+import wave
+from config.settings import FAKE_TRANSCRIPTS_DIR
+from modules.speech_backends import create_backend, FakeBackend
+import speech_recognition as sr
+
+SYNTHETIC_FIXTURES = {
+    "hello": "hello how are you",
+    "add_task": "add task buy milk by tomorrow",
+    "calculate": "what is twelve plus seven",
+}
+
+
+def make_synthetic_fixtures(directory, sample_rate=16000):
+    """Write short tone WAVs with transcripts (for the fake backend only)."""
+    os.makedirs(directory, exist_ok=True)
+    for i, (name, transcript) in enumerate(SYNTHETIC_FIXTURES.items()):
+        frequency = 220 * (i + 1)
+        frames = b"".join(
+            struct.pack("<h", int(8000 * math.sin(2 * math.pi * frequency * n / sample_rate)))
+            for n in range(sample_rate * (i + 1))
+        )
+        with wave.open(os.path.join(directory, name + ".wav"), "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(sample_rate)
+            f.writeframes(frames)
+        with open(os.path.join(directory, name + ".txt"), "w", encoding="utf-8") as f:
+            f.write(transcript + "\n")
+
+
+def word_error_rate(reference, hypothesis):
+    """Word-level Levenshtein distance divided by the reference length."""
+    ref, hyp = reference.lower().split(), hypothesis.lower().split()
+    previous = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        current = [i]
+        for j, h in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (r != h)))
+        previous = current
+    return previous[-1] / max(len(ref), 1)
+
+
+def list_fixtures(directory):
+    """Return (wav path, reference transcript or None) pairs."""
+    fixtures = []
+    for name in sorted(os.listdir(directory)):
+        base, ext = os.path.splitext(name)
+        if ext.lower() != ".wav":
+            continue
+        transcript_path = os.path.join(directory, base + ".txt")
+        reference = None
+        if os.path.exists(transcript_path):
+            with open(transcript_path, "r", encoding="utf-8") as f:
+                reference = f.read().strip()
+        fixtures.append((os.path.join(directory, name), reference))
+    return fixtures
+
+
+def run(backend_names=("fake",), fixtures_dir=FAKE_TRANSCRIPTS_DIR):
+    """
+    Replay every fixture through each backend.
+    
+    Returns:
+        dict: Per-backend latency, real-time factor and word error rate
+    """
+    if not os.path.isdir(fixtures_dir) or not any(n.lower().endswith(".wav") for n in os.listdir(fixtures_dir)):
+        make_synthetic_fixtures(fixtures_dir)
+    fixtures = list_fixtures(fixtures_dir)
+    
+    results = {}
+    for name in backend_names:
+        backend = FakeBackend(fixtures_dir) if name == "fake" else create_backend(name)
+        latencies, factors, errors = [], [], []
+        failures = 0
+        for path, reference in fixtures:
+            with wave.open(path, "rb") as f:
+                duration = f.getnframes() / float(f.getframerate())
+            with sr.AudioFile(path) as source:
+                audio = sr.Recognizer().record(source)
+            start = time.perf_counter()
+            try:
+                text = backend.recognize(audio)
+            except (sr.UnknownValueError, sr.RequestError):
+                text = ""
+                failures += 1
+            elapsed = time.perf_counter() - start
+            latencies.append(elapsed * 1000)
+            factors.append(elapsed / duration if duration else 0.0)
+            if reference is not None:
+                errors.append(word_error_rate(reference, text))
+        
+        latencies.sort()
+        results[name] = {
+            "files": len(fixtures),
+            "failures": failures,
+            "latency_ms_mean": statistics.mean(latencies) if latencies else 0.0,
+            "latency_ms_p95": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))] if latencies else 0.0,
+            "real_time_factor": statistics.mean(factors) if factors else 0.0,
+            "word_error_rate": statistics.mean(errors) if errors else None,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark speech recognition backends on WAV fixtures")
+    parser.add_argument("--backends", nargs="+", default=["fake"], help="Backend names to compare")
+    parser.add_argument("--fixtures", default=FAKE_TRANSCRIPTS_DIR, help="Directory of .wav files with .txt transcripts")
+    args = parser.parse_args()
+    
+    results = run(args.backends, args.fixtures)
+    print(f"\n{'backend':<12}{'files':>7}{'failed':>8}{'mean (ms)':>12}{'p95 (ms)':>11}{'RTF':>8}{'WER':>8}")
+    for name, stats in results.items():
+        wer = f"{stats['word_error_rate']:.2f}" if stats["word_error_rate"] is not None else "-"
+        print(f"{name:<12}{stats['files']:>7}{stats['failures']:>8}{stats['latency_ms_mean']:>12.1f}"
+              f"{stats['latency_ms_p95']:>11.1f}{stats['real_time_factor']:>8.3f}{wer:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Startup benchmark: import cost of the application modules (from
+``python -X importtime``) and, when a display is available, the time until
+the main window has been drawn.
+
+    python -m benchmarks.bench_startup --top 15
+    python -m benchmarks.bench_startup --window
+
+Each measurement runs in a fresh interpreter so nothing is already cached
+in ``sys.modules``.
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODULES = ("main", "core.chatbot", "modules.search", "modules.voice", "modules.pdf_summarizer")
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+
+WINDOW_SCRIPT = """
+import time
+start = time.perf_counter()
+import main
+app = main.AssistifyApp()
+app.app_window.root.update()
+print(time.perf_counter() - start)
+app.app_window.root.destroy()
+"""
+
+
+def _python(code, *flags):
+    """Run code in a fresh interpreter from the app directory."""
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, *flags, "-c", code], cwd=APP_DIR,
+                          capture_output=True, text=True)
+    return proc, time.perf_counter() - start
+
+
+def import_profile(module):
+    """
+    Import a module under ``-X importtime``.
+
+    Returns:
+        dict: ``wall_ms`` for the whole process, ``import_ms`` for the module
+            itself, ``imports`` as (cumulative ms, self ms, name) for each
+            module it imports directly, and ``error`` if the import failed
+    """
+    proc, wall = _python(f"import {module}", "-X", "importtime")
+    entries = []
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append(((len(indent) + 1) // 2, int(self_us), int(cumulative_us), name))
+
+    # Children are printed before their parent, so the module's subtree is
+    # the run of nested entries just before its own top-level line. Anything
+    # earlier is interpreter startup (site, encodings, .pth files).
+    end = next((i for i in range(len(entries) - 1, -1, -1)
+                if entries[i][0] == 1 and entries[i][3] == module), len(entries))
+    start = next((i + 1 for i in range(end - 1, -1, -1) if entries[i][0] == 1), 0)
+    total_us = entries[end][2] if end < len(entries) else sum(e[2] for e in entries[start:end] if e[0] == 2)
+    imports = sorted(((cumulative / 1000, own / 1000, name)
+                      for depth, own, cumulative, name in entries[start:end] if depth == 2), reverse=True)
+    error = None
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit code {proc.returncode}"
+    return {"wall_ms": wall * 1000, "import_ms": total_us / 1000, "imports": imports, "error": error}
+
+
+def window_time(repeat=3):
+    """
+    Time from interpreter start to the first drawn frame of the main window.
+
+    Returns:
+        dict: ``median_ms``/``min_ms`` over the runs, or ``error``
+    """
+    samples = []
+    for _ in range(repeat):
+        proc, _ = _python(WINDOW_SCRIPT)
+        if proc.returncode != 0:
+            lines = proc.stderr.strip().splitlines()
+            return {"error": lines[-1] if lines else f"exit code {proc.returncode}"}
+        samples.append(float(proc.stdout.strip().splitlines()[-1]) * 1000)
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples)}
+
+
+def run(modules=DEFAULT_MODULES, repeat=3, window=False):
+    """
+    Profile module imports (median of ``repeat`` fresh processes each).
+
+    Returns:
+        dict: Per-module profiles, plus ``window`` timings when requested
+    """
+    results = {}
+    for module in modules:
+        runs = [import_profile(module) for _ in range(repeat)]
+        best = min(runs, key=lambda r: r["import_ms"])
+        best["import_ms"] = statistics.median(r["import_ms"] for r in runs)
+        best["wall_ms"] = statistics.median(r["wall_ms"] for r in runs)
+        results[module] = best
+    if window:
+        results["window"] = window_time(repeat)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure Assistify import and startup time")
+    parser.add_argument("--modules", nargs="+", default=list(DEFAULT_MODULES), help="Modules to import")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per measurement")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list for each module")
+    parser.add_argument("--window", action="store_true", help="Also time until the window is drawn (needs a display)")
+    args = parser.parse_args()
+
+    results = run(args.modules, args.repeat, args.window)
+    print(f"\n{'module':<28}{'import (ms)':>13}{'process (ms)':>14}")
+    for module in args.modules:
+        stats = results[module]
+        note = f"  ⚠️ {stats['error']}" if stats["error"] else ""
+        print(f"{module:<28}{stats['import_ms']:>13.1f}{stats['wall_ms']:>14.1f}{note}")
+
+    for module in args.modules:
+        imports = results[module]["imports"][:args.top]
+        if not imports:
+            continue
+        print(f"\nSlowest imports under {module}")
+        print(f"{'package':<40}{'cumulative (ms)':>17}{'self (ms)':>11}")
+        for cumulative, own, name in imports:
+            print(f"{name:<40}{cumulative:>17.1f}{own:>11.1f}")
+
+    if args.window:
+        window = results["window"]
+        if "error" in window:
+            print(f"\nWindow: ⚠️ {window['error']}")
+        else:
+            print(f"\nWindow drawn after {window['median_ms']:.0f} ms (best {window['min_ms']:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Summary profile benchmark: latency per document and ROUGE against the
+hand-written reference summaries in ``fixtures/summaries.json``, for each
+entry of ``PDF_SUMMARY_PROFILES``.
+
+    python -m benchmarks.bench_summary_profiles
+    python -m benchmarks.bench_summary_profiles --profiles fast quality --repeat 3
+    python -m benchmarks.bench_summary_profiles --model sshleifer/bart-tiny-random   # timing only
+
+``--model`` runs every profile on one model, which isolates the cost of the
+generation settings (beams, lengths) from the model size.
+"""
+
+import argparse
+import importlib.util
+import re
+import statistics
+import time
+from collections import Counter
+from benchmarks import corpus
+from config.settings import PDF_SUMMARY_PROFILES
+
+
+def _tokens(text):
+    return re.findall(r"\w+", text.lower())
+
+
+def _f1(overlap, candidate_total, reference_total):
+    if not overlap or not candidate_total or not reference_total:
+        return 0.0
+    precision, recall = overlap / candidate_total, overlap / reference_total
+    return 2 * precision * recall / (precision + recall)
+
+
+def rouge_n(candidate, reference, n):
+    """ROUGE-N F1: clipped n-gram overlap."""
+    c, r = _tokens(candidate), _tokens(reference)
+    c_grams = Counter(tuple(c[i:i + n]) for i in range(len(c) - n + 1))
+    r_grams = Counter(tuple(r[i:i + n]) for i in range(len(r) - n + 1))
+    return _f1(sum((c_grams & r_grams).values()), sum(c_grams.values()), sum(r_grams.values()))
+
+
+def rouge_l(candidate, reference):
+    """ROUGE-L F1: longest common subsequence of tokens."""
+    c, r = _tokens(candidate), _tokens(reference)
+    previous = [0] * (len(r) + 1)
+    for word in c:
+        current = [0]
+        for j, other in enumerate(r):
+            current.append(previous[j] + 1 if word == other else max(previous[j + 1], current[j]))
+        previous = current
+    return _f1(previous[-1], len(c), len(r))
+
+
+def summary_text(summarizer, text, profile):
+    """Summary of a document with the "Part N:" labels left out."""
+    return " ".join(part for number, part in summarizer.iter_summary(text, profile=profile) if number is not None)
+
+
+def run(profiles=tuple(PDF_SUMMARY_PROFILES), model=None, repeat=3):
+    """
+    Benchmark summary profiles.
+
+    Args:
+        profiles (iterable): Profile names
+        model (str or None): Run every profile on this model instead of its own
+        repeat (int): Timed summaries per document
+
+    Returns:
+        dict: Profile -> 'model', 'load_s' (first summary, model load included),
+            'latency_s' (median per document)
+            and mean 'rouge1', 'rouge2', 'rougeL' F1
+    """
+    from modules.pdf_summarizer import AISummarizer, AUTO_MODEL
+    documents = corpus.load_summaries()
+    settings = {name: dict(PDF_SUMMARY_PROFILES[name], **({"model": model} if model else {})) for name in profiles}
+    summarizer = AISummarizer(profiles=settings)
+    results = {}
+    for name in profiles:
+        model_name = summarizer.resolve_profile(name)["model"]
+        start = time.perf_counter()
+        summary_text(summarizer, documents[0]["text"], name)  # load and warm up
+        load = time.perf_counter() - start
+        if model_name == AUTO_MODEL:
+            model_name = summarizer.last_model
+
+        latencies, scores = [], []
+        for document in documents:
+            times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                summary = summary_text(summarizer, document["text"], name)
+                times.append(time.perf_counter() - start)
+            latencies.append(statistics.median(times))
+            reference = document["summary"]
+            scores.append((rouge_n(summary, reference, 1), rouge_n(summary, reference, 2), rouge_l(summary, reference)))
+        results[name] = {
+            "model": model_name, "load_s": load, "latency_s": statistics.mean(latencies),
+            "rouge1": statistics.mean(s[0] for s in scores), "rouge2": statistics.mean(s[1] for s in scores),
+            "rougeL": statistics.mean(s[2] for s in scores),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summary profile benchmark")
+    parser.add_argument("--profiles", nargs="+", choices=list(PDF_SUMMARY_PROFILES), default=list(PDF_SUMMARY_PROFILES))
+    parser.add_argument("--model", help="Use this model for every profile")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    missing = [name for name in ("torch", "transformers") if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"Skipped: {', '.join(missing)} not installed")
+        return
+
+    results = run(args.profiles, args.model, args.repeat)
+    print(f"\nSummary profiles ({len(corpus.load_summaries())} documents)")
+    print(f"{'profile':<10}{'model':<34}{'first (s)':>9}{'s/doc':>8}{'R-1':>7}{'R-2':>7}{'R-L':>7}")
+    for name, r in results.items():
+        print(f"{name:<10}{r['model']:<34}{r['load_s']:>9.1f}{r['latency_s']:>8.2f}"
+              f"{r['rouge1']:>7.3f}{r['rouge2']:>7.3f}{r['rougeL']:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
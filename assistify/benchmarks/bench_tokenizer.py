@@ -0,0 +1,103 @@
+"""
+Message preprocessing benchmark: the original per-handler lowercasing,
+regexes and chained ``str.replace`` calls against one ``tokenize`` pass.
+"""
+
+import re
+from utils.tokenizer import tokenize
+from utils.validators import safe_eval
+from benchmarks.harness import measure, report
+
+CHAT_SENTENCE = "i had a really long day at work today and i would like to talk about it for a while "
+MATH_SENTENCE = "what is 12 plus 7 times 3 divided by 4 and then 6 x 8 minus 2 to the power of 3 "
+# Messages and the calculator result the chatbot should give (None: not math)
+MATH_CHECKS = [
+    ("5 x 4", 20),
+    ("5x4", 20),
+    ("2.5x4", 10.0),
+    ("what is 10 x 5", 50),
+    ("what is 12 plus 7 times 3", 33),
+    ("2 to the power of 10", 1024),
+    ("a box of 5 apples", None),
+    ("max 3 x", None),
+    ("10 over 4", 2.5),
+    ("17 mod 5", 2),
+    ("game over", None),
+    ("i am so over this", None),
+]
+
+
+def legacy_preprocess(user_input):
+    """The preprocessing ``get_response`` did before the shared tokenizer."""
+    text = user_input.lower().strip()
+    tokens = text.split()
+    "add" in tokens and "task" in tokens
+    "show" in tokens and "tasks" in tokens
+    "delete" in tokens and "task" in tokens
+    re.search(r"my name is (.+)", text.lower())
+    expr = text.replace("plus", "+").replace("add", "+")
+    expr = expr.replace("minus", "-").replace("subtract", "-")
+    expr = expr.replace("times", "*").replace("multiply", "*").replace("x", "*")
+    expr = expr.replace("divide", "/").replace("divided by", "/")
+    expr = expr.replace("power", "**").replace("^", "**")
+    return any(op in expr for op in ["+", "-", "*", "/", "(", ")", "**"])
+
+
+def tokenized_preprocess(user_input):
+    """The same checks answered from a single tokenized message."""
+    message = tokenize(user_input)
+    message.has("add", "task")
+    message.has("show", "tasks")
+    message.has("delete", "task")
+    message.after("my", "name", "is")
+    if message.has_math:
+        expr = message.math_expression
+        return any(op in expr for op in ["+", "-", "*", "/", "(", ")", "**"])
+    return False
+
+
+def check_math():
+    """
+    Calculator results for ``MATH_CHECKS`` through the tokenizer, as ``get_response`` computes them.
+    
+    Returns:
+        list: (message, expected, result) for every mismatch
+    """
+    failures = []
+    for text, expected in MATH_CHECKS:
+        message = tokenize(text)
+        result = safe_eval(message.math_expression) if message.has_math else None
+        if result != expected:
+            failures.append((text, expected, result))
+    return failures
+
+
+def run(number=200):
+    """
+    Run the preprocessing benchmark over chat-like and math-like inputs.
+    
+    Returns:
+        dict: Mapping of case name to timing stats
+    """
+    results = {}
+    for kind, sentence in (("chat", CHAT_SENTENCE), ("math", MATH_SENTENCE)):
+        for repeats in (1, 12, 120, 1200):
+            text = sentence * repeats
+            label = f"{kind} {len(text):,} chars"
+            calls = max(1, number // repeats)
+            results[f"legacy   {label}"] = measure(lambda: legacy_preprocess(text), number=calls)
+            results[f"tokenize {label}"] = measure(lambda: tokenized_preprocess(text), number=calls)
+    return results
+
+
+def main():
+    failures = check_math()
+    for text, expected, result in failures:
+        print(f"❌ {text!r}: expected {expected}, got {result}")
+    if not failures:
+        print(f"✅ {len(MATH_CHECKS)} math messages evaluate as expected")
+    report("Message preprocessing", run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Wikipedia client benchmark against the local MediaWiki stand-in: requests
+and latency per lookup on a cold cache, then the same queries again
+(answered from the cache), then redirect names the first and second time.
+
+    python -m benchmarks.bench_wikipedia --latency 0.05
+"""
+
+import argparse
+import time
+from benchmarks.mediawiki_stub import MediaWikiStub
+from modules.wikipedia_client import WikipediaClient
+
+QUERIES = [
+    "python programming language", "Python", "pythons", "albert einstein", "theory of relativity",
+    "Mercury", "mercury planet", "quicksilver", "machine learning", "eiffel tower",
+]
+# Redirect names of pages fetched above; cached under the name once resolved
+ALIASES = ["Python language", "Einstein", "Relativity", "Hg", "ML", "Tour Eiffel"]
+
+
+def timed_lookups(client, queries):
+    """Look each query up once; returns (requests made, mean ms, answers)."""
+    before = client.requests_made
+    start = time.perf_counter()
+    answers = [client.get_summary(q) for q in queries]
+    elapsed = time.perf_counter() - start
+    return client.requests_made - before, elapsed * 1000 / len(queries), answers
+
+
+def run(latency=0.05):
+    """
+    Run cold, warm and alias lookups.
+
+    Returns:
+        dict: Mapping of case to lookups, requests and mean ms per lookup
+    """
+    results = {}
+    with MediaWikiStub(latency=latency) as stub:
+        client = WikipediaClient(stub.url)
+        cases = [("cold", QUERIES), ("warm (same queries)", QUERIES), ("redirects", ALIASES),
+                 ("redirects again", ALIASES)]
+        for label, queries in cases:
+            requests_made, mean_ms, answers = timed_lookups(client, queries)
+            failed = [q for q, a in zip(queries, answers) if a.startswith("❌")]
+            if failed:
+                raise RuntimeError(f"lookups failed against the stub: {failed}")
+            results[label] = {"lookups": len(queries), "requests": requests_made, "mean_ms": mean_ms}
+        results["server requests"] = stub.requests
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wikipedia client requests and cache benchmark")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated server latency (s)")
+    args = parser.parse_args()
+
+    results = run(args.latency)
+    print(f"\nWikipedia lookups, {args.latency * 1000:.0f} ms simulated latency")
+    print(f"{'case':<22}{'lookups':>9}{'requests':>10}{'ms/lookup':>11}")
+    for label, r in results.items():
+        if isinstance(r, dict):
+            print(f"{label:<22}{r['lookups']:>9}{r['requests']:>10}{r['mean_ms']:>11.2f}")
+    print(f"\nServer saw {results['server requests']} requests in total")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+YouTube results extraction benchmark on the saved results page: the old
+``re.findall`` over the whole page, decoding all of ``ytInitialData`` with
+``json.loads``, and the incremental scanner fed in download-sized pieces.
+"""
+
+import json
+import re
+from benchmarks import corpus
+from benchmarks.harness import measure, report
+from modules import youtube
+
+
+def legacy_parse(html, num):
+    """The regex fallback ``YouTubeSearch`` used before (ids only, placeholder titles)."""
+    video_ids = re.findall(r"watch\?v=([a-zA-Z0-9_-]{11})", html)
+    seen = set()
+    unique_ids = [x for x in video_ids if not (x in seen or seen.add(x))]
+    return [{'title': f"Video: {vid_id}", 'url': f"https://www.youtube.com/watch?v={vid_id}"}
+            for vid_id in unique_ids[:num]]
+
+
+def full_json_parse(html, num):
+    """Decode the whole ``ytInitialData`` document, then walk it for videos."""
+    start = html.index("ytInitialData")
+    start = html.index("{", start)
+    data, _ = json.JSONDecoder().raw_decode(html, start)
+    videos = []
+
+    def walk(node):
+        if len(videos) >= num:
+            return
+        if isinstance(node, dict):
+            if "videoRenderer" in node:
+                video = youtube.video_from_renderer(node["videoRenderer"])
+                if video:
+                    videos.append(video)
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+    walk(data)
+    return videos
+
+
+def streamed_scan(chunks, num):
+    """Feed the page piece by piece until the scanner has enough."""
+    scanner = youtube.InitialDataScanner(num)
+    for chunk in chunks:
+        if scanner.feed(chunk):
+            break
+    return scanner
+
+
+def run(number=20):
+    """
+    Run the extraction benchmark.
+
+    Returns:
+        dict: Mapping of case name to timing stats
+    """
+    html = corpus.load_html("youtube")
+    data = html.encode("utf-8")
+    chunks = [data[i:i + youtube.READ_CHUNK_SIZE] for i in range(0, len(data), youtube.READ_CHUNK_SIZE)]
+    results = {}
+    for num in (3, 20):
+        results[f"regex full page    num={num}"] = measure(lambda: legacy_parse(html, num), number=number)
+        results[f"json.loads all     num={num}"] = measure(lambda: full_json_parse(html, num), number=number)
+        stats = measure(lambda: streamed_scan(chunks, num), number=number)
+        stats["bytes_read"] = streamed_scan(chunks, num).bytes_read
+        stats["page_bytes"] = len(data)
+        results[f"streamed scanner   num={num}"] = stats
+    return results
+
+
+def main():
+    results = run()
+    report("YouTube results extraction", results)
+    for case, stats in results.items():
+        if "bytes_read" in stats:
+            print(f"{case}: read {stats['bytes_read']:,} of {stats['page_bytes']:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Pinned benchmark inputs.
+
+Text fixtures (message corpus, saved search result pages) are checked in
+under ``benchmarks/fixtures``. The large PDF is generated on first use from
+a fixed seed, so every machine benchmarks byte-identical input without
+committing megabytes of binary.
+"""
+
+import json
+import os
+import random
+import zlib
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+HTML_DIR = os.path.join(FIXTURES_DIR, "html")
+PDF_DIR = os.path.join(FIXTURES_DIR, "pdf")
+
+PDF_SEED = 20231105
+PDF_LINES_PER_PAGE = 48
+SCAN_DPI = 150  # resolution of the image-only pages in the scanned benchmark PDF
+PDF_WORDS = (
+    "the a of and to in is that for it as was with be by on not he this are or his from at which but have an "
+    "they you were her she there been one all we their has would when if so no will more what up out into "
+    "system model data analysis results method performance network memory process value time study design "
+    "research approach function structure energy signal control information learning distribution sample "
+    "theory experiment measurement algorithm parameter evaluation framework application environment"
+).split()
+
+
+def load_messages():
+    """
+    Chat messages covering every ``get_response`` handler.
+
+    Returns:
+        list: One message per non-empty line of ``messages.txt``
+    """
+    with open(os.path.join(FIXTURES_DIR, "messages.txt"), "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def load_html(name):
+    """
+    A saved search results page.
+
+    Args:
+        name (str): ``bing``, ``duckduckgo``, ``brave`` or ``youtube``
+
+    Returns:
+        str: Page source
+    """
+    with open(os.path.join(HTML_DIR, f"{name}.html"), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def load_summaries():
+    """
+    Short documents with hand-written reference summaries.
+
+    Returns:
+        list: Dicts with 'title', 'text' and 'summary'
+    """
+    with open(os.path.join(FIXTURES_DIR, "summaries.json"), "r", encoding="utf-8") as f:
+        return json.load(f)["documents"]
+
+
+def document_text(pages, seed=PDF_SEED):
+    """
+    Deterministic prose-like text, one list of lines per page.
+
+    Args:
+        pages (int): Number of pages
+        seed (int): Random seed
+
+    Returns:
+        list: Pages, each a list of lines
+    """
+    rng = random.Random(seed)
+    result = []
+    for page in range(pages):
+        lines = [f"Section {page + 1}"]
+        while len(lines) < PDF_LINES_PER_PAGE:
+            words = [rng.choice(PDF_WORDS) for _ in range(rng.randint(9, 14))]
+            words[0] = words[0].capitalize()
+            lines.append(" ".join(words) + ".")
+        result.append(lines)
+    return result
+
+
+def _scan_image(lines):
+    """
+    A page of text as an 8-bit grayscale image, like a scanner produces.
+
+    Returns:
+        tuple: (width, height, zlib-compressed pixel rows)
+    """
+    from PIL import Image, ImageDraw, ImageFont
+    scale = SCAN_DPI / 72
+    image = Image.new("L", (round(595 * scale), round(842 * scale)), 255)
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(size=round(8 * scale))  # Pillow's font is wider than Helvetica
+    for number, line in enumerate(lines):
+        draw.text((36 * scale, (42 + 14 * number) * scale), line, fill=0, font=font)
+    return image.width, image.height, zlib.compress(image.tobytes())
+
+
+def write_pdf(path, pages_text, scanned=()):
+    """
+    Write a plain text PDF (Helvetica, one text block per page).
+
+    Args:
+        path (str): Output file
+        pages_text (list): Pages, each a list of lines
+        scanned (collection): Page indexes drawn as an image with no text
+            layer instead (needs Pillow)
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page objects are numbered
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    page_ids = []
+    for index, lines in enumerate(pages_text):
+        if index in scanned:
+            width, height, pixels = _scan_image(lines)
+            objects.append(b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceGray "
+                           b"/BitsPerComponent 8 /Filter /FlateDecode /Length %d >>\nstream\n"
+                           % (width, height, len(pixels)) + pixels + b"\nendstream")
+            resources = b"<< /XObject << /Im1 %d 0 R >> >>" % len(objects)
+            stream = b"q 595 0 0 842 0 0 cm /Im1 Do Q"
+        else:
+            body = ["BT", "/F1 10 Tf", "14 TL", "56 800 Td"]
+            for line in lines:
+                escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+                body.append(f"({escaped}) Tj T*")
+            body.append("ET")
+            resources = b"<< /Font << /F1 3 0 R >> >>"
+            stream = "\n".join(body).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       b"/Resources %s /Contents %d 0 R >>" % (resources, len(objects)))
+        page_ids.append(len(objects))
+    kids = " ".join(f"{i} 0 R" for i in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode("ascii")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(out)
+    os.replace(tmp_path, path)
+
+
+def ensure_pdf(pages=300, seed=PDF_SEED):
+    """
+    Path to the generated benchmark PDF, building it if missing.
+
+    Args:
+        pages (int): Page count
+        seed (int): Random seed for the text
+
+    Returns:
+        str: PDF path
+    """
+    path = os.path.join(PDF_DIR, f"document-{pages}p-{seed}.pdf")
+    if not os.path.exists(path):
+        write_pdf(path, document_text(pages, seed))
+    return path
+
+
+def ensure_scanned_pdf(pages=40, scanned_every=2, seed=PDF_SEED):
+    """
+    Path to a generated PDF where every ``scanned_every``-th page is an image
+    without a text layer, building it if missing (needs Pillow).
+
+    Args:
+        pages (int): Page count
+        scanned_every (int): Spacing of the image-only pages
+        seed (int): Random seed for the text
+
+    Returns:
+        str: PDF path
+    """
+    path = os.path.join(PDF_DIR, f"scanned-{pages}p-every{scanned_every}-{seed}.pdf")
+    if not os.path.exists(path):
+        write_pdf(path, document_text(pages, seed), scanned=set(scanned_pages(pages, scanned_every)))
+    return path
+
+
+def scanned_pages(pages, scanned_every=2):
+    """Indexes of the image-only pages in ``ensure_scanned_pdf``."""
+    return range(scanned_every - 1, pages, scanned_every)
@@ -0,0 +1,59 @@
+"""
+Minimal timing helpers shared by the benchmark scripts.
+
+Run benchmarks from the ``assistify`` directory, e.g.::
+
+    python -m benchmarks.bench_calculator
+"""
+
+import statistics
+import time
+
+
+def measure(func, repeat=5, number=1000, warmup=1):
+    """
+    Time a callable.
+    
+    Args:
+        func (callable): Zero-argument function to time
+        repeat (int): Number of timed rounds
+        number (int): Calls per round
+        warmup (int): Untimed rounds run first
+        
+    Returns:
+        dict: Per-call timings in microseconds and calls per second
+    """
+    for _ in range(warmup):
+        for _ in range(number):
+            func()
+    
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number * 1e6)
+    
+    samples.sort()
+    best = samples[0]
+    return {
+        "mean_us": statistics.mean(samples),
+        "min_us": best,
+        "median_us": statistics.median(samples),
+        "max_us": samples[-1],
+        "ops_per_sec": 1e6 / best if best else float("inf"),
+    }
+
+
+def report(title, results):
+    """
+    Print results as an aligned table.
+    
+    Args:
+        title (str): Table heading
+        results (dict): Mapping of case name to ``measure`` output
+    """
+    print(f"\n{title}")
+    print(f"{'case':<32}{'min (us)':>12}{'median (us)':>14}{'ops/sec':>14}")
+    for name, stats in results.items():
+        print(f"{name:<32}{stats['min_us']:>12.2f}{stats['median_us']:>14.2f}{stats['ops_per_sec']:>14,.0f}")
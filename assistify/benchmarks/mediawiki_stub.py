@@ -0,0 +1,183 @@
+"""
+Local stand-in for the MediaWiki ``api.php`` endpoint.
+
+Serves the pages in ``fixtures/wikipedia.json`` through the subset of
+``action=query`` that ``WikipediaClient`` uses (search generator, redirects,
+intro extracts, disambiguation pageprops, and links by title), so the client can be
+exercised and benchmarked offline. Run it next to the app with:
+
+    python -m benchmarks.mediawiki_stub --port 8765
+    ASSISTIFY_WIKIPEDIA_API_URL=http://127.0.0.1:8765/w/api.php python main.py
+"""
+
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from benchmarks.corpus import FIXTURES_DIR
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def load_pages(path=os.path.join(FIXTURES_DIR, "wikipedia.json")):
+    """
+    Pages served by the stub.
+
+    Returns:
+        list: Page dicts with title, extract and optional redirects/disambiguation/links
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["pages"]
+
+
+class MediaWikiStub:
+    """Threaded HTTP server answering MediaWiki queries from fixture pages."""
+
+    def __init__(self, pages=None, latency=0.0, host="127.0.0.1", port=0):
+        """
+        Args:
+            pages (list or None): Pages to serve (default: the fixture file)
+            latency (float): Seconds to wait before each reply
+            host (str): Interface to bind
+            port (int): Port, or 0 for any free one
+        """
+        self.pages = pages if pages is not None else load_pages()
+        self.latency = latency
+        self.requests = 0
+        self._by_title = {p["title"].lower(): p for p in self.pages}
+        self._redirects = {r.lower(): p for p in self.pages for r in p.get("redirects", [])}
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                url = urlparse(self.path)
+                params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                body = json.dumps(stub.answer(params)).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        """The stub's ``api.php`` URL."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/w/api.php"
+
+    def start(self):
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mediawiki-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Shut the server down."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def search(self, query, limit):
+        """Rank pages for a query: exact title or redirect first, then word overlap."""
+        key = " ".join(query.lower().split())
+        words = set(key.split())
+        scored = []
+        for page in self.pages:
+            names = [page["title"].lower()] + [r.lower() for r in page.get("redirects", [])]
+            if key in names:
+                score = 1000
+            else:
+                title_words = set(re.findall(r"\w+", " ".join(names)))
+                text_words = set(re.findall(r"\w+", page["extract"].lower()))
+                score = 3 * len(words & title_words) + len(words & text_words)
+            if score:
+                scored.append((score, page))
+        scored.sort(key=lambda item: -item[0])
+        return [page for _, page in scored[:limit]]
+
+    def answer(self, params):
+        """Build the ``formatversion=2`` JSON reply for a query."""
+        if params.get("action") == "query" and "titles" in params:
+            return self.answer_titles(params)
+        if params.get("action") != "query" or params.get("generator") != "search":
+            return {"error": {"code": "badparams", "info": "Only action=query with generator=search is stubbed"}}
+        hits = self.search(params.get("gsrsearch", ""), int(params.get("gsrlimit", 10)))
+        if not hits:
+            return {"batchcomplete": True}
+
+        sentences = int(params["exsentences"]) if "exsentences" in params else None
+        props = set(params.get("prop", "").split("|"))
+        query_key = " ".join(params.get("gsrsearch", "").lower().split())
+        redirects, pages = [], []
+        for index, page in enumerate(hits, 1):
+            if query_key in self._redirects and self._redirects[query_key] is page and params.get("redirects"):
+                redirects.append({"index": index, "from": params["gsrsearch"], "to": page["title"]})
+            entry = {"pageid": self.pages.index(page) + 1, "ns": 0, "title": page["title"], "index": index}
+            if "extracts" in props:
+                text = page["extract"]
+                if sentences:
+                    text = " ".join(SENTENCE_END.split(text)[:sentences])
+                entry["extract"] = text
+            if "pageprops" in props and page.get("disambiguation"):
+                entry["pageprops"] = {"disambiguation": ""}
+            if "links" in props and page.get("links"):
+                entry["links"] = [{"ns": 0, "title": title} for title in page["links"]]
+            pages.append(entry)
+
+        result = {"pages": pages}
+        if redirects:
+            result["redirects"] = redirects
+        return {"batchcomplete": True, "query": result}
+
+    def answer_titles(self, params):
+        """Reply to ``titles=...&prop=links`` with the fixture links (first ``pllimit``)."""
+        limit = int(params.get("pllimit", 10))
+        pages = []
+        for title in params["titles"].split("|"):
+            page = self._by_title.get(title.lower())
+            if page is None:
+                pages.append({"ns": 0, "title": title, "missing": True})
+                continue
+            entry = {"pageid": self.pages.index(page) + 1, "ns": 0, "title": title}
+            if "links" in params.get("prop", "").split("|") and page.get("links"):
+                entry["links"] = [{"ns": 0, "title": link} for link in page["links"][:limit]]
+            pages.append(entry)
+        return {"batchcomplete": True, "query": {"pages": pages}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve fixture pages as a MediaWiki API stand-in")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each reply")
+    args = parser.parse_args()
+
+    stub = MediaWikiStub(latency=args.latency, port=args.port)
+    print(f"MediaWiki stub serving {len(stub.pages)} pages at {stub.url}")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
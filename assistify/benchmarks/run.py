@@ -0,0 +1,281 @@
+"""
+Benchmark suite runner with machine-readable results and baseline comparison.
+
+    python -m benchmarks.run                          # all suites
+    python -m benchmarks.run --suites chatbot search_parsing --quick
+    python -m benchmarks.run --save-baseline          # store this run as the baseline
+    python -m benchmarks.run --baseline               # compare; exit code 1 on regressions
+
+Results are written as JSON to ``benchmarks/results/``. Suites whose
+dependencies are not installed are reported as skipped rather than failing.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime
+from benchmarks.harness import measure, report
+from benchmarks import corpus
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+DEFAULT_BASELINE = os.path.join(RESULTS_DIR, "baseline.json")
+DEFAULT_THRESHOLD = 0.15
+
+MATH_EXPRESSIONS = [
+    "2 + 3 * 4",
+    "(12.5 - 3) / 4",
+    "2 ** 10 + 7 // 2",
+    "((1 + 2) * (3 + 4) - 5) / 6",
+    "100 % 7 + 3 ** 4 - 81",
+    "1 / 3 + 1 / 6 + 1 / 9",
+]
+
+
+def _rounds(quick, full, fast):
+    """Pick (repeat, number) for the run mode."""
+    return fast if quick else full
+
+
+def suite_chatbot(quick):
+    """``Chatbot.get_response`` over the message corpus (state kept in memory)."""
+    from core.chatbot import Chatbot
+    messages = corpus.load_messages()
+    random.seed(0)
+    bot = Chatbot(data_dir=None)
+    repeat, number = _rounds(quick, (5, 20), (3, 3))
+    stats = measure(lambda: [bot.get_response(m) for m in messages], repeat=repeat, number=number)
+    stats["items"] = len(messages)
+    stats["items_per_sec"] = len(messages) * stats["ops_per_sec"]
+    return {"get_response (corpus)": stats}
+
+
+def suite_validators(quick):
+    """``safe_eval`` on raw expressions and ``parse_math_expression`` on math-like messages."""
+    from utils.validators import safe_eval, parse_math_expression
+    messages = [m for m in corpus.load_messages() if any(c.isdigit() for c in m)]
+    repeat, number = _rounds(quick, (5, 2000), (3, 200))
+    return {
+        "safe_eval": measure(lambda: [safe_eval(e) for e in MATH_EXPRESSIONS], repeat=repeat, number=number),
+        "parse_math_expression": measure(lambda: [parse_math_expression(m) for m in messages],
+                                         repeat=repeat, number=number),
+    }
+
+
+def suite_calculator(quick):
+    """Expression engine against the legacy ``eval`` path (see ``bench_calculator``)."""
+    from benchmarks import bench_calculator
+    return bench_calculator.run(number=200 if quick else 2000)
+
+
+def suite_tokenizer(quick):
+    """Message preprocessing (see ``bench_tokenizer``)."""
+    from benchmarks import bench_tokenizer
+    return bench_tokenizer.run(number=20 if quick else 200)
+
+
+def suite_search_parsing(quick):
+    """Result extraction from saved search pages (no network)."""
+    from modules.search import WebSearch, YouTubeSearch
+    parsers = {
+        "bing": WebSearch.parse_bing,
+        "duckduckgo": WebSearch.parse_duckduckgo,
+        "brave": WebSearch.parse_brave,
+        "youtube": YouTubeSearch.parse_results_page,
+    }
+    repeat, number = _rounds(quick, (5, 20), (3, 3))
+    results = {}
+    for name, parse in parsers.items():
+        html = corpus.load_html(name)
+        if not parse(html):
+            raise RuntimeError(f"{name}.html no longer yields results; the fixture or parser changed")
+        stats = measure(lambda: parse(html), repeat=repeat, number=number)
+        stats["bytes"] = len(html)
+        results[f"parse {name}"] = stats
+    return results
+
+
+def suite_pdf_extract(quick):
+    """``PDFProcessor.extract_text`` on a generated multi-hundred-page PDF."""
+    import PyPDF2  # noqa: F401 - skip cleanly when missing instead of timing the error path
+    from modules.pdf_summarizer import PDFProcessor
+    pages = 50 if quick else 300
+    path = corpus.ensure_pdf(pages)
+    stats = measure(lambda: PDFProcessor.extract_text(path), repeat=3, number=1, warmup=0 if quick else 1)
+    stats["items"] = pages
+    stats["items_per_sec"] = pages * stats["ops_per_sec"]
+    return {f"extract_text ({pages} pages)": stats}
+
+
+def suite_summarize(quick):
+    """``AISummarizer.summarize`` with a tiny local model."""
+    import transformers  # noqa: F401
+    from config.settings import BENCH_SUMMARIZER_MODEL, PDF_CHUNK_SIZE, PDF_MAX_CHUNKS
+    from modules.pdf_summarizer import AISummarizer
+    summarizer = AISummarizer(BENCH_SUMMARIZER_MODEL, profile="quality")  # "quality" runs the given model
+    start = time.perf_counter()
+    summarizer._get_model()
+    load_us = (time.perf_counter() - start) * 1e6
+
+    text = "\n".join(line for page in corpus.document_text(4) for line in page)
+    chunks = min(PDF_MAX_CHUNKS, -(-len(text) // PDF_CHUNK_SIZE))
+    stats = measure(lambda: summarizer.summarize(text), repeat=3 if quick else 5, number=1)
+    stats["items"] = chunks
+    stats["items_per_sec"] = chunks * stats["ops_per_sec"]
+    return {
+        "model load": {"mean_us": load_us, "min_us": load_us, "median_us": load_us, "max_us": load_us,
+                       "ops_per_sec": 1e6 / load_us if load_us else float("inf")},
+        f"summarize ({chunks} chunks)": stats,
+    }
+
+
+SUITES = {
+    "chatbot": suite_chatbot,
+    "validators": suite_validators,
+    "calculator": suite_calculator,
+    "tokenizer": suite_tokenizer,
+    "search_parsing": suite_search_parsing,
+    "pdf_extract": suite_pdf_extract,
+    "summarize": suite_summarize,
+}
+
+
+def environment():
+    """Machine and revision details stored with every result file."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run(suites=tuple(SUITES), quick=False):
+    """
+    Run benchmark suites.
+
+    Args:
+        suites (iterable): Suite names from ``SUITES``
+        quick (bool): Fewer rounds and smaller inputs (for smoke checks)
+
+    Returns:
+        dict: ``meta`` (environment) and ``suites`` (status, duration and
+            per-case timing stats for each suite)
+    """
+    results = {"meta": dict(environment(), quick=quick), "suites": {}}
+    for name in suites:
+        start = time.perf_counter()
+        try:
+            cases = SUITES[name](quick)
+            entry = {"status": "ok", "cases": cases}
+        except ImportError as e:
+            entry = {"status": "skipped", "reason": f"missing dependency: {e.name or e}"}
+        except Exception as e:
+            entry = {"status": "error", "reason": f"{type(e).__name__}: {e}"}
+        entry["seconds"] = round(time.perf_counter() - start, 3)
+        results["suites"][name] = entry
+    return results
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD, metric="min_us"):
+    """
+    Compare two result documents case by case.
+
+    Args:
+        current (dict): Output of ``run``
+        baseline (dict): Earlier output of ``run``
+        threshold (float): Relative slowdown treated as a regression (0.15 = 15%)
+        metric (str): Timing field to compare; the best round is the least noisy
+
+    Returns:
+        list: (suite, case, baseline us, current us, ratio, verdict) rows
+    """
+    rows = []
+    for suite, entry in current["suites"].items():
+        base_entry = baseline.get("suites", {}).get(suite, {})
+        if entry.get("status") != "ok" or base_entry.get("status") != "ok":
+            continue
+        for case, stats in entry["cases"].items():
+            base_stats = base_entry["cases"].get(case)
+            if not base_stats or not base_stats.get(metric):
+                continue
+            ratio = stats[metric] / base_stats[metric]
+            if ratio > 1 + threshold:
+                verdict = "REGRESSION"
+            elif ratio < 1 - threshold:
+                verdict = "faster"
+            else:
+                verdict = "ok"
+            rows.append((suite, case, base_stats[metric], stats[metric], ratio, verdict))
+    return rows
+
+
+def save(results, path):
+    """Write a result document as JSON."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Assistify benchmark suite")
+    parser.add_argument("--suites", nargs="+", choices=list(SUITES), default=list(SUITES))
+    parser.add_argument("--quick", action="store_true", help="Fewer rounds and smaller inputs")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, metavar="PATH",
+                        help="Also store the results as the baseline")
+    parser.add_argument("--baseline", nargs="?", const=DEFAULT_BASELINE, metavar="PATH",
+                        help="Compare against a stored baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    results = run(args.suites, args.quick)
+    for name, entry in results["suites"].items():
+        if entry["status"] == "ok":
+            report(f"{name} ({entry['seconds']:.1f}s)", entry["cases"])
+        else:
+            print(f"\n{name}: {entry['status']} ({entry['reason']})")
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    save(results, output)
+    print(f"\nResults written to {output}")
+    if args.save_baseline:
+        save(results, args.save_baseline)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        try:
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"❌ Could not read baseline: {e}")
+            sys.exit(2)
+        rows = compare(results, baseline, args.threshold)
+        if baseline["meta"].get("quick") != args.quick or baseline["meta"].get("platform") != results["meta"]["platform"]:
+            print("\n⚠️ Baseline was recorded in a different mode or on a different machine; ratios may not be comparable.")
+        print(f"\nAgainst baseline {baseline['meta'].get('commit') or args.baseline} "
+              f"(threshold {args.threshold:.0%}, best round)")
+        print(f"{'suite':<16}{'case':<34}{'baseline (us)':>15}{'now (us)':>13}{'ratio':>8}  verdict")
+        for suite, case, base, now, ratio, verdict in rows:
+            print(f"{suite:<16}{case:<34}{base:>15.2f}{now:>13.2f}{ratio:>8.2f}  {verdict}")
+        if any(row[5] == "REGRESSION" for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,21 @@
 Configuration and constants for Assistify application.
 """
 
+import os
+
 # Application Settings
 APP_NAME = "Assistify"
 APP_VERSION = "1.0.0"
 APP_AUTHOR = "Adarsh Jaiswal"
 
+# Startup Settings (heavy components are built in the background after the window appears)
+STARTUP_WARMUP_DELAY_MS = 200
+
+# Profiling (set ASSISTIFY_PROFILE=1 to record spans, ASSISTIFY_PROFILE_TRACE=path to save a Chrome trace on exit)
+PROFILING_ENABLED = os.environ.get("ASSISTIFY_PROFILE", "") not in ("", "0")
+PROFILING_BUFFER_SIZE = 10000
+PROFILING_TRACE_FILE = os.environ.get("ASSISTIFY_PROFILE_TRACE")
+
 # Window Settings
 WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 760
@@ -29,24 +39,144 @@ VOICE_RATE = 170
 VOICE_VOLUME = 1.0
 VOICE_TIMEOUT = 5
 VOICE_PHRASE_TIME_LIMIT = 7
+VOICE_QUEUE_SIZE = 8
+VOICE_STREAM_MAX_SENTENCES = 4
+VOICE_CALIBRATION_SECONDS = 0.5
+VOICE_VAD_FRAME_MS = 30
+VOICE_VAD_SILENCE_MS = 450
+VOICE_VAD_PREROLL_MS = 300
+VOICE_VAD_MIN_SPEECH_MS = 150
+VOICE_VAD_ENERGY_RATIO = 3.0
+VOICE_VAD_MIN_ENERGY = 300
+
+# Calculator Settings
+CALC_CACHE_SIZE = 256
+CALC_MAX_LENGTH = 500
+CALC_MAX_EXPONENT = 10000
+CALC_MAX_BITS = 10000
+CALC_TIME_LIMIT = 0.5
+BULK_CHUNK_SIZE = 65536
+BULK_MAX_POINTS = 10_000_000
+BULK_SAMPLE_POINTS = 10
+BULK_TIME_LIMIT = 10.0
 
 # Search Settings
 WEB_SEARCH_RESULTS = 5
 YOUTUBE_RESULTS = 3
+YOUTUBE_CACHE_SIZE = 128
+YOUTUBE_CACHE_TTL = 15 * 60  # seconds; results pages change, unlike Wikipedia intros
 WIKIPEDIA_SENTENCES = 3
+# Point ASSISTIFY_WIKIPEDIA_API_URL at a stand-in server (benchmarks/mediawiki_stub.py) for offline runs
+WIKIPEDIA_API_URL = os.environ.get("ASSISTIFY_WIKIPEDIA_API_URL", "https://en.wikipedia.org/w/api.php")
+WIKIPEDIA_SEARCH_CANDIDATES = 5
+WIKIPEDIA_CACHE_SIZE = 256
+WIKIPEDIA_CACHE_TTL = 6 * 60 * 60  # seconds
+SEARCH_TIMEOUT = 15
+SEARCH_CONCURRENCY = 32  # requests in flight at once across all searches
+SEARCH_MAX_CONNECTIONS = 64
+SEARCH_MAX_CONNECTIONS_PER_HOST = 8
+
+# Local Index (past search results and PDF summaries, shown before remote results arrive)
+LOCAL_INDEX_ENABLED = True
+LOCAL_INDEX_RESULTS = 3
+LOCAL_INDEX_BATCH_SIZE = 64
+LOCAL_INDEX_FLUSH_INTERVAL = 0.2  # seconds the writer waits to batch documents
 
 # PDF Settings
 PDF_CHUNK_SIZE = 1000
 PDF_MAX_LENGTH = 130
 PDF_MIN_LENGTH = 40
 PDF_MAX_CHUNKS = 5
+PDF_SUMMARY_BATCH_SIZE = 1  # chunks per model call; 1 shows each part as soon as it is ready
+PDF_MEMORY_LIMIT_MB = 32  # growth allowed while reading a PDF before its parsed-object cache is dropped
+PDF_MEMORY_CHECK_PAGES = 16  # pages read between memory checks
+
+# Batch PDF Summarization (extraction in a process pool, summaries on one model worker)
+PDF_BATCH_WORKERS = min(4, os.cpu_count() or 1)
+PDF_BATCH_PREFETCH = 2  # documents scanned ahead of the model, per worker
+
+# OCR Fallback (pages without a text layer, e.g. scans: rendered with pypdfium2 and read by
+# Tesseract through pytesseract; skipped when either is not installed)
+PDF_OCR_ENABLED = True
+PDF_OCR_WORKERS = min(4, os.cpu_count() or 1)
+PDF_OCR_PREFETCH = 2  # pages read ahead of the summarizer per worker, so OCR runs in parallel
+PDF_OCR_DPI = 200
+PDF_OCR_LANGUAGE = "eng"  # Tesseract language codes, e.g. "eng+deu"
+
+# PDF Question Answering ("ask pdf <question>" over summarized PDFs)
+PDF_QA_EMBEDDER = "sentence-transformers/all-MiniLM-L6-v2"  # or "hashing" (no model download, lexical only)
+PDF_QA_CHUNK_SIZE = 800
+PDF_QA_CHUNK_OVERLAP = 150
+PDF_QA_TOP_K = 3
+PDF_QA_BATCH_SIZE = 32
+
+# Inference Resources (torch CPU threads for the summarizer; None = derived from the CPU topology)
+INFERENCE_THREADS = None  # intra-op threads per model call
+INFERENCE_INTEROP_THREADS = 1  # inter-op threads; pipelines run one op at a time
+INFERENCE_RESERVED_CORES = 1  # cores left to the UI, speech and search threads when INFERENCE_THREADS is None
+INFERENCE_CPU_CORES = None  # e.g. "2-5": pin the summarization worker to these cores (Linux only)
 
 # Model Settings
 PDF_SUMMARIZER_MODEL = "facebook/bart-large-cnn"
+BENCH_SUMMARIZER_MODEL = "sshleifer/bart-tiny-random"  # few-MB BART for timing the pipeline, not summary quality
+
+# Summary Profiles (speed vs quality, selectable per request; "model": None is PDF_SUMMARIZER_MODEL)
+PDF_SUMMARY_PROFILES = {
+    "fast": {"model": "sshleifer/distilbart-cnn-6-6", "num_beams": 1, "max_length": 80, "min_length": 20,
+             "no_repeat_ngram_size": 3},
+    "balanced": {"model": "sshleifer/distilbart-cnn-12-6", "num_beams": 2, "max_length": 110, "min_length": 30,
+                 "no_repeat_ngram_size": 3},
+    "quality": {"model": None, "num_beams": 4, "max_length": PDF_MAX_LENGTH, "min_length": PDF_MIN_LENGTH,
+                "length_penalty": 2.0, "no_repeat_ngram_size": 3},
+    # Model picked from PDF_MODEL_LADDER per document
+    "auto": {"model": "auto", "num_beams": 2, "max_length": PDF_MAX_LENGTH, "min_length": PDF_MIN_LENGTH,
+             "no_repeat_ngram_size": 3},
+}
+PDF_SUMMARY_PROFILE = "auto"
+
+# Model Ladder for the "auto" profile, smallest first. Seconds are CPU estimates
+# with the "auto" settings until chunks have been timed on this machine.
+PDF_MODEL_LADDER = [
+    {"model": "t5-small", "load_seconds": 2.0, "seconds_per_chunk": 0.6},
+    {"model": "sshleifer/distilbart-cnn-6-6", "load_seconds": 6.0, "seconds_per_chunk": 1.5},
+    {"model": "sshleifer/distilbart-cnn-12-6", "load_seconds": 8.0, "seconds_per_chunk": 2.5},
+    {"model": PDF_SUMMARIZER_MODEL, "load_seconds": 15.0, "seconds_per_chunk": 4.0},
+]
+PDF_AUTO_TIME_BUDGET = 40.0  # most seconds a summary may take, model load included
+PDF_AUTO_SECONDS_PER_CHUNK = 8.0  # the budget grows with the document, so short PDFs get quick models
+PDF_MAX_WARM_MODELS = 2  # summarization pipelines kept loaded; the least recently used is dropped
 
 # File Paths
 BOT_IMAGE_PATH = "bot.png"
 
+# Storage Settings
+DATA_DIR = os.environ.get("ASSISTIFY_DATA_DIR", os.path.join(os.path.expanduser("~"), ".assistify"))
+MEMORY_STORE_FILE = "memory.log"
+TODO_STORE_FILE = "todo.log"
+LOCAL_INDEX_FILE = "search_index.db"
+PDF_QA_DIR = os.path.join(DATA_DIR, "pdf_index")
+PDF_OCR_CACHE_DIR = os.path.join(DATA_DIR, "ocr_cache")
+STORE_FLUSH_INTERVAL = 0.5
+STORE_COMPACT_MIN_RECORDS = 256
+STORE_COMPACT_RATIO = 4
+
+# Speech Recognition Backends ("google", "sphinx", "vosk", "whisper" or "fake")
+VOICE_RECOGNIZER_BACKEND = "google"
+VOICE_LANGUAGE = "en-US"
+VOSK_MODEL_PATH = os.path.join(DATA_DIR, "models", "vosk-model-small-en-us-0.15")
+WHISPER_MODEL = "tiny.en"
+FAKE_TRANSCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures", "speech")
+
+# Batch Transcription
+TRANSCRIBE_WORKERS = min(4, os.cpu_count() or 1)
+TRANSCRIBE_READ_SECONDS = 1.0
+TRANSCRIBE_SEGMENT_SECONDS = 30
+TRANSCRIBE_EXTENSIONS = (".wav", ".flac", ".aiff", ".aif")
+
+# To-Do Settings
+TODO_PAGE_SIZE = 20
+TODO_SEARCH_LIMIT = 10
+
 # Colors
 COLOR_BG_PRIMARY = "#111214"
 COLOR_BG_SECONDARY = "#1b1b1b"
@@ -2,24 +2,55 @@
 Core chatbot logic and NLP processing.
 """
 
-from textblob import TextBlob
 from collections import defaultdict
-from nltk import bigrams
+from itertools import islice
+import heapq
 import random
 import re
-from utils.validators import safe_eval, parse_math_expression, extract_name_from_input, extract_task_number
-from config.settings import TRAINING_DATA
+import os
+from utils.validators import (
+    safe_eval, parse_math_expression, extract_name_from_input, extract_task_number,
+    extract_due_date, extract_page_number, parse_range_expression
+)
+from utils.calculator import default_engine, CalculatorError
+from utils.tokenizer import tokenize
+from config.settings import TRAINING_DATA, DATA_DIR, MEMORY_STORE_FILE, TODO_STORE_FILE, TODO_PAGE_SIZE, TODO_SEARCH_LIMIT
+from core.storage import AppendLog
+from utils.lazy import lazy_import
+from utils.profiling import timed
+
+# NLP packages are slow to import; load them when first used
+textblob = lazy_import("textblob")
+nltk = lazy_import("nltk")
 
 
 class ChatbotMemory:
     """Manages chatbot memory and user information."""
     
-    def __init__(self):
-        self.data = {}
+    def __init__(self, path=None):
+        self._store = AppendLog(path) if path else None
+        self._data = None
+    
+    @property
+    def data(self):
+        """Stored information, loaded from disk on first access."""
+        if self._data is None:
+            self._data = {}
+            if self._store:
+                for record in self._store.load():
+                    if record.get("op") == "set":
+                        self._data[record["key"]] = record["value"]
+                    elif record.get("op") == "clear":
+                        self._data.clear()
+                if self._store.should_compact(len(self._data)):
+                    self._store.compact([{"op": "set", "key": k, "value": v} for k, v in self._data.items()])
+        return self._data
     
     def set(self, key, value):
         """Store information."""
         self.data[key] = value
+        if self._store:
+            self._store.append({"op": "set", "key": key, "value": value})
     
     def get(self, key, default=None):
         """Retrieve stored information."""
@@ -28,34 +59,198 @@ class ChatbotMemory:
     def clear(self):
         """Clear all memory."""
         self.data.clear()
+        if self._store:
+            self._store.append({"op": "clear"})
 
 
 class TodoManager:
-    """Manages to-do list tasks."""
+    """Manages to-do list tasks with stable IDs, a word index and due dates."""
+    
+    def __init__(self, path=None):
+        self._store = AppendLog(path) if path else None
+        self._tasks = None
+        self._next_id = 1
+        self._index = defaultdict(set)
+        self._due_heap = []
+        self._stale_due = 0
+    
+    @property
+    def tasks(self):
+        """Tasks keyed by ID in insertion order."""
+        return self._load()
+    
+    def _load(self):
+        """Load tasks from disk on first access."""
+        if self._tasks is None:
+            self._tasks = {}
+            if self._store:
+                self._replay(self._store.load())
+                if self._store.should_compact(len(self._tasks)):
+                    self._store.compact([
+                        {"op": "add", "id": t["id"], "task": t["text"], "due": t["due"]}
+                        for t in self._tasks.values()
+                    ])
+        return self._tasks
+    
+    def _replay(self, records):
+        """Rebuild state from log records."""
+        for record in records:
+            op = record.get("op")
+            if op == "add":
+                task_id = record.get("id") or self._next_id
+                self._insert(task_id, record["task"], record.get("due"))
+            elif op == "remove":
+                if "id" in record:
+                    self._delete(record["id"])
+                elif 0 <= record.get("index", -1) < len(self._tasks):
+                    # Positional removes written by older versions of the log
+                    self._delete(list(self._tasks)[record["index"]])
+            elif op == "clear":
+                self._reset()
+    
+    def _insert(self, task_id, text, due):
+        """Insert a task into the store and its indexes."""
+        self._tasks[task_id] = {"id": task_id, "text": text, "due": due}
+        self._next_id = max(self._next_id, task_id + 1)
+        for word in self._words(text):
+            self._index[word].add(task_id)
+        if due:
+            heapq.heappush(self._due_heap, (due, task_id))
     
-    def __init__(self):
-        self.tasks = []
+    def _delete(self, task_id):
+        """Remove a task from the store and word index (heap entries expire lazily)."""
+        task = self._tasks.pop(task_id, None)
+        if task is None:
+            return None
+        if task["due"]:
+            self._stale_due += 1
+        for word in self._words(task["text"]):
+            ids = self._index.get(word)
+            if ids is not None:
+                ids.discard(task_id)
+                if not ids:
+                    del self._index[word]
+        return task
+    
+    def _reset(self):
+        """Drop all tasks and indexes."""
+        self._tasks.clear()
+        self._index.clear()
+        self._due_heap.clear()
+        self._stale_due = 0
+    
+    @staticmethod
+    def _words(text):
+        """Split text into lowercase index terms."""
+        return set(re.findall(r"\w+", text.lower()))
+    
+    def add_task(self, task, due=None):
+        """
+        Add a new task.
+        
+        Args:
+            task (str): Task description
+            due (str or None): Due date as ISO ``YYYY-MM-DD``
+            
+        Returns:
+            int or None: ID of the new task, or None if the task is empty
+        """
+        if not task:
+            return None
+        self._load()
+        task_id = self._next_id
+        self._insert(task_id, task, due)
+        if self._store:
+            self._store.append({"op": "add", "id": task_id, "task": task, "due": due})
+        return task_id
     
-    def add_task(self, task):
-        """Add a new task."""
-        if task:
-            self.tasks.append(task)
-            return True
-        return False
+    def remove_task(self, task_id):
+        """
+        Remove a task by ID.
+        
+        Returns:
+            str or None: Text of the removed task or None if not found
+        """
+        if task_id not in self.tasks:
+            return None
+        task = self._delete(task_id)
+        if self._store:
+            self._store.append({"op": "remove", "id": task_id})
+        return task["text"]
     
-    def remove_task(self, index):
-        """Remove task by index (0-based)."""
-        if 0 <= index < len(self.tasks):
-            return self.tasks.pop(index)
-        return None
+    def get_task(self, task_id):
+        """Get a task record by ID."""
+        return self.tasks.get(task_id)
     
     def get_all_tasks(self):
-        """Get all tasks."""
-        return self.tasks
+        """Get all task descriptions in insertion order."""
+        return [t["text"] for t in self.tasks.values()]
+    
+    def list_tasks(self, page=1, page_size=TODO_PAGE_SIZE):
+        """
+        Get one page of tasks.
+        
+        Args:
+            page (int): Page number (1-based)
+            page_size (int): Tasks per page
+            
+        Returns:
+            tuple: (list of task records, total number of pages)
+        """
+        total_pages = max(1, -(-len(self.tasks) // page_size))
+        page = min(max(page, 1), total_pages)
+        start = (page - 1) * page_size
+        return list(islice(self.tasks.values(), start, start + page_size)), total_pages
+    
+    def find_tasks(self, query, limit=TODO_SEARCH_LIMIT):
+        """
+        Find tasks containing every word of the query.
+        
+        Args:
+            query (str): Words to search for
+            limit (int): Maximum number of results
+            
+        Returns:
+            list: Matching task records, oldest first
+        """
+        words = self._words(query)
+        if not words:
+            return []
+        self._load()
+        postings = sorted((self._index.get(w, set()) for w in words), key=len)
+        ids = set(postings[0]).intersection(*postings[1:])
+        return [self._tasks[i] for i in sorted(ids)[:limit]]
+    
+    def next_due(self, count=1):
+        """
+        Get the tasks with the earliest due dates.
+        
+        Args:
+            count (int): Number of tasks to return
+            
+        Returns:
+            list: Task records ordered by due date
+        """
+        tasks = self.tasks
+        heap = self._due_heap
+        if count == 1:
+            # Discard entries for tasks removed since they were pushed
+            while heap and heap[0][1] not in tasks:
+                heapq.heappop(heap)
+                self._stale_due -= 1
+            return [tasks[heap[0][1]]] if heap else []
+        if self._stale_due:
+            heap[:] = [entry for entry in heap if entry[1] in tasks]
+            heapq.heapify(heap)
+            self._stale_due = 0
+        return [tasks[i] for _, i in heapq.nsmallest(count, heap)]
     
     def clear_tasks(self):
         """Clear all tasks."""
-        self.tasks.clear()
+        self._load()
+        self._reset()
+        if self._store:
+            self._store.append({"op": "clear"})
 
 
 class NGramModel:
@@ -69,7 +264,7 @@ class NGramModel:
         """Train the n-gram model."""
         for sentence in training_data:
             words = sentence.lower().split()
-            for w1, w2 in bigrams(words, pad_right=True, pad_left=True):
+            for w1, w2 in nltk.bigrams(words, pad_right=True, pad_left=True):
                 self.model[w1].append(w2)
     
     def generate_reply(self, start_word="hello", num_words=6):
@@ -90,11 +285,17 @@ class NGramModel:
 class Chatbot:
     """Main chatbot class handling conversational logic."""
     
-    def __init__(self):
-        self.memory = ChatbotMemory()
-        self.todo = TodoManager()
+    def __init__(self, data_dir=DATA_DIR):
+        """
+        Args:
+            data_dir (str or None): Directory for persisted memory and tasks,
+                or None to keep state in process memory only
+        """
+        self.memory = ChatbotMemory(os.path.join(data_dir, MEMORY_STORE_FILE) if data_dir else None)
+        self.todo = TodoManager(os.path.join(data_dir, TODO_STORE_FILE) if data_dir else None)
         self.ngram = NGramModel(TRAINING_DATA)
     
+    @timed("chatbot.get_response")
     def get_response(self, user_input):
         """
         Process user input and generate response.
@@ -105,62 +306,106 @@ class Chatbot:
         Returns:
             str: Bot's response
         """
-        text = user_input.lower().strip()
-        tokens = text.split()
+        message = tokenize(user_input)
         
         # To-Do List Management
-        if "add" in tokens and "task" in tokens:
-            return self._handle_add_task(text)
+        if message.has("add", "task"):
+            return self._handle_add_task(message)
+        
+        if message.has("show", "tasks"):
+            return self._handle_show_tasks(message)
+        
+        if message.has("delete", "task"):
+            return self._handle_delete_task(message)
         
-        if "show" in tokens and "tasks" in tokens:
-            return self._handle_show_tasks()
+        if message.has_any("find", "search") and message.has_any("task", "tasks"):
+            return self._handle_find_tasks(message)
         
-        if "delete" in tokens and "task" in tokens:
-            return self._handle_delete_task(text)
+        if message.has("next") and message.has_any("task", "what's", "what"):
+            return self._handle_next_task()
         
         # Date & Time
-        if "time" in tokens or "date" in tokens:
+        if message.has_any("time", "date"):
             return self._handle_time_request()
         
         # Memory (name)
-        name_input = extract_name_from_input(text)
+        name_input = extract_name_from_input(message)
         if name_input:
             self.memory.set("name", name_input)
             return f"Nice to meet you, {name_input}! I'll remember your name."
         
-        if "what" in tokens and "name" in tokens:
+        if message.has("name") and message.has_any("what", "what's"):
             return self._handle_name_query()
         
+        # Bulk calculator ("x^2+1 for x in 1..1e6")
+        range_expr = parse_range_expression(message)
+        if range_expr:
+            return self._handle_range_calculation(*range_expr)
+        
         # Calculator
-        expr = parse_math_expression(text)
-        if any(op in expr for op in ["+", "-", "*", "/", "(", ")", "**"]):
-            return self._handle_calculation(expr)
+        if message.has_math:
+            expr = parse_math_expression(message)
+            if ";" in expr:
+                return self._handle_bulk_calculation(expr.split(";"))
+            if any(op in expr for op in ["+", "-", "*", "/", "(", ")", "**"]):
+                return self._handle_calculation(expr)
         
         # Sentiment & Normal Chat
-        return self._handle_sentiment_and_chat(user_input, tokens)
+        return self._handle_sentiment_and_chat(message)
     
-    def _handle_add_task(self, text):
+    def _handle_add_task(self, message):
         """Handle adding a task."""
-        task = text.replace("add task", "").strip()
-        if self.todo.add_task(task):
-            return f"Task added: '{task}' ✅"
+        task = message.after("add", "task")
+        if task is None:
+            task = message.text.replace("add task", "").strip()
+        task, due = extract_due_date(task)
+        task_id = self.todo.add_task(task, due)
+        if task_id:
+            due_note = f" (due {due})" if due else ""
+            return f"Task #{task_id} added: '{task}'{due_note} ✅"
         else:
             return "Please specify a task to add."
     
-    def _handle_show_tasks(self):
+    @staticmethod
+    def _format_task(task):
+        """Format a task record as a list line."""
+        due_note = f" (due {task['due']})" if task["due"] else ""
+        return f"{task['id']}. {task['text']}{due_note}"
+    
+    def _handle_show_tasks(self, message):
         """Handle showing tasks."""
-        tasks = self.todo.get_all_tasks()
+        page = extract_page_number(message)
+        tasks, total_pages = self.todo.list_tasks(page)
         if tasks:
-            task_list = "\n".join([f"{i+1}. {t}" for i, t in enumerate(tasks)])
-            return f"📝 Your To-Do List:\n{task_list}"
+            task_list = "\n".join(self._format_task(t) for t in tasks)
+            page_note = f"\n(Page {min(page, total_pages)} of {total_pages} - say 'show tasks page N')" if total_pages > 1 else ""
+            return f"📝 Your To-Do List:\n{task_list}{page_note}"
         else:
             return "Your To-Do List is empty."
     
-    def _handle_delete_task(self, text):
+    def _handle_find_tasks(self, message):
+        """Handle searching tasks by words."""
+        query = message.without("find", "search", "task", "tasks", "for")
+        tasks = self.todo.find_tasks(query)
+        if tasks:
+            task_list = "\n".join(self._format_task(t) for t in tasks)
+            return f"🔎 Matching tasks:\n{task_list}"
+        else:
+            return "No matching tasks found."
+    
+    def _handle_next_task(self):
+        """Handle asking for the next due task."""
+        tasks = self.todo.next_due()
+        if tasks:
+            return f"⏰ Next up: {self._format_task(tasks[0])}"
+        else:
+            return "No tasks with a due date. Add one with 'add task ... by YYYY-MM-DD'."
+    
+    def _handle_delete_task(self, message):
         """Handle deleting a task."""
-        task_num = extract_task_number(text)
+        task_num = extract_task_number(message)
         if task_num:
-            removed = self.todo.remove_task(task_num - 1)
+            removed = self.todo.remove_task(task_num)
             if removed:
                 return f"Deleted task: '{removed}' ❌"
             else:
@@ -190,9 +435,35 @@ class Chatbot:
         else:
             return "Sorry, I couldn't calculate that."
     
-    def _handle_sentiment_and_chat(self, user_input, tokens):
+    def _handle_bulk_calculation(self, expressions):
+        """Handle several semicolon-separated calculations."""
+        expressions = [e.strip() for e in expressions if e.strip()]
+        summary = default_engine.evaluate_many(expressions)
+        lines = [
+            f"{i+1}. {e} = {r if r is not None else 'error'}"
+            for i, (e, r) in enumerate(zip(expressions, summary["results"]))
+        ]
+        return "🧮 Results:\n" + "\n".join(lines)
+    
+    def _handle_range_calculation(self, expr, variable, start, stop, step):
+        """Handle evaluating one expression over a range of values."""
+        try:
+            stats = default_engine.evaluate_range(expr, variable, start, stop, step)
+        except CalculatorError as e:
+            return f"Sorry, I couldn't calculate that: {e}"
+        if not stats["count"]:
+            return f"{expr} has no finite values for {variable} in {start:g}..{stop:g}."
+        samples = ", ".join(f"{x:g}→{y:g}" for x, y in stats["samples"])
+        invalid_note = f"\nSkipped {stats['invalid']:,} non-finite values." if stats["invalid"] else ""
+        return (
+            f"📊 {expr} for {variable} in {start:g}..{stop:g} ({stats['count']:,} values):\n"
+            f"min {stats['min']:g}, max {stats['max']:g}, mean {stats['mean']:g}, std {stats['std']:g}\n"
+            f"Samples: {samples}{invalid_note}"
+        )
+    
+    def _handle_sentiment_and_chat(self, message):
         """Handle sentiment analysis and normal conversation."""
-        sentiment = TextBlob(user_input).sentiment.polarity
+        sentiment = textblob.TextBlob(message.raw).sentiment.polarity
         
         if sentiment > 0.2:
             return "That sounds positive! 😃"
@@ -200,15 +471,15 @@ class Chatbot:
             return "I'm sorry to hear that. Stay strong! 🌸"
         
         # Normal chat
-        if any(word in tokens for word in ["hello", "hi"]):
+        if message.has_any("hello", "hi"):
             return "Hello! How are you today?"
-        if "how" in tokens and "you" in tokens:
+        if message.has("how", "you"):
             return "I'm just a bot, but I'm doing great! 🤖"
-        if "bye" in tokens:
+        if message.has("bye"):
             return "Goodbye! Have a wonderful day!"
         
         # Fallback ngram
-        if tokens:
-            return self.ngram.generate_reply(tokens[0])
+        if message.tokens:
+            return self.ngram.generate_reply(message.tokens[0])
         else:
             return "I see! Tell me more."
@@ -0,0 +1,145 @@
+"""
+Durable append-only storage for chatbot state.
+"""
+
+import atexit
+import json
+import os
+import threading
+from config.settings import STORE_FLUSH_INTERVAL, STORE_COMPACT_MIN_RECORDS, STORE_COMPACT_RATIO
+
+
+class AppendLog:
+    """Write-ahead JSON-lines log with debounced fsync."""
+
+    def __init__(self, path, flush_interval=STORE_FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.record_count = 0
+        self._file = None
+        self._timer = None
+        self._dirty = False
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def load(self):
+        """
+        Read all records from the log.
+
+        Lines that fail to decode (e.g. a write torn by a crash) are skipped.
+
+        Returns:
+            list: Decoded records in write order
+        """
+        records = []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Storage load error ({self.path}): {e}")
+        self.record_count = len(records)
+        return records
+
+    def append(self, record):
+        """
+        Append a record. The write is buffered and fsync'd by a debounced timer.
+
+        Args:
+            record (dict): JSON-serializable record
+        """
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            try:
+                self._open().write(line)
+            except OSError as e:
+                print(f"Storage write error ({self.path}): {e}")
+                return
+            self.record_count += 1
+            self._dirty = True
+            if self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Flush buffered records to disk and fsync."""
+        with self._lock:
+            self._timer = None
+            if self._file is None or not self._dirty:
+                return
+            self._dirty = False
+            f = self._file
+            try:
+                f.flush()
+            except (OSError, ValueError) as e:
+                print(f"Storage flush error ({self.path}): {e}")
+                return
+        # fsync outside the lock so appends never wait on the disk
+        try:
+            os.fsync(f.fileno())
+        except (OSError, ValueError):
+            pass
+
+    def should_compact(self, live_count):
+        """Check whether the log has grown large relative to the live state."""
+        return (self.record_count >= STORE_COMPACT_MIN_RECORDS
+                and self.record_count > STORE_COMPACT_RATIO * max(live_count, 1))
+
+    def compact(self, records):
+        """
+        Atomically replace the log with a snapshot.
+
+        Args:
+            records (list): Records that reproduce the current state
+        """
+        tmp_path = self.path + ".tmp"
+        with self._lock:
+            try:
+                self._ensure_dir()
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    for record in records:
+                        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                os.replace(tmp_path, self.path)
+                self.record_count = len(records)
+                self._dirty = False
+            except OSError as e:
+                print(f"Storage compaction error ({self.path}): {e}")
+
+    def close(self):
+        """Flush pending writes and close the log file."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self.flush()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _open(self):
+        """Open the log for appending on first write."""
+        if self._file is None:
+            self._ensure_dir()
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self._file
+
+    def _ensure_dir(self):
+        """Create the parent directory if needed."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
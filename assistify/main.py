@@ -8,42 +8,111 @@ from tkinter import messagebox, filedialog
 import threading
 import time
 import os
+from pathlib import Path
 
 from config.settings import (
     APP_NAME, WINDOW_WIDTH, WINDOW_HEIGHT, APPEARANCE_MODE, 
-    COLOR_THEME, APP_AUTHOR
+    COLOR_THEME, APP_AUTHOR, STARTUP_WARMUP_DELAY_MS,
+    DATA_DIR, LOCAL_INDEX_ENABLED, LOCAL_INDEX_FILE, PDF_SUMMARY_PROFILES, PDF_SUMMARY_PROFILE
 )
-from core.chatbot import Chatbot
-from modules.search import SearchManager
-from modules.voice import VoiceManager
-from modules.pdf_summarizer import PDFSummarizer
 from ui.components import ApplicationWindow
+from utils.lazy import lazy_property
+from utils.profiling import span
 
 
 class AssistifyApp:
     """Main Assistify application class."""
     
     def __init__(self):
-        # Initialize components
-        self.chatbot = Chatbot()
-        self.search_manager = SearchManager()
-        self.voice_manager = VoiceManager()
-        self.pdf_summarizer = PDFSummarizer()
+        # Components are built on first use (or by the warm-up after the
+        # window appears) so their heavy imports do not delay startup
         
         # Setup appearance
         ctk.set_appearance_mode(APPEARANCE_MODE)
         ctk.set_default_color_theme(COLOR_THEME)
         
+        self.summary_profile = PDF_SUMMARY_PROFILE  # chosen in the sidebar
+        
         # Create UI
-        self.app_window = ApplicationWindow(APP_NAME, WINDOW_WIDTH, WINDOW_HEIGHT)
-        self.app_window.setup_ui(
-            on_new_chat=self.new_chat_action,
-            on_pdf_summarize=self.open_and_summarize_pdf,
-            on_voice_toggle=self.toggle_voice,
-            on_listen=self.listen_voice,
-            on_send_callback=self.send_message,
-            author_name=APP_AUTHOR
-        )
+        with span("startup.window"):
+            self.app_window = ApplicationWindow(APP_NAME, WINDOW_WIDTH, WINDOW_HEIGHT)
+            self.app_window.setup_ui(
+                on_new_chat=self.new_chat_action,
+                on_pdf_summarize=self.open_and_summarize_pdf,
+                on_voice_toggle=self.toggle_voice,
+                on_listen=self.listen_voice,
+                on_continuous_toggle=self.toggle_continuous_listening,
+                on_pdf_batch=self.batch_summarize_pdfs,
+                summary_profiles=list(PDF_SUMMARY_PROFILES),
+                summary_profile=PDF_SUMMARY_PROFILE,
+                on_profile_change=self.set_summary_profile,
+                on_send_callback=self.send_message,
+                author_name=APP_AUTHOR
+            )
+    
+    @lazy_property
+    def chatbot(self):
+        """Chatbot with persisted memory and tasks (imports the NLP stack)."""
+        with span("startup.chatbot"):
+            from core.chatbot import Chatbot
+            return Chatbot()
+    
+    @lazy_property
+    def local_index(self):
+        """Full-text index of past search results and PDF summaries (None if disabled)."""
+        if not LOCAL_INDEX_ENABLED:
+            return None
+        with span("startup.local_index"):
+            from modules.local_index import LocalIndex
+            return LocalIndex(os.path.join(DATA_DIR, LOCAL_INDEX_FILE))
+    
+    @lazy_property
+    def search_manager(self):
+        """Wikipedia, web and YouTube search on a background event loop."""
+        with span("startup.search_manager"):
+            from modules.async_search import BackgroundSearchManager
+            return BackgroundSearchManager(index=self.local_index)
+    
+    @lazy_property
+    def voice_manager(self):
+        """Speech output and recognition."""
+        with span("startup.voice_manager"):
+            from modules.voice import VoiceManager
+            return VoiceManager()
+    
+    @lazy_property
+    def pdf_summarizer(self):
+        """PDF extraction and summarization (the model loads on first summary)."""
+        with span("startup.pdf_summarizer"):
+            from modules.pdf_summarizer import PDFSummarizer
+            return PDFSummarizer(index=self.local_index, qa_index=self.pdf_qa.index)
+    
+    @lazy_property
+    def pdf_qa(self):
+        """Questions over summarized PDFs (the embedding model loads on first use)."""
+        from modules.pdf_qa import PDFQuestionAnswerer
+        return PDFQuestionAnswerer()
+    
+    def _warm_up(self):
+        """Build the components a first message needs, off the UI thread."""
+        for name in ("chatbot", "voice_manager", "local_index", "search_manager"):
+            try:
+                getattr(self, name)
+            except Exception as e:
+                print(f"Startup warm-up error ({name}): {e}")
+    
+    def _stop_speaking(self):
+        """Interrupt speech; a no-op while the voice manager is not built (nothing can be speaking)."""
+        if type(self).voice_manager.is_loaded(self):
+            self.voice_manager.stop_speaking()
+    
+    def _speak(self, text):
+        """Speak text without building the voice manager on the UI thread."""
+        if type(self).voice_manager.is_loaded(self):
+            self.voice_manager.speak(text)
+        else:
+            # Waits for the warm-up (or builds the manager) off the UI thread
+            threading.Thread(target=lambda: self.voice_manager.speak(text), daemon=True).start()
     
     def send_message(self, event=None):
         """Handle user message sending."""
@@ -51,22 +120,39 @@ class AssistifyApp:
         if not user_msg:
             return
         
+        # New input interrupts whatever is still being spoken
+        self._stop_speaking()
+        
         # Display user message
         self.app_window.chat_box.append_message(f"You: {user_msg}", "user")
         self.app_window.input_area.clear_input()
         
+        if user_msg.lower().startswith("ask pdf"):
+            self.ask_pdf(user_msg[len("ask pdf"):].strip(" :,"))
+            return
+        
         # Get bot response
         bot_reply = self.chatbot.get_response(user_msg)
         self.app_window.chat_box.append_message(f"Assistify Bot: {bot_reply}", "bot")
         
         # Speak response
-        self.voice_manager.speak(bot_reply)
+        self._speak(bot_reply)
+    
+    def ask_pdf(self, question):
+        """Answer a question from summarized PDFs, off the UI thread."""
+        def run_ask():
+            try:
+                answer = self.pdf_qa.ask(question)
+            except Exception as e:
+                answer = f"❌ PDF question error: {e}"
+            self.app_window.chat_box.append_message(answer, "bot")
+        
+        threading.Thread(target=run_ask, daemon=True).start()
     
     def new_chat_action(self):
         """Handle new chat action."""
         if messagebox.askyesno("New Chat", "Start a new chat?"):
             self.app_window.chat_box.clear()
-            self.chatbot.todo.clear_tasks()
     
     def toggle_voice(self):
         """Toggle voice output."""
@@ -75,56 +161,14 @@ class AssistifyApp:
     
     def listen_voice(self):
         """Listen for voice input, wait before 'no result', and show all search results for voice-triggered search."""
+        self._stop_speaking()
         self.app_window.chat_box.append_message("🎙 Listening... Speak now!", "bot")
 
         def run_listen():
             try:
                 command = self.voice_manager.listen()
                 if command and len(command.strip()) > 0:
-                    self.app_window.chat_box.append_message(f"You (voice): {command}", "user")
-                    # If the command looks like a search, run full search (Wikipedia, web, YouTube)
-                    search_keywords = ["search", "find", "look up", "google", "youtube"]
-                    if any(kw in command.lower() for kw in search_keywords):
-                        self.app_window.chat_box.append_message("🔎 Voice search triggered. Gathering results...", "bot")
-                        # Run search in this thread for voice
-                        try:
-                            # Wikipedia
-                            wiki_result = self.search_manager.wikipedia.get_summary(command)
-                            self.app_window.chat_box.append_message("📘 Wikipedia summary:", "bot")
-                            self.app_window.chat_box.append_message(wiki_result, "bot")
-                            self.voice_manager.speak(wiki_result[:200])
-                        except Exception as e:
-                            self.app_window.chat_box.append_message(f"⚠️ Wikipedia unavailable: {e}", "bot")
-
-                        # Web Search
-                        results, search_engine = self.search_manager.web.get_results(command)
-                        if results:
-                            self.app_window.chat_box.append_message("🌐 Web search results:\n", "bot")
-                            self.app_window.chat_box.append_message(f"(Results from {search_engine})\n", "bot")
-                            for i, result in enumerate(results):
-                                title = result.get('title', 'No title')
-                                url = result.get('url', '')
-                                if url:
-                                    self.app_window.chat_box.insert_link(f"{i+1}. {title}", url)
-                        else:
-                            self.app_window.chat_box.append_message("🌐 Web search - No results found.", "bot")
-
-                        # YouTube Search
-                        videos = self.search_manager.youtube.search(command)
-                        if videos:
-                            self.app_window.chat_box.append_message("🎬 YouTube videos:\n", "bot")
-                            for idx, video in enumerate(videos):
-                                title = video.get('title', 'No title')
-                                url = video.get('url', '')
-                                if url:
-                                    self.app_window.chat_box.insert_link(f"{idx+1}. {title}", url)
-                        else:
-                            self.app_window.chat_box.append_message("🎬 YouTube - No videos found.", "bot")
-                    else:
-                        # Not a search, treat as normal chat
-                        bot_reply = self.chatbot.get_response(command)
-                        self.app_window.chat_box.append_message(f"Assistify Bot: {bot_reply}", "bot")
-                        self.voice_manager.speak(bot_reply)
+                    self._handle_voice_command(command)
                 else:
                     # Wait a few seconds before showing 'no result'
                     time.sleep(2.5)
@@ -137,6 +181,44 @@ class AssistifyApp:
         thread = threading.Thread(target=run_listen, daemon=True)
         thread.start()
     
+    def toggle_continuous_listening(self):
+        """Turn hands-free listening on or off."""
+        if self.voice_manager.is_continuous():
+            self.voice_manager.stop_continuous()
+            self.app_window.chat_box.append_message("🎧 Hands-free listening off.", "bot")
+        else:
+            self._stop_speaking()
+            self.voice_manager.start_continuous(self._on_continuous_command)
+            self.app_window.chat_box.append_message("🎧 Hands-free listening on. Just start talking.", "bot")
+        self.app_window.control_bar.update_continuous_button(self.voice_manager.is_continuous())
+    
+    def _on_continuous_command(self, command):
+        """Handle a phrase recognized in hands-free mode."""
+        try:
+            self._handle_voice_command(command)
+        except Exception as e:
+            error_msg = f"🎙 Error: {str(e)}"
+            print(error_msg)
+            self.app_window.chat_box.append_message(error_msg, "bot")
+    
+    def _handle_voice_command(self, command):
+        """Show a recognized voice command and answer it (runs off the UI thread)."""
+        self.app_window.chat_box.append_message(f"You (voice): {command}", "user")
+        # If the command looks like a search, run full search (Wikipedia, web, YouTube)
+        search_keywords = ["search", "find", "look up", "google", "youtube"]
+        if any(kw in command.lower() for kw in search_keywords):
+            self.app_window.chat_box.append_message("🔎 Voice search triggered. Gathering results...", "bot")
+            self.start_search(command)
+        else:
+            # Not a search, treat as normal chat
+            bot_reply = self.chatbot.get_response(command)
+            self.app_window.chat_box.append_message(f"Assistify Bot: {bot_reply}", "bot")
+            self.voice_manager.speak(bot_reply)
+    
+    def set_summary_profile(self, profile):
+        """Use a summary profile (speed vs quality) for the next PDF summaries."""
+        self.summary_profile = profile
+    
     def open_and_summarize_pdf(self):
         """Open PDF file and summarize with AI."""
         file_path = filedialog.askopenfilename(
@@ -151,69 +233,185 @@ class AssistifyApp:
             "bot"
         )
         
-        def run_summarize():
-            try:
+        root = self.app_window.root
+        progress = self.app_window.progress
+        profile = self.summary_profile
+        progress.show("🤖 Loading model and reading PDF...")
+        
+        def on_progress(done, total, eta):
+            root.after(0, self._show_pdf_progress, done, total, eta)
+        
+        def on_indexed(chunks, error):
+            # The question index is built after the summary, in the background
+            if error:
+                self.app_window.chat_box.append_message(f"❌ PDF question index error: {error}", "bot")
+            elif chunks:
                 self.app_window.chat_box.append_message(
-                    "🤖 Loading model and processing PDF, please wait...", 
-                    "bot"
+                    f"📑 {os.path.basename(file_path)} is ready for questions (ask pdf ...)", "bot"
                 )
-                summary = self.pdf_summarizer.summarize_file(file_path)
+        
+        def run_summarize():
+            try:
                 self.app_window.chat_box.append_message("🤖 AI PDF Summary:", "bot")
-                self.app_window.chat_box.append_message(summary, "bot")
-                self.voice_manager.speak(summary[:200])
+                parts = self.voice_manager.speak_stream(
+                    self.pdf_summarizer.iter_summary_file(file_path, on_progress=on_progress, profile=profile,
+                                                          on_indexed=on_indexed),
+                    text_of=lambda part: part[1] + "\n" if part[0] is not None else None
+                )
+                for part_number, text in parts:
+                    if part_number is None:
+                        self.app_window.chat_box.append_message(text, "bot")
+                    else:
+                        self.app_window.chat_box.append_message(f"Part {part_number}:\n{text}", "bot")
             except Exception as e:
                 self.app_window.chat_box.append_message(f"❌ PDF Summarization error: {e}", "bot")
+            finally:
+                root.after(0, progress.hide)
         
         threading.Thread(target=run_summarize, daemon=True).start()
     
-    def search_thread(self, query):
-        """Perform comprehensive search."""
-        try:
-            self.app_window.chat_box.append_message("🔎 Searching the web...", "bot")
-            
-            # Wikipedia Search
+    def _show_pdf_progress(self, done, total, eta):
+        """Update the progress bar with parts done and the time left."""
+        from modules.pdf_summarizer import describe_progress
+        self.app_window.progress.update(done / total if total else 1.0, f"🤖 {describe_progress(done, total, eta)}")
+    
+    def batch_summarize_pdfs(self):
+        """Summarize several PDFs (or a folder of them) with per-file progress."""
+        paths = list(filedialog.askopenfilenames(
+            filetypes=[("PDF files", "*.pdf")],
+            title="Select PDFs to Summarize (cancel to pick a folder)"
+        ))
+        if not paths:
+            folder = filedialog.askdirectory(title="Select a Folder of PDFs")
+            if not folder:
+                return
+            paths = [folder]
+        
+        profile = self.summary_profile
+        
+        def progress(event, record, detail):
+            chat_box = self.app_window.chat_box
+            if event == "start":
+                position, total = detail
+                chat_box.append_message(f"📄 [{position}/{total}] {record['name']} ({record['pages']} pages)...", "bot")
+            elif event == "done":
+                if record["error"]:
+                    chat_box.append_message(f"❌ {record['name']}: {record['error']}", "bot")
+                else:
+                    seconds = record['summarize_ms'] / 1000
+                    chat_box.append_message(f"✅ {record['name']} ({seconds:.1f}s):\n{record['summary']}", "bot")
+        
+        def run_batch():
+            from modules.pdf_batch import BatchSummarizer, format_totals
             try:
-                wiki_result = self.search_manager.wikipedia.get_summary(query)
-                self.app_window.chat_box.append_message("📘 Wikipedia summary:", "bot")
-                self.app_window.chat_box.append_message(wiki_result, "bot")
-                self.voice_manager.speak(wiki_result[:200])
+                self.app_window.chat_box.append_message("📚 Batch summarizing PDFs, loading model...", "bot")
+                totals = BatchSummarizer(self.pdf_summarizer, on_progress=progress, profile=profile).run(paths)
+                if not totals["files"]:
+                    self.app_window.chat_box.append_message("📚 No PDFs found.", "bot")
+                    return
+                self.app_window.chat_box.append_message(f"📚 Done: {format_totals(totals)}", "bot")
             except Exception as e:
-                self.app_window.chat_box.append_message(f"⚠️ Wikipedia unavailable: {e}", "bot")
-            
-            time.sleep(0.5)
-            
-            # Web Search
-            results, search_engine = self.search_manager.web.get_results(query)
-            
-            if results:
-                self.app_window.chat_box.append_message("🌐 Web search results:\n", "bot")
-                self.app_window.chat_box.append_message(f"(Results from {search_engine})\n", "bot")
-                for i, result in enumerate(results):
-                    title = result.get('title', 'No title')
-                    url = result.get('url', '')
-                    if url:
-                        self.app_window.chat_box.insert_link(f"{i+1}. {title}", url)
-            else:
-                self.app_window.chat_box.append_message("🌐 Web search - No results found.", "bot")
-            
-            time.sleep(0.5)
-            
-            # YouTube Search
-            videos = self.search_manager.youtube.search(query)
-            
-            if videos:
-                self.app_window.chat_box.append_message("🎬 YouTube videos:\n", "bot")
-                for idx, video in enumerate(videos):
-                    title = video.get('title', 'No title')
-                    url = video.get('url', '')
-                    if url:
-                        self.app_window.chat_box.insert_link(f"{idx+1}. {title}", url)
-            else:
-                self.app_window.chat_box.append_message("🎬 YouTube - No videos found.", "bot")
+                self.app_window.chat_box.append_message(f"❌ Batch summarization error: {e}", "bot")
         
+        threading.Thread(target=run_batch, name="pdf-batch", daemon=True).start()
+    
+    def start_search(self, query):
+        """
+        Show local matches, then start Wikipedia, web and YouTube searches at once.
+
+        The local index and search loop are built (on a search before the
+        warm-up) and queried off the UI thread. The requests run on the
+        search event loop; each source is shown as soon as it answers, on
+        the UI thread.
+        """
+        threading.Thread(target=self._run_search, args=(query,), name="search", daemon=True).start()
+    
+    def _run_search(self, query):
+        """Query the local index and start the remote searches (search thread)."""
+        root = self.app_window.root
+        try:
+            hits = self.local_index.search(query) if self.local_index is not None else []
+        except Exception as e:
+            print(f"Local index error: {e}")
+            hits = []
+        if hits:
+            root.after(0, self._show_local_results, hits)
+        try:
+            futures = self.search_manager.start_all(query)
+        except Exception as e:
+            root.after(0, self.app_window.chat_box.append_message, f"❌ Search error: {e}", "bot")
+            return
+        renderers = {
+            'wikipedia': self._show_wikipedia_result,
+            'web': self._show_web_results,
+            'youtube': self._show_youtube_results,
+        }
+        for source, future in futures.items():
+            future.add_done_callback(
+                lambda f, render=renderers[source]: root.after(0, self._show_search_result, render, f)
+            )
+    
+    def _show_local_results(self, hits):
+        """Show earlier results and PDF summaries that matched the query in the local index."""
+        self.app_window.chat_box.append_message("🗂️ From earlier results:\n", "bot")
+        for idx, hit in enumerate(hits):
+            label = f"{idx+1}. [{hit['source']}] {hit['title']}"
+            url = hit['url']
+            if url and os.path.isabs(url):
+                url = Path(url).as_uri()  # summarized PDFs link to the file
+            if url:
+                self.app_window.chat_box.insert_link(label, url)
+            else:
+                self.app_window.chat_box.append_message(label, "bot")
+            if hit['snippet'] and hit['snippet'] != hit['title']:
+                self.app_window.chat_box.append_message(f"   {hit['snippet']}", "bot")
+    
+    def _show_search_result(self, render, future):
+        """Render one finished search future."""
+        try:
+            render(future.result())
         except Exception as e:
             self.app_window.chat_box.append_message(f"❌ Search error: {e}", "bot")
     
+    def _show_wikipedia_result(self, wiki_result):
+        """Show and speak the Wikipedia summary."""
+        self.app_window.chat_box.append_message("📘 Wikipedia summary:", "bot")
+        if not type(self).voice_manager.is_loaded(self):
+            # Show it now; speaking waits for the voice manager off the UI thread
+            self.app_window.chat_box.append_message(wiki_result, "bot")
+            threading.Thread(target=lambda: list(self.voice_manager.speak_stream([wiki_result])), daemon=True).start()
+            return
+        for text in self.voice_manager.speak_stream([wiki_result]):
+            self.app_window.chat_box.append_message(text, "bot")
+    
+    def _show_web_results(self, web):
+        """Show web results as links."""
+        results, search_engine = web
+        if results:
+            self.app_window.chat_box.append_message("🌐 Web search results:\n", "bot")
+            self.app_window.chat_box.append_message(f"(Results from {search_engine})\n", "bot")
+            for i, result in enumerate(results):
+                title = result.get('title', 'No title')
+                url = result.get('url', '')
+                if url:
+                    self.app_window.chat_box.insert_link(f"{i+1}. {title}", url)
+        else:
+            self.app_window.chat_box.append_message("🌐 Web search - No results found.", "bot")
+    
+    def _show_youtube_results(self, videos):
+        """Show YouTube videos as links."""
+        if videos:
+            self.app_window.chat_box.append_message("🎬 YouTube videos:\n", "bot")
+            for idx, video in enumerate(videos):
+                title = video.get('title', 'No title')
+                if video.get('duration'):
+                    title = f"{title} ({video['duration']})"
+                url = video.get('url', '')
+                if url:
+                    self.app_window.chat_box.insert_link(f"{idx+1}. {title}", url)
+        else:
+            self.app_window.chat_box.append_message("🎬 YouTube - No videos found.", "bot")
+    
     def on_search_click(self):
         """Handle search button click."""
         query = self.app_window.input_area.get_input()
@@ -221,9 +419,11 @@ class AssistifyApp:
             self.app_window.input_area.entry.focus()
             return
         
+        self._stop_speaking()
         self.app_window.chat_box.append_message(f"You (search): {query}", "user")
         self.app_window.input_area.clear_input()
-        threading.Thread(target=self.search_thread, args=(query,), daemon=True).start()
+        self.app_window.chat_box.append_message("🔎 Searching the web...", "bot")
+        self.start_search(query)
     
     def run(self):
         """Run the application."""
@@ -236,6 +436,12 @@ class AssistifyApp:
             "bot"
         )
         
+        # Load the rest once the window is on screen
+        self.app_window.root.after(
+            STARTUP_WARMUP_DELAY_MS,
+            lambda: threading.Thread(target=self._warm_up, name="warm-up", daemon=True).start()
+        )
+        
         # Start application
         self.app_window.run()
 
@@ -0,0 +1,373 @@
+"""
+Asyncio search over one shared HTTP client, plus a thread-safe sync facade.
+
+Many searches share one connection pool and one event loop thread, so
+hundreds of concurrent queries do not need hundreds of OS threads. HTML
+parsing is shared with the blocking implementation in ``modules.search``.
+"""
+
+import asyncio
+import contextlib
+import threading
+from urllib.parse import quote_plus
+from config.settings import (
+    USER_AGENT, WEB_SEARCH_RESULTS, YOUTUBE_RESULTS, WIKIPEDIA_SENTENCES,
+    SEARCH_TIMEOUT, SEARCH_CONCURRENCY, SEARCH_MAX_CONNECTIONS, SEARCH_MAX_CONNECTIONS_PER_HOST
+)
+from modules import youtube
+from modules.local_index import index_search_results
+from modules.search import WikipediaSearch, WebSearch, YouTubeSearch
+from utils.profiling import span
+
+BING_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+class AsyncHTTPClient:
+    """
+    Shared aiohttp session with a cap on requests in flight.
+
+    The session is created on first use inside the running loop, as aiohttp
+    requires, and reused for every request afterwards.
+    """
+
+    def __init__(self, concurrency=SEARCH_CONCURRENCY, timeout=SEARCH_TIMEOUT,
+                 max_connections=SEARCH_MAX_CONNECTIONS, max_per_host=SEARCH_MAX_CONNECTIONS_PER_HOST):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self._session = None
+        self._semaphore = None
+
+    async def _get_session(self):
+        """Create the session and semaphore in the current loop."""
+        if self._session is None or self._session.closed:
+            try:
+                import aiohttp
+            except ImportError as e:
+                raise ImportError("Async search requires the 'aiohttp' package") from e
+            connector = aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.max_per_host,
+                                             ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"User-Agent": USER_AGENT},
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._session
+
+    async def get_text(self, url, params=None, headers=None):
+        """
+        GET a page.
+
+        Returns:
+            tuple: (HTTP status, body text)
+        """
+        session = await self._get_session()
+        async with self._semaphore:
+            async with session.get(url, params=params, headers=headers) as response:
+                return response.status, await response.text()
+
+    async def get_json(self, url, params=None, headers=None):
+        """
+        GET a JSON document.
+
+        Returns:
+            tuple: (HTTP status, decoded JSON or None)
+        """
+        session = await self._get_session()
+        async with self._semaphore:
+            async with session.get(url, params=params, headers=headers) as response:
+                if response.status != 200:
+                    return response.status, None
+                return response.status, await response.json(content_type=None)
+
+    @contextlib.asynccontextmanager
+    async def stream(self, url, params=None, headers=None):
+        """
+        GET a response to read incrementally (``response.content``).
+
+        Leaving the block early releases the connection without reading the rest.
+        """
+        session = await self._get_session()
+        async with self._semaphore:
+            async with session.get(url, params=params, headers=headers) as response:
+                yield response
+
+    async def close(self):
+        """Close the session and its connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+class AsyncWikipediaSearch:
+    """Wikipedia summaries over the shared client, sharing ``WikipediaClient``'s caches."""
+
+    def __init__(self, client, wiki=None):
+        self.client = client
+        self.wiki = wiki or WikipediaSearch.client
+
+    async def get_summary(self, query, sentences=WIKIPEDIA_SENTENCES):
+        """
+        Get the intro of the best matching article.
+
+        Args:
+            query (str): Search query
+            sentences (int): Sentences of the intro to return
+
+        Returns:
+            str: Summary or error message (same wording as ``WikipediaSearch``)
+        """
+        message = self.wiki.cached(query, sentences)
+        if message is not None:
+            return message
+        try:
+            with span("search.wikipedia", mode="async"):
+                self.wiki.requests_made += 1
+                status, data = await self.client.get_json(self.wiki.api_url,
+                                                          params=self.wiki.query_params(query, sentences))
+        except Exception as e:
+            return f"❌ Wikipedia error: {e}"
+        if status != 200 or not data:
+            return f"❌ Wikipedia error: HTTP {status}"
+        title = self.wiki.disambiguation_title(data)
+        return self.wiki.store(query, sentences, data, await self._get_links(title) if title else None)
+
+    async def _get_links(self, title):
+        """Links of a disambiguation page, or None if the request fails."""
+        try:
+            with span("search.wikipedia_links", mode="async"):
+                self.wiki.requests_made += 1
+                status, data = await self.client.get_json(self.wiki.api_url, params=self.wiki.links_params(title))
+        except Exception:
+            return None
+        return data if status == 200 else None
+
+
+class AsyncWebSearch:
+    """Web search engines over the shared client."""
+
+    def __init__(self, client):
+        self.client = client
+
+    async def _search(self, engine, url, parse, num_results, headers=None):
+        """Fetch a results page and parse it with the shared parser."""
+        with span(f"search.{engine}", mode="async") as timing:
+            try:
+                status, html = await self.client.get_text(url, headers=headers)
+                timing.set(status=status)
+                if status != 200:
+                    return None
+                results = parse(html, num_results)
+                timing.set(results=len(results))
+                return results if results else None
+            except Exception as e:
+                print(f"{engine.title()} search error: {e}")
+                return None
+
+    async def search_bing(self, query, num_results=WEB_SEARCH_RESULTS):
+        """Search using Bing."""
+        return await self._search("bing", f"https://www.bing.com/search?q={quote_plus(query)}",
+                                  WebSearch.parse_bing, num_results, BING_HEADERS)
+
+    async def search_duckduckgo(self, query, num_results=WEB_SEARCH_RESULTS):
+        """Search using DuckDuckGo."""
+        return await self._search("duckduckgo", f"https://html.duckduckgo.com/html/?q={quote_plus(query)}",
+                                  WebSearch.parse_duckduckgo, num_results)
+
+    async def search_brave(self, query, num_results=WEB_SEARCH_RESULTS):
+        """Search using Brave."""
+        return await self._search("brave", f"https://search.brave.com/search?q={quote_plus(query)}",
+                                  WebSearch.parse_brave, num_results)
+
+    async def get_results(self, query, num_results=WEB_SEARCH_RESULTS):
+        """
+        Get web results (Bing, as in ``WebSearch.get_results``).
+
+        Returns:
+            tuple: (results list, "Bing") or (None, None)
+        """
+        results = await self.search_bing(query, num_results)
+        if results:
+            return results, "Bing"
+        return None, None
+
+
+class AsyncYouTubeSearch:
+    """YouTube search over the shared client, sharing ``YouTubeSearch.cache``."""
+
+    def __init__(self, client):
+        self.client = client
+
+    async def search(self, query, num=YOUTUBE_RESULTS):
+        """
+        Search YouTube, reading the results page only until ``num`` videos are found.
+
+        Returns:
+            list or None: Videos with title, url and duration
+        """
+        key = YouTubeSearch.cache_key(query, num)
+        videos = YouTubeSearch.cache.get(key)
+        if videos is not None:
+            return videos
+        with span("search.youtube", mode="async"):
+            try:
+                scanner = youtube.InitialDataScanner(num)
+                async with self.client.stream(youtube.results_url(query)) as response:
+                    if response.status != 200:
+                        return None
+                    async for chunk in response.content.iter_chunked(youtube.READ_CHUNK_SIZE):
+                        if scanner.feed(chunk):
+                            break
+                if scanner.videos:
+                    YouTubeSearch.cache.set(key, scanner.videos)
+                    return scanner.videos
+                return None
+            except Exception as e:
+                print(f"YouTube search error: {e}")
+                return None
+
+
+class AsyncSearchManager:
+    """Coordinates all search sources on one event loop."""
+
+    def __init__(self, client=None, index=None):
+        """
+        Args:
+            client (AsyncHTTPClient or None): Shared HTTP client
+            index (LocalIndex or None): Local index that receives every result
+        """
+        self.client = client or AsyncHTTPClient()
+        self.wikipedia = AsyncWikipediaSearch(self.client)
+        self.web = AsyncWebSearch(self.client)
+        self.youtube = AsyncYouTubeSearch(self.client)
+        self.index = index
+
+    async def search_all(self, query):
+        """
+        Query every source concurrently.
+
+        Returns:
+            dict: 'wikipedia', 'web' and 'youtube' results
+        """
+        wikipedia, web, youtube = await asyncio.gather(
+            self.wikipedia.get_summary(query), self.web.get_results(query), self.youtube.search(query)
+        )
+        results = {'wikipedia': wikipedia, 'web': web, 'youtube': youtube}
+        index_search_results(self.index, query, results, self.wikipedia.wiki.title_for(query))
+        return results
+
+    async def search_many(self, queries):
+        """
+        Run ``search_all`` for many queries at once (batch/server use).
+
+        Returns:
+            list: Results in query order
+        """
+        return await asyncio.gather(*(self.search_all(q) for q in queries))
+
+    async def close(self):
+        """Release network resources."""
+        await self.client.close()
+
+
+class _SyncSource:
+    """Blocking view of one async source, e.g. ``manager.web.get_results(q)``."""
+
+    def __init__(self, facade, source):
+        self._facade = facade
+        self._source = source
+
+    def __getattr__(self, name):
+        method = getattr(self._source, name)
+
+        def call(*args, **kwargs):
+            return self._facade.run(method(*args, **kwargs))
+        call.__name__ = name
+        call.__doc__ = method.__doc__
+        return call
+
+
+class BackgroundSearchManager:
+    """
+    Sync facade over ``AsyncSearchManager`` for the GUI and other threads.
+
+    Has the same ``wikipedia`` / ``web`` / ``youtube`` / ``search_all`` surface
+    as ``SearchManager``. ``start_all`` returns futures instead, so the UI
+    can render each source when it arrives without waiting on the others.
+    """
+
+    def __init__(self, manager=None, index=None):
+        """
+        Args:
+            manager (AsyncSearchManager or None): Manager to drive
+            index (LocalIndex or None): Local index for a manager created here
+        """
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="search-loop", daemon=True)
+        self._thread.start()
+        self.manager = manager or AsyncSearchManager(index=index)
+        self.wikipedia = _SyncSource(self, self.manager.wikipedia)
+        self.web = _SyncSource(self, self.manager.web)
+        self.youtube = _SyncSource(self, self.manager.youtube)
+
+    def submit(self, coro):
+        """
+        Schedule a coroutine on the search loop.
+
+        Returns:
+            concurrent.futures.Future: Result of the coroutine
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the search loop and wait for its result."""
+        return self.submit(coro).result(timeout)
+
+    def start_all(self, query):
+        """
+        Start every source at once.
+
+        Returns:
+            dict: 'wikipedia', 'web' and 'youtube' futures
+        """
+        futures = {
+            'wikipedia': self.submit(self.manager.wikipedia.get_summary(query)),
+            'web': self.submit(self.manager.web.get_results(query)),
+            'youtube': self.submit(self.manager.youtube.search(query)),
+        }
+        if self.manager.index is not None:
+            for source, future in futures.items():
+                future.add_done_callback(lambda f, source=source: self._index_result(query, source, f))
+        return futures
+
+    def _index_result(self, query, source, future):
+        """Add one finished source to the local index (only queues the write)."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        index_search_results(self.manager.index, query, {source: future.result()},
+                             self.manager.wikipedia.wiki.title_for(query))
+
+    def search_all(self, query):
+        """Blocking ``search_all`` across every source."""
+        return self.run(self.manager.search_all(query))
+
+    def search_many(self, queries):
+        """Blocking ``search_many`` for a batch of queries."""
+        return self.run(self.manager.search_many(queries))
+
+    def close(self):
+        """Close the client and stop the loop thread."""
+        if self.loop.is_closed():
+            return
+        try:
+            self.run(self.manager.close(), timeout=5)
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+        self.loop.close()
@@ -0,0 +1,247 @@
+"""
+Local full-text index over past search results and PDF summaries.
+
+Documents live in SQLite with an FTS5 index (porter-stemmed), so earlier
+Wikipedia summaries, web and video titles and PDF summaries can be shown
+instantly while remote searches are still in flight. Writes go through one
+background thread and are committed in batches; searches use their own
+connection and never wait for a write.
+"""
+
+import atexit
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from config.settings import LOCAL_INDEX_RESULTS, LOCAL_INDEX_BATCH_SIZE, LOCAL_INDEX_FLUSH_INTERVAL
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    key TEXT UNIQUE NOT NULL,
+    source TEXT NOT NULL,
+    title TEXT NOT NULL,
+    body TEXT NOT NULL,
+    url TEXT,
+    query TEXT,
+    added REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    title, body, query, content='documents', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+    INSERT INTO documents_fts(rowid, title, body, query) VALUES (new.id, new.title, new.body, new.query);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+    INSERT INTO documents_fts(documents_fts, rowid, title, body, query)
+    VALUES ('delete', old.id, old.title, old.body, old.query);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE ON documents BEGIN
+    INSERT INTO documents_fts(documents_fts, rowid, title, body, query)
+    VALUES ('delete', old.id, old.title, old.body, old.query);
+    INSERT INTO documents_fts(rowid, title, body, query) VALUES (new.id, new.title, new.body, new.query);
+END;
+"""
+
+UPSERT = """
+INSERT INTO documents (key, source, title, body, url, query, added) VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(key) DO UPDATE SET
+    title = excluded.title, body = excluded.body, url = excluded.url,
+    query = excluded.query, added = excluded.added
+"""
+
+# bm25 weights for (title, body, query): a title hit counts most
+SEARCH = """
+SELECT d.source, d.title, d.url, d.added,
+       snippet(documents_fts, 1, '', '', '…', 16) AS snippet
+FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid
+WHERE documents_fts MATCH ?
+ORDER BY bm25(documents_fts, 5.0, 1.0, 2.0)
+LIMIT ?
+"""
+
+# Words that would match almost every document (and command words like "search")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from how i in is it me of on or the to was what when where which who why "
+    "with search find look up google youtube about tell show".split()
+)
+
+
+def match_expression(text):
+    """
+    Turn free text into an FTS5 query (quoted terms, so user input is never FTS syntax).
+
+    Args:
+        text (str): User query
+
+    Returns:
+        tuple: (all-terms expression, any-term expression), or (None, None)
+            when the text has no searchable words
+    """
+    words = [w for w in re.findall(r"\w+", text.lower()) if w not in STOPWORDS]
+    if not words:
+        return None, None
+    terms = [f'"{w}"' for w in dict.fromkeys(words)]
+    return " ".join(terms), " OR ".join(terms)
+
+
+class LocalIndex:
+    """SQLite FTS5 index of documents the app has fetched or produced."""
+
+    def __init__(self, path, batch_size=LOCAL_INDEX_BATCH_SIZE, flush_interval=LOCAL_INDEX_FLUSH_INTERVAL):
+        """
+        Args:
+            path (str): Database file (``":memory:"`` is not supported; use a temp file)
+            batch_size (int): Documents committed together at most
+            flush_interval (float): Seconds the writer waits to fill a batch
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+        self._read_conn = self._connect()
+        self._read_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="local-index", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def add(self, source, title, body="", url=None, query=None):
+        """
+        Queue a document for indexing; re-adding the same source and URL
+        (or title, without a URL) replaces the earlier version.
+
+        Args:
+            source (str): Origin, e.g. ``"wikipedia"``, ``"web"``, ``"youtube"``, ``"pdf"``
+            title (str): Title shown with hits
+            body (str): Text to index
+            url (str or None): Link or file path
+            query (str or None): Query that produced the document
+        """
+        if not title:
+            return
+        key = f"{source}:{url or title}"
+        self._queue.put((key, source, title, body or "", url, query, time.time()))
+
+    def flush(self, timeout=None):
+        """Block until every queued document is committed."""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def _write_loop(self):
+        """Commit queued documents in batches on the writer thread."""
+        conn = self._connect()
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch, events = [], []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if isinstance(item, threading.Event):
+                    events.append(item)
+                else:
+                    batch.append(item)
+                if len(batch) >= self.batch_size or events:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)  # stop after this batch
+                    break
+            if batch:
+                try:
+                    with conn:
+                        conn.executemany(UPSERT, batch)
+                except sqlite3.Error as e:
+                    print(f"Local index write error: {e}")
+            for event in events:
+                event.set()
+        conn.close()
+
+    def search(self, query, limit=LOCAL_INDEX_RESULTS):
+        """
+        Find indexed documents matching a query, best first.
+
+        All words must match; if nothing does, any word may.
+
+        Args:
+            query (str): Free text
+            limit (int): Maximum hits
+
+        Returns:
+            list: Hits with 'source', 'title', 'url', 'snippet' and 'added'
+        """
+        all_terms, any_term = match_expression(query)
+        if all_terms is None:
+            return []
+        rows = self._search(all_terms, limit)
+        if not rows and any_term != all_terms:
+            rows = self._search(any_term, limit)
+        return [{'source': source, 'title': title, 'url': url, 'added': added, 'snippet': snippet}
+                for source, title, url, added, snippet in rows]
+
+    def _search(self, expression, limit):
+        try:
+            with self._read_lock:
+                return self._read_conn.execute(SEARCH, (expression, limit)).fetchall()
+        except sqlite3.Error as e:
+            print(f"Local index search error: {e}")
+            return []
+
+    def __len__(self):
+        with self._read_lock:
+            return self._read_conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self):
+        """Commit pending documents and close the database."""
+        if not self._writer.is_alive():
+            return
+        self._queue.put(None)
+        self._writer.join(timeout=10)
+        with self._read_lock:
+            self._read_conn.close()
+
+
+def index_search_results(index, query, results, wikipedia_title=None):
+    """
+    Add the results of one search to the index.
+
+    Args:
+        index (LocalIndex or None): Target index (nothing happens if None)
+        query (str): The query
+        results (dict): 'wikipedia', 'web' and/or 'youtube' results in the
+            shapes returned by ``SearchManager``
+        wikipedia_title (str or None): Article the Wikipedia summary came from
+    """
+    if index is None:
+        return
+    summary = results.get('wikipedia')
+    if summary and not summary.startswith(("❌", "❓")):
+        index.add("wikipedia", wikipedia_title or query, summary,
+                  url=f"https://en.wikipedia.org/wiki/{(wikipedia_title or query).replace(' ', '_')}", query=query)
+    web = results.get('web')
+    if web and web[0]:
+        for result in web[0]:
+            index.add("web", result.get('title', ''), result.get('title', ''), url=result.get('url'), query=query)
+    for video in results.get('youtube') or []:
+        details = " ".join(filter(None, [video.get('channel'), video.get('duration')]))
+        index.add("youtube", video.get('title', ''), details, url=video.get('url'), query=query)
@@ -0,0 +1,295 @@
+"""
+Batch summarization of many PDFs.
+
+Documents are scanned ahead in a process pool (opened, counted, and their
+scanned pages read by OCR into the cache) while the summarization model
+works through them one at a time on the calling thread, so the CPU-heavy
+parsing and OCR overlap with the model. Workers only send back counts; the
+model thread reads the pages again lazily, so memory stays bounded by
+``PDF_MEMORY_LIMIT_MB`` however large the documents are:
+
+    python -m modules.pdf_batch papers/ -o summaries/ --report batch.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from config.settings import (
+    PDF_BATCH_WORKERS, PDF_BATCH_PREFETCH, PDF_SUMMARIZER_MODEL, PDF_SUMMARY_PROFILES, PDF_OCR_ENABLED
+)
+from modules.pdf_ocr import OCRPipeline
+from modules.pdf_summarizer import PDFProcessor, PDFSummarizer, AISummarizer, AUTO_MODEL
+
+
+def expand_pdf_paths(paths):
+    """
+    Collect PDF files from files and directories.
+
+    Args:
+        paths (list): Files or directories (searched recursively)
+
+    Returns:
+        list: (path, name) pairs in sorted order per directory; name is the
+            path relative to the directory it was found in (the file name for
+            files given directly)
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                files.extend((os.path.join(root, n), os.path.relpath(os.path.join(root, n), path))
+                             for n in sorted(names) if n.lower().endswith(".pdf"))
+        else:
+            files.append((path, os.path.basename(path)))
+    return files
+
+
+def summary_paths(files, output_dir):
+    """
+    Output file for each PDF: ``<name>.summary.txt`` under ``output_dir``,
+    keeping the subfolders of input directories, with "-2", "-3"... added
+    when two inputs still map to the same file.
+
+    Args:
+        files (list): (path, name) pairs from ``expand_pdf_paths``
+        output_dir (str): Output directory
+
+    Returns:
+        list: Output paths, in the order of ``files``
+    """
+    used = set()
+    outputs = []
+    for _, name in files:
+        stem = candidate = os.path.splitext(name)[0]
+        copy = 1
+        while os.path.normcase(candidate) in used:
+            copy += 1
+            candidate = f"{stem}-{copy}"
+        used.add(os.path.normcase(candidate))
+        outputs.append(os.path.join(output_dir, candidate + ".summary.txt"))
+    return outputs
+
+
+def scan_document(path):
+    """
+    Read a PDF page by page without keeping the text (runs in a worker
+    process). Pages without text are read by OCR in the same worker, since
+    documents are already spread over the pool; the summarizer then gets
+    them from the OCR cache.
+
+    Returns:
+        dict: 'pages', 'ocr_pages', 'chars', 'extract_ms' and 'error'
+    """
+    start = time.perf_counter()
+    count = chars = ocr_pages = 0
+    error = None
+    try:
+        pages = PDFProcessor.iter_pages(path, raise_errors=True)
+        ocr = OCRPipeline(workers=0) if PDF_OCR_ENABLED else None
+        for page in pages if ocr is None else ocr.iter_pages(path, pages):
+            count += 1
+            chars += len(page)
+        if ocr is not None:
+            ocr_pages = ocr.pages + ocr.cached
+        if not chars:
+            error = "No extractable text"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return {"pages": count, "ocr_pages": ocr_pages, "chars": chars,
+            "extract_ms": round((time.perf_counter() - start) * 1000, 2), "error": error}
+
+
+class BatchSummarizer:
+    """Summarizes PDFs with extraction and summarization pipelined."""
+
+    def __init__(self, summarizer=None, workers=PDF_BATCH_WORKERS, prefetch=PDF_BATCH_PREFETCH, on_progress=None,
+                 profile=None):
+        """
+        Args:
+            summarizer (PDFSummarizer or None): Summarizer (and indexes) to use
+            workers (int): Extraction processes
+            prefetch (int): Documents scanned ahead per worker
+            on_progress (callable or None): ``on_progress(event, record, detail)`` with
+                event ``"start"`` (detail: (position, total)), ``"part"`` (detail:
+                (part number, text)) or ``"done"``; called on the summarizing thread
+            profile (str or None): Summary profile (default: the summarizer's)
+        """
+        self.summarizer = summarizer or PDFSummarizer()
+        self.workers = max(1, workers)
+        self.prefetch = max(0, prefetch)
+        self.on_progress = on_progress
+        self.profile = profile
+        self.model_load_seconds = 0.0
+
+    def _notify(self, event, record, detail=None):
+        if self.on_progress is not None:
+            self.on_progress(event, record, detail)
+
+    def iter_results(self, paths, output_dir=None):
+        """
+        Summarize PDFs in input order while later ones are scanned.
+
+        Args:
+            paths (list): PDF files or directories
+            output_dir (str or None): Directory for ``<name>.summary.txt`` files
+                (see ``summary_paths``), written part by part as the summary is
+                produced
+
+        Yields:
+            dict: One record per file with page/chunk counts, timings, summary and error
+        """
+        files = expand_pdf_paths(paths)
+        if not files:
+            return
+        outputs = summary_paths(files, output_dir) if output_dir else [None] * len(files)
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(files))) as pool:
+            queued = iter(zip(files, outputs))
+            pending = deque()
+
+            def fill():
+                while len(pending) < self.workers * (1 + self.prefetch):
+                    item = next(queued, None)
+                    if item is None:
+                        return
+                    (path, _), output_path = item
+                    pending.append((path, output_path, pool.submit(scan_document, path)))
+
+            fill()
+            # Load the model while the first documents are being scanned
+            start = time.perf_counter()
+            ai_summarizer = self.summarizer.ai_summarizer
+            model_name = ai_summarizer.resolve_profile(self.profile)["model"]
+            if model_name != AUTO_MODEL:  # "auto" chooses per document
+                ai_summarizer._get_model(model_name)
+            self.model_load_seconds = time.perf_counter() - start
+
+            for position in range(1, len(files) + 1):
+                path, output_path, future = pending.popleft()
+                fill()
+                yield self._summarize(path, future, position, len(files), output_path)
+
+    def _summarize(self, path, future, position, total, output_path=None):
+        """Summarize one scanned document on the model thread, reading its pages again lazily."""
+        record = {"file": path, "name": os.path.basename(path), "pages": 0, "ocr_pages": 0, "chars": 0, "chunks": 0,
+                  "extract_ms": 0.0, "summarize_ms": 0.0, "summary": "", "error": None}
+        try:
+            record.update(future.result())
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+        self._notify("start", record, (position, total))
+
+        if record["error"] is None:
+            parts = []
+            output = None
+            start = time.perf_counter()
+            try:
+                for part_number, text in self.summarizer.iter_summary_file(path, profile=self.profile):
+                    if part_number is None:
+                        parts.append(text)
+                    else:
+                        record["chunks"] += 1
+                        parts.append(f"Part {part_number}:\n{text}")
+                        self._notify("part", record, (part_number, text))
+                    if output_path:
+                        if output is None:
+                            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+                            output = open(output_path, "w", encoding="utf-8")
+                        output.write(parts[-1] + "\n\n")
+                        output.flush()
+            except Exception as e:
+                record["error"] = f"{type(e).__name__}: {e}"
+            finally:
+                if output is not None:
+                    output.close()
+            record["summarize_ms"] = round((time.perf_counter() - start) * 1000, 2)
+            record["summary"] = "\n\n".join(parts)
+            if not record["chunks"] and record["error"] is None:
+                record["error"] = "No summary produced"
+        self._notify("done", record)
+        return record
+
+    def run(self, paths, output_dir=None, report=None):
+        """
+        Summarize PDFs, writing each summary part as soon as it is ready.
+
+        Args:
+            paths (list): PDF files or directories
+            output_dir (str or None): Directory for ``<name>.summary.txt`` files
+            report (file or None): Writable text stream for JSONL records (without summaries)
+
+        Returns:
+            dict: Totals and throughput (pages/sec, chunks/sec) for the batch
+        """
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        start = time.perf_counter()
+        totals = {"files": 0, "failed": 0, "pages": 0, "ocr_pages": 0, "chunks": 0, "extract_seconds": 0.0,
+                  "summarize_seconds": 0.0}
+        for record in self.iter_results(paths, output_dir):
+            totals["files"] += 1
+            totals["failed"] += record["error"] is not None
+            totals["pages"] += record["pages"]
+            totals["ocr_pages"] += record["ocr_pages"]
+            totals["chunks"] += record["chunks"]
+            totals["extract_seconds"] += record["extract_ms"] / 1000
+            totals["summarize_seconds"] += record["summarize_ms"] / 1000
+            if report is not None:
+                line = {k: v for k, v in record.items() if k != "summary"}
+                report.write(json.dumps(line, ensure_ascii=False) + "\n")
+                report.flush()
+
+        wall = time.perf_counter() - start
+        totals["wall_seconds"] = wall
+        totals["model_load_seconds"] = self.model_load_seconds
+        totals["pages_per_second"] = totals["pages"] / wall if wall else 0.0
+        totals["chunks_per_second"] = totals["chunks"] / wall if wall else 0.0
+        return totals
+
+
+def format_totals(totals):
+    """One-line batch report."""
+    ocr = f" ({totals['ocr_pages']} by OCR)" if totals.get("ocr_pages") else ""
+    return (f"{totals['files']} PDFs ({totals['failed']} failed), {totals['pages']} pages{ocr}, "
+            f"{totals['chunks']} chunks in {totals['wall_seconds']:.1f}s: "
+            f"{totals['pages_per_second']:.1f} pages/s, {totals['chunks_per_second']:.2f} chunks/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize many PDFs")
+    parser.add_argument("paths", nargs="+", help="PDF files or directories")
+    parser.add_argument("-o", "--output-dir", help="Write <name>.summary.txt files here")
+    parser.add_argument("--report", help="JSONL report file ('-' for stdout)")
+    parser.add_argument("--workers", type=int, default=PDF_BATCH_WORKERS, help="Extraction processes")
+    parser.add_argument("--model", default=PDF_SUMMARIZER_MODEL, help="Model for profiles without their own")
+    parser.add_argument("--profile", choices=list(PDF_SUMMARY_PROFILES), help="Summary profile (speed vs quality)")
+    args = parser.parse_args()
+
+    summarizer = PDFSummarizer()
+    summarizer.ai_summarizer = AISummarizer(args.model)
+
+    def progress(event, record, detail):
+        if event == "start":
+            ocr = f" ({record['ocr_pages']} by OCR)" if record["ocr_pages"] else ""
+            print(f"[{detail[0]}/{detail[1]}] {record['name']}: {record['pages']} pages{ocr}", file=sys.stderr)
+        elif event == "done":
+            status = f"❌ {record['error']}" if record["error"] else f"✅ {record['chunks']} chunks"
+            print(f"    {status} ({record['summarize_ms'] / 1000:.1f}s)", file=sys.stderr)
+
+    batch = BatchSummarizer(summarizer, workers=args.workers, on_progress=progress, profile=args.profile)
+    if args.report == "-":
+        totals = batch.run(args.paths, args.output_dir, sys.stdout)
+    elif args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            totals = batch.run(args.paths, args.output_dir, f)
+    else:
+        totals = batch.run(args.paths, args.output_dir)
+    print(f"\n{format_totals(totals)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+OCR fallback for PDF pages without a text layer (scanned documents).
+
+Only pages whose extracted text is empty are rendered (pypdfium2) and read
+by Tesseract (pytesseract), in a process pool that runs ahead of the
+reader so the summarizer still gets pages in order and lazily. Results are
+cached on disk by a hash of the page content, so a scan is only read once
+however often it is summarized, indexed or copied.
+
+Both packages and the ``tesseract`` binary are optional; without them
+pages pass through unchanged.
+"""
+
+import hashlib
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from config.settings import (
+    PDF_OCR_WORKERS, PDF_OCR_PREFETCH, PDF_OCR_DPI, PDF_OCR_LANGUAGE, PDF_OCR_CACHE_DIR
+)
+
+_status = None  # (available, reason), checked once per process
+_skip_noted = False
+_document = {}  # PDF open in this process; consecutive pages reuse it
+
+
+def ocr_available():
+    """
+    Whether the OCR stage can run here.
+
+    Returns:
+        tuple: (bool, reason it cannot run or None)
+    """
+    global _status
+    if _status is None:
+        try:
+            import pypdfium2  # noqa: F401
+            import pytesseract
+            pytesseract.get_tesseract_version()
+            _status = (True, None)
+        except ImportError as e:
+            _status = (False, f"requires the '{e.name}' package")
+        except Exception as e:
+            _status = (False, f"Tesseract not found ({e})")
+    return _status
+
+
+def page_digest(page, salt=""):
+    """
+    Hash of what a page draws: its content stream, the XObjects (scanned
+    images, forms) it uses, its size and rotation.
+
+    Args:
+        page (PageObject): PyPDF2 page
+        salt (str): Mixed in, e.g. the OCR settings
+
+    Returns:
+        str: Hex SHA-256
+    """
+    digest = hashlib.sha256(salt.encode("utf-8"))
+    digest.update(repr((list(page.mediabox), page.get("/Rotate", 0))).encode("ascii"))
+    contents = page.get_contents()
+    if contents is not None:
+        digest.update(contents.get_data())
+    _digest_xobjects(digest, page.get("/Resources"), depth=2)
+    return digest.hexdigest()
+
+
+def _digest_xobjects(digest, resources, depth):
+    """Add the data of the XObjects in a resource dictionary (and in forms, ``depth`` levels down)."""
+    if resources is None or depth < 0:
+        return
+    xobjects = resources.get_object().get("/XObject")
+    if xobjects is None:
+        return
+    xobjects = xobjects.get_object()
+    for name in sorted(xobjects):
+        xobject = xobjects[name].get_object()
+        digest.update(name.encode("utf-8"))
+        digest.update(xobject.get_data())
+        if xobject.get("/Subtype") == "/Form":
+            _digest_xobjects(digest, xobject.get("/Resources"), depth - 1)
+
+
+def _cache_path(cache_dir, key):
+    return os.path.join(cache_dir, key[:2], f"{key}.txt")
+
+
+def _cache_get(cache_dir, key):
+    try:
+        with open(_cache_path(cache_dir, key), "r", encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _cache_set(cache_dir, key, text):
+    """Write a cache entry atomically (workers may finish the same page at once)."""
+    path = _cache_path(cache_dir, key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"PDF OCR cache error: {e}")
+
+
+def _open_document(pdf_path):
+    """The PDF open in this process, reopened when another file is asked for."""
+    if _document.get("path") != pdf_path:
+        close_document()
+        from PyPDF2 import PdfReader
+        handle = open(pdf_path, "rb")
+        _document.update(path=pdf_path, file=handle, reader=PdfReader(handle), pdfium=None)
+    return _document
+
+
+def close_document():
+    """Close the PDF kept open by ``ocr_page`` in this process."""
+    if _document.get("pdfium") is not None:
+        _document["pdfium"].close()
+    if _document.get("file") is not None:
+        _document["file"].close()
+    _document.clear()
+
+
+def render_page(pdf_path, number, dpi=PDF_OCR_DPI):
+    """
+    Render a page to a grayscale image.
+
+    Args:
+        pdf_path (str): PDF file
+        number (int): Page index (0-based)
+        dpi (int): Resolution
+
+    Returns:
+        PIL.Image.Image: Page image
+    """
+    import pypdfium2 as pdfium
+    document = _open_document(pdf_path)
+    if document["pdfium"] is None:
+        document["pdfium"] = pdfium.PdfDocument(pdf_path)
+    page = document["pdfium"][number]
+    try:
+        return page.render(scale=dpi / 72, grayscale=True).to_pil()
+    finally:
+        page.close()
+
+
+def ocr_page(pdf_path, number, dpi=PDF_OCR_DPI, language=PDF_OCR_LANGUAGE, cache_dir=PDF_OCR_CACHE_DIR):
+    """
+    Text of one page by OCR, from the cache when the same page was read before.
+
+    Runs in a worker process; the PDF stays open for the next page.
+
+    Args:
+        pdf_path (str): PDF file
+        number (int): Page index (0-based)
+        dpi (int): Render resolution
+        language (str): Tesseract language codes
+        cache_dir (str or None): OCR cache directory (None: no cache)
+
+    Returns:
+        tuple: (text, whether it came from the cache)
+    """
+    reader = _open_document(pdf_path)["reader"]
+    key = page_digest(reader.pages[number], f"{dpi}:{language}")
+    # Scanned images are large; do not keep them parsed between pages
+    reader.resolved_objects.clear()
+    if cache_dir:
+        text = _cache_get(cache_dir, key)
+        if text is not None:
+            return text, True
+
+    import pytesseract
+    text = pytesseract.image_to_string(render_page(pdf_path, number, dpi), lang=language).strip()
+    if cache_dir:
+        _cache_set(cache_dir, key, text)
+    return text, False
+
+
+def _init_worker():
+    # One Tesseract thread per worker; the pool provides the parallelism
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+
+class OCRPipeline:
+    """Fills in pages without a text layer by OCR."""
+
+    def __init__(self, workers=PDF_OCR_WORKERS, prefetch=PDF_OCR_PREFETCH, dpi=PDF_OCR_DPI,
+                 language=PDF_OCR_LANGUAGE, cache_dir=PDF_OCR_CACHE_DIR):
+        """
+        Args:
+            workers (int): OCR processes (0: OCR in this process, e.g. inside
+                another pool's worker)
+            prefetch (int): Pages read ahead per worker
+            dpi (int): Render resolution
+            language (str): Tesseract language codes
+            cache_dir (str or None): OCR cache directory (None: no cache)
+        """
+        self.workers = max(0, workers)
+        self.prefetch = max(0, prefetch)
+        self.dpi = dpi
+        self.language = language
+        self.cache_dir = cache_dir
+        self.pages = 0  # pages read by OCR
+        self.cached = 0  # pages served from the cache
+        self.seconds = 0.0  # from the first empty page to the last OCR result, per document
+
+    def stats(self):
+        """
+        OCR throughput so far.
+
+        Returns:
+            dict: 'pages' (OCR), 'cached', 'seconds' and 'pages_per_second'
+                (OCR and cached pages)
+        """
+        done = self.pages + self.cached
+        return {"pages": self.pages, "cached": self.cached, "seconds": self.seconds,
+                "pages_per_second": done / self.seconds if self.seconds else 0.0}
+
+    def iter_pages(self, pdf_path, pages):
+        """
+        Pass page texts through, with OCR text for the empty ones.
+
+        Empty pages are handed to the pool as they are read, up to
+        ``workers * (1 + prefetch)`` pages ahead of the page last yielded.
+
+        Args:
+            pdf_path (str): PDF the pages came from
+            pages (iterable): Page texts in order (e.g. ``PDFProcessor.iter_pages``)
+
+        Yields:
+            str: Page text ("" where OCR finds nothing or fails)
+        """
+        available, reason = ocr_available()
+        if not available:
+            yield from self._pass_through(pages, reason)
+            return
+
+        window = max(1, self.workers * (1 + self.prefetch))
+        pending = deque()
+        finished = []
+        pool = None
+        try:
+            for number, text in enumerate(pages):
+                if text.strip():
+                    pending.append(text)
+                else:
+                    if not finished:
+                        finished.append(time.perf_counter())
+                    args = (pdf_path, number, self.dpi, self.language, self.cache_dir)
+                    if self.workers:
+                        if pool is None:
+                            pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+                        future = pool.submit(ocr_page, *args)
+                        future.add_done_callback(lambda _: finished.append(time.perf_counter()))
+                    else:
+                        future = Future()
+                        try:
+                            future.set_result(ocr_page(*args))
+                        except Exception as e:
+                            future.set_exception(e)
+                        finished.append(time.perf_counter())
+                    pending.append(future)
+                # Yield in order: text pages and finished OCR at once, otherwise once the window is full
+                while pending and (len(pending) > window or not isinstance(pending[0], Future) or pending[0].done()):
+                    yield self._result(pending.popleft())
+            while pending:
+                yield self._result(pending.popleft())
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            elif not self.workers:
+                close_document()
+            if finished:
+                self.seconds += max(finished) - finished[0]
+
+    def _result(self, item):
+        """Page text from a text page or an OCR future."""
+        if not isinstance(item, Future):
+            return item
+        try:
+            text, cached = item.result()
+        except Exception as e:
+            print(f"PDF OCR error: {e}")
+            return ""
+        if cached:
+            self.cached += 1
+        else:
+            self.pages += 1
+        return text
+
+    @staticmethod
+    def _pass_through(pages, reason):
+        """Yield pages unchanged, noting once per process that empty pages are not read."""
+        global _skip_noted
+        for text in pages:
+            if not _skip_noted and not text.strip():
+                print(f"PDF OCR skipped: {reason}")
+                _skip_noted = True
+            yield text
@@ -0,0 +1,373 @@
+"""
+Question answering over summarized PDFs ("chat with your PDF").
+
+Page text is split into overlapping chunks, embedded on the CPU and kept
+in an append-only float32 matrix on disk that is memory-mapped for search,
+so even large collections answer in milliseconds without loading every
+vector. PDFs are identified by content hash; indexing the same file again
+is skipped.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import re
+import threading
+import zlib
+import numpy as np
+from utils.profiling import span
+from config.settings import (
+    PDF_QA_DIR, PDF_QA_EMBEDDER, PDF_QA_CHUNK_SIZE, PDF_QA_CHUNK_OVERLAP, PDF_QA_TOP_K, PDF_QA_BATCH_SIZE
+)
+
+HASHING_DIM = 1024
+INDEX_WRITE_CHUNKS = 256  # chunks embedded and appended per step, so long PDFs never sit in memory whole
+
+
+def file_hash(path):
+    """SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def chunk_pages(pages, size=PDF_QA_CHUNK_SIZE, overlap=PDF_QA_CHUNK_OVERLAP):
+    """
+    Split page texts into overlapping chunks on word boundaries.
+
+    Args:
+        pages (iterable): Page texts; read one page at a time
+        size (int): Target characters per chunk
+        overlap (int): Characters repeated from the end of the previous chunk
+
+    Yields:
+        tuple: (page number, chunk text); a chunk belongs to the page it starts on
+    """
+    for page_number, text in enumerate(pages, 1):
+        words = text.split()
+        start = 0
+        while start < len(words):
+            length, end = 0, start
+            while end < len(words) and length + len(words[end]) + 1 <= size:
+                length += len(words[end]) + 1
+                end += 1
+            end = max(end, start + 1)
+            yield page_number, " ".join(words[start:end])
+            if end >= len(words):
+                break
+            # Step back roughly ``overlap`` characters for the next chunk
+            back, kept = end, 0
+            while back > start + 1 and kept < overlap:
+                back -= 1
+                kept += len(words[back]) + 1
+            start = back
+
+
+class HashingEmbedder:
+    """
+    Dependency-free lexical embeddings: hashed word and bigram counts.
+
+    Matches on shared words only, but needs no model and embeds thousands of
+    chunks per second; useful offline and for benchmarks.
+    """
+
+    name = "hashing"
+
+    def __init__(self, dim=HASHING_DIM):
+        self.dim = dim
+
+    def embed(self, texts):
+        """
+        Embed texts.
+
+        Returns:
+            numpy.ndarray: (len(texts), dim) float32, L2-normalized rows
+        """
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = re.findall(r"\w+", text.lower())
+            features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+            for feature in features:
+                h = zlib.crc32(feature.encode("utf-8"))
+                vectors[row, h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        # Sublinear term frequency so repeated words do not dominate
+        vectors = np.sign(vectors) * np.log1p(np.abs(vectors))
+        return _normalize(vectors.astype(np.float32))
+
+
+class TransformerEmbedder:
+    """Sentence embeddings from a small Hugging Face encoder (mean pooling), on the CPU."""
+
+    def __init__(self, model_name=PDF_QA_EMBEDDER, batch_size=PDF_QA_BATCH_SIZE):
+        self.name = model_name
+        self.batch_size = batch_size
+        self._tokenizer = None
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Lazy load the tokenizer and model."""
+        with self._lock:
+            if self._model is None:
+                from transformers import AutoModel, AutoTokenizer
+                from utils.inference import InferenceResources
+                InferenceResources().apply()
+                with span("pdf_qa.model_load", model=self.name):
+                    self._tokenizer = AutoTokenizer.from_pretrained(self.name)
+                    self._model = AutoModel.from_pretrained(self.name).eval()
+        return self._tokenizer, self._model
+
+    @property
+    def dim(self):
+        return self._load()[1].config.hidden_size
+
+    def embed(self, texts):
+        """
+        Embed texts in batches.
+
+        Returns:
+            numpy.ndarray: (len(texts), dim) float32, L2-normalized rows
+        """
+        import torch
+        tokenizer, model = self._load()
+        out = []
+        with torch.inference_mode():
+            for i in range(0, len(texts), self.batch_size):
+                batch = tokenizer(texts[i:i + self.batch_size], padding=True, truncation=True,
+                                  max_length=256, return_tensors="pt")
+                hidden = model(**batch).last_hidden_state
+                mask = batch["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+                pooled = (hidden * mask).sum(1) / mask.sum(1).clamp(min=1e-9)
+                out.append(pooled.numpy().astype(np.float32))
+        if not out:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return _normalize(np.vstack(out))
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def get_embedder(name=PDF_QA_EMBEDDER):
+    """Embedder for a setting value: ``"hashing"`` or a Hugging Face model name."""
+    return HashingEmbedder() if name == "hashing" else TransformerEmbedder(name)
+
+
+class EmbeddingIndex:
+    """
+    Chunk vectors of indexed PDFs in a memory-mapped matrix.
+
+    Layout (one directory per embedder, so dimensions never mix):
+        vectors.f32     row-major float32 matrix, appended per document
+        chunks.jsonl    one line per row: document hash, page, text
+        documents.json  content hash -> name, path, first row, row count and
+                        the end of its chunk lines in chunks.jsonl (bytes)
+
+    Rows past the documents in documents.json (left by a process stopped
+    mid-document) are cut off before the next document is appended.
+    """
+
+    def __init__(self, directory=PDF_QA_DIR, embedder=None):
+        self.embedder = embedder or get_embedder()
+        self.directory = os.path.join(directory, re.sub(r"[^\w.-]+", "_", self.embedder.name))
+        os.makedirs(self.directory, exist_ok=True)
+        self._vectors_path = os.path.join(self.directory, "vectors.f32")
+        self._chunks_path = os.path.join(self.directory, "chunks.jsonl")
+        self._documents_path = os.path.join(self.directory, "documents.json")
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._matrix = None
+        self._chunks = None
+        try:
+            with open(self._documents_path, "r", encoding="utf-8") as f:
+                self.documents = json.load(f)
+        except (OSError, ValueError):
+            self.documents = {}
+
+    def __len__(self):
+        return sum(doc["count"] for doc in self.documents.values())
+
+    def _load(self):
+        """Map the vectors and read the chunk texts (once, and after each addition)."""
+        with self._lock:
+            rows = len(self)
+            if self._chunks is None:
+                self._chunks = []
+                if os.path.exists(self._chunks_path):
+                    # Rows past the indexed documents belong to a document still being added
+                    with open(self._chunks_path, "r", encoding="utf-8") as f:
+                        self._chunks = [json.loads(line) for line in itertools.islice(f, rows)]
+            if self._matrix is None and rows:
+                dim = self.embedder.dim
+                self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(rows, dim))
+            return self._matrix, self._chunks
+
+    def _indexed_sizes(self, rows):
+        """Byte sizes of vectors.f32 and chunks.jsonl holding exactly the first ``rows`` rows."""
+        if not rows:
+            return 0, 0
+        ends = [doc.get("chunks_end") for doc in self.documents.values()]
+        if None not in ends:
+            chunks_size = max(ends)
+        else:
+            # Index written before chunk offsets were recorded
+            with open(self._chunks_path, "rb") as f:
+                for _ in range(rows):
+                    f.readline()
+                chunks_size = f.tell()
+        return rows * self.embedder.dim * 4, chunks_size
+
+    def contains(self, path):
+        """Whether this file's content is already indexed."""
+        return file_hash(path) in self.documents
+
+    def add_document(self, path, pages=None):
+        """
+        Index a PDF unless its content is already indexed.
+
+        Chunks are embedded and appended ``INDEX_WRITE_CHUNKS`` at a time; the
+        document only becomes searchable once all of them are written.
+
+        Args:
+            path (str): PDF file
+            pages (iterable or None): Page texts if already extracted (default:
+                read the file lazily); a generator is closed when skipped
+
+        Returns:
+            int: Chunks added (0 when skipped or the PDF has no text)
+        """
+        from modules.pdf_summarizer import PDFProcessor, close_pages
+        digest = file_hash(path)
+        if digest in self.documents:
+            close_pages(pages)
+            return 0
+        if pages is None:
+            pages = PDFProcessor.iter_pages(path)
+
+        with self._write_lock:
+            if digest in self.documents:
+                close_pages(pages)
+                return 0
+            start = len(self)
+            sizes = self._indexed_sizes(start)
+            paths = (self._vectors_path, self._chunks_path)
+            records = []
+            chunks = chunk_pages(pages)
+            try:
+                # Drop orphan rows of a document that was never finished, so this one starts at row ``start``
+                for file_path, size in zip(paths, sizes):
+                    if os.path.exists(file_path) and os.path.getsize(file_path) > size:
+                        with open(file_path, "r+b") as f:
+                            f.truncate(size)
+                with open(self._vectors_path, "ab") as vectors_file, open(self._chunks_path, "ab") as chunks_file:
+                    while True:
+                        batch = list(itertools.islice(chunks, INDEX_WRITE_CHUNKS))
+                        if not batch:
+                            break
+                        with span("pdf_qa.embed", chunks=len(batch)):
+                            vectors = self.embedder.embed([text for _, text in batch])
+                        vectors_file.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+                        for page, text in batch:
+                            record = {"doc": digest, "page": page, "text": text}
+                            chunks_file.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+                            records.append(record)
+                    chunks_end = chunks_file.tell()
+            except BaseException:
+                # Drop the partial document so rows stay aligned with documents.json
+                for file_path, size in zip(paths, sizes):
+                    if os.path.exists(file_path):
+                        with open(file_path, "r+b") as f:
+                            f.truncate(size)
+                raise
+            if not records:
+                return 0
+
+            with self._lock:
+                self.documents[digest] = {"name": os.path.basename(path), "path": os.path.abspath(path),
+                                          "start": start, "count": len(records), "chunks_end": chunks_end}
+                tmp_path = self._documents_path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self.documents, f, indent=1)
+                os.replace(tmp_path, self._documents_path)
+                if self._chunks is not None:
+                    self._chunks.extend(records)
+                self._matrix = None  # remapped with the new rows on the next search
+        return len(records)
+
+    def search(self, question, k=PDF_QA_TOP_K, document=None):
+        """
+        Chunks most similar to a question.
+
+        Args:
+            question (str): Question text
+            k (int): Number of chunks
+            document (str or None): Content hash to search within (default: all PDFs)
+
+        Returns:
+            list: Dicts with 'score', 'text', 'page' and 'name', best first
+        """
+        matrix, chunks = self._load()
+        if matrix is None:
+            return []
+        start, stop = 0, len(chunks)
+        if document is not None:
+            doc = self.documents[document]
+            start, stop = doc["start"], doc["start"] + doc["count"]
+        query = self.embedder.embed([question])[0]
+        with span("pdf_qa.search", rows=stop - start):
+            scores = matrix[start:stop] @ query
+            k = min(k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+        names = {digest: doc["name"] for digest, doc in self.documents.items()}
+        return [{"score": float(scores[i]), "text": chunks[start + i]["text"], "page": chunks[start + i]["page"],
+                 "name": names.get(chunks[start + i]["doc"], "")} for i in top]
+
+    def latest_document(self):
+        """Content hash of the most recently indexed PDF, or None."""
+        if not self.documents:
+            return None
+        return max(self.documents, key=lambda digest: self.documents[digest]["start"])
+
+
+class PDFQuestionAnswerer:
+    """Answers questions with the best matching passages of indexed PDFs."""
+
+    def __init__(self, index=None):
+        self._index = index
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = EmbeddingIndex()
+        return self._index
+
+    def ask(self, question, k=PDF_QA_TOP_K, latest_only=False):
+        """
+        Answer a question from the indexed PDFs.
+
+        Args:
+            question (str): Question text
+            k (int): Passages to show
+            latest_only (bool): Only search the most recently indexed PDF
+
+        Returns:
+            str: Passages with file names and page numbers, or a hint
+        """
+        if not question.strip():
+            return "❓ Ask a question after 'ask pdf', e.g. 'ask pdf what was the conclusion?'"
+        if not self.index.documents:
+            return "📄 No PDFs indexed yet. Summarize a PDF first, then ask about it."
+        document = self.index.latest_document() if latest_only else None
+        hits = self.index.search(question, k, document)
+        if not hits:
+            return "❌ Nothing relevant found in your PDFs."
+        lines = ["📄 From your PDFs:"]
+        for hit in hits:
+            lines.append(f"• {hit['name']}, page {hit['page']}: {hit['text']}")
+        return "\n\n".join(lines)
@@ -2,14 +2,142 @@
 PDF processing and AI summarization functionality.
 """
 
-from PyPDF2 import PdfReader
-from transformers import pipeline
-from config.settings import PDF_CHUNK_SIZE, PDF_MAX_LENGTH, PDF_MIN_LENGTH, PDF_MAX_CHUNKS, PDF_SUMMARIZER_MODEL
+import gc
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from modules.pdf_ocr import OCRPipeline
+from utils.inference import InferenceResources
+from utils.memory import rss_mb
+from utils.profiling import span
+from config.settings import (
+    PDF_CHUNK_SIZE, PDF_MAX_CHUNKS, PDF_SUMMARIZER_MODEL,
+    PDF_MEMORY_LIMIT_MB, PDF_MEMORY_CHECK_PAGES, PDF_SUMMARY_BATCH_SIZE, PDF_SUMMARY_PROFILES, PDF_SUMMARY_PROFILE,
+    PDF_MODEL_LADDER, PDF_AUTO_TIME_BUDGET, PDF_AUTO_SECONDS_PER_CHUNK, PDF_MAX_WARM_MODELS, PDF_OCR_ENABLED
+)
+
+AUTO_MODEL = "auto"  # profile "model" value: pick from the ladder per document
+
+
+def iter_chunks(pieces, chunk_size=PDF_CHUNK_SIZE):
+    """
+    Cut a stream of text into fixed-size chunks without joining it first.
+    
+    Args:
+        pieces (iterable): Text pieces, e.g. page texts
+        chunk_size (int): Characters per chunk (the last one may be shorter)
+        
+    Yields:
+        str: The same chunks as slicing the concatenated text; at most one
+            chunk plus one piece is held at a time
+    """
+    buffer = ""
+    for piece in pieces:
+        buffer += piece
+        start = 0
+        while len(buffer) - start >= chunk_size:
+            yield buffer[start:start + chunk_size]
+            start += chunk_size
+        buffer = buffer[start:]
+    if buffer:
+        yield buffer
+
+
+def _recorded(pages, into):
+    """Pass pages through, appending each one to the list ``into``."""
+    for page in pages:
+        into.append(page)
+        yield page
+
+
+def close_pages(pages):
+    """Close a page generator that will not be read to the end (its PDF file and OCR pool)."""
+    close = getattr(pages, "close", None)
+    if close is not None:
+        close()
+
+
+def describe_progress(done, total, eta=None):
+    """
+    Status line for summary progress.
+    
+    Args:
+        done (int): Chunks summarized
+        total (int): Chunks to summarize
+        eta (float or None): Estimated seconds left
+        
+    Returns:
+        str: E.g. "Summarizing part 2 of 5, about 40 s left"
+    """
+    if done >= total:
+        return f"Summarized {total} of {total} parts"
+    text = f"Summarizing part {done + 1} of {total}"
+    if eta is not None:
+        minutes, seconds = divmod(max(1, int(round(eta))), 60)
+        text += f", about {minutes} min {seconds} s left" if minutes else f", about {seconds} s left"
+    return text
 
 
 class PDFProcessor:
     """Handles PDF text extraction."""
     
+    @staticmethod
+    def iter_pages(pdf_path, memory_limit_mb=PDF_MEMORY_LIMIT_MB, raise_errors=False):
+        """
+        Extract page texts lazily, one page at a time.
+        
+        The file is read through an open handle instead of being loaded
+        whole. PyPDF2 keeps every object it parses (content streams, fonts)
+        for the life of the reader; once the process has grown by more than
+        ``memory_limit_mb`` since the PDF was opened, that cache is dropped
+        and objects are parsed again when a later page needs them.
+        
+        Args:
+            pdf_path (str): Path to PDF file
+            memory_limit_mb (float or None): Growth allowed before the cache is
+                dropped (None: keep everything; where RSS cannot be measured,
+                the cache is dropped every ``PDF_MEMORY_CHECK_PAGES`` pages)
+            raise_errors (bool): Raise read errors instead of printing them
+            
+        Yields:
+            str: Page text ("" for pages without text); stops early on error
+        """
+        try:
+            from PyPDF2 import PdfReader
+            with open(pdf_path, "rb") as f:
+                reader = PdfReader(f)
+                count = len(reader.pages)
+                floor = rss_mb()
+                for number in range(count):
+                    if memory_limit_mb is not None and number and number % PDF_MEMORY_CHECK_PAGES == 0:
+                        if floor is None or rss_mb() - floor > memory_limit_mb:
+                            reader.resolved_objects.clear()
+                    yield reader.pages[number].extract_text() or ""
+        except Exception as e:
+            if raise_errors:
+                raise
+            print(f"PDF extraction error: {e}")
+    
+    @staticmethod
+    def extract_pages(pdf_path, raise_errors=False):
+        """
+        Extract the text of each page.
+        
+        Args:
+            pdf_path (str): Path to PDF file
+            raise_errors (bool): Raise read errors instead of printing them
+            
+        Returns:
+            list: Page texts ("" for pages without text); empty on error
+        """
+        with span("pdf.extract") as timing:
+            pages = list(PDFProcessor.iter_pages(pdf_path, raise_errors=raise_errors))
+            timing.set(pages=len(pages), chars=sum(len(p) for p in pages))
+        return pages
+    
     @staticmethod
     def extract_text(pdf_path):
         """
@@ -21,88 +149,436 @@ class PDFProcessor:
         Returns:
             str: Extracted text or empty string
         """
-        try:
-            reader = PdfReader(pdf_path)
-            full_text = ""
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    full_text += page_text + "\n"
-            return full_text
-        except Exception as e:
-            print(f"PDF extraction error: {e}")
-            return ""
+        return "".join(page + "\n" for page in PDFProcessor.iter_pages(pdf_path) if page)
 
 
 class AISummarizer:
     """Handles AI-powered PDF summarization."""
     
-    def __init__(self):
-        self.model = None
+    def __init__(self, model_name=PDF_SUMMARIZER_MODEL, resources=None, profile=PDF_SUMMARY_PROFILE,
+                 profiles=PDF_SUMMARY_PROFILES, ladder=PDF_MODEL_LADDER, max_warm_models=PDF_MAX_WARM_MODELS):
+        """
+        Args:
+            model_name (str): Hugging Face summarization model (used by profiles
+                without a model of their own)
+            resources (InferenceResources or None): Torch threads and core
+                pinning (default: from settings)
+            profile (str): Default profile
+            profiles (dict): Profile name -> model and generation arguments
+            ladder (list): Models the "auto" profile chooses from, smallest
+                first, with estimated load and per-chunk seconds
+            max_warm_models (int): Pipelines kept loaded; the least recently
+                used one is dropped before another is loaded
+        """
+        self.model_name = model_name
+        self.models = OrderedDict()  # model name -> loaded pipeline, least recently used first
+        self.max_warm_models = max(1, max_warm_models)
+        self._models_lock = threading.Lock()  # guards ``models`` and ``_load_locks``
+        self._load_locks = {}  # model name -> lock held while it loads, so it loads once
+        self.resources = resources or InferenceResources()
+        self.profile = profile
+        self.profiles = profiles
+        self.ladder = ladder
+        self.seconds_per_chunk = {}  # measured throughput per (profile, model), for estimates
+        self.last_model = None
+    
+    @property
+    def model(self):
+        """Pipeline of the default model, or None while it is not loaded."""
+        return self.models.get(self.model_name)
+    
+    def _get_model(self, model_name=None):
+        """Lazy load a summarization model (``model_name`` by default)."""
+        name = model_name or self.model_name
+        model = self._warm_model(name)
+        if model is not None:
+            return model
+        with self._models_lock:
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+        with load_lock:
+            # Another thread may have loaded it while this one waited
+            model = self._warm_model(name)
+            if model is not None:
+                return model
+            with self._models_lock:
+                evicted = self._evict(self.max_warm_models - 1)
+            if evicted:
+                # Free the weights before the next model needs the memory
+                gc.collect()
+            # transformers (and torch behind it) take seconds to import
+            from transformers import pipeline
+            with span("pdf.model_load", model=name):
+                model = pipeline("summarization", model=name)
+            with self._models_lock:
+                self.models[name] = model
+                # Other models may have loaded at the same time
+                self._evict(self.max_warm_models)
+        return model
+    
+    def _warm_model(self, name):
+        """Loaded pipeline for a model, marked as most recently used, or None."""
+        with self._models_lock:
+            model = self.models.get(name)
+            if model is not None:
+                self.models.move_to_end(name)
+            return model
+    
+    def _evict(self, keep):
+        """Drop least recently used pipelines until ``keep`` are left (caller holds the lock)."""
+        evicted = False
+        while len(self.models) > keep:
+            self.models.popitem(last=False)
+            evicted = True
+        return evicted
+    
+    def is_warm(self, model_name):
+        """Whether a model is loaded (and not evicted since)."""
+        return model_name in self.models
+    
+    def estimate_seconds(self, rung, chunks, profile=AUTO_MODEL):
+        """
+        Expected seconds to summarize ``chunks`` chunks with a ladder model.
+        
+        Measured throughput replaces the rung's estimate once the model has
+        run here; the load time only counts while the model is cold.
+        """
+        per_chunk = self.seconds_per_chunk.get((profile, rung["model"]), rung["seconds_per_chunk"])
+        load = 0.0 if self.is_warm(rung["model"]) else rung["load_seconds"]
+        return load + chunks * per_chunk
+    
+    def choose_model(self, chunks, time_budget=None, profile=AUTO_MODEL):
+        """
+        Pick the largest ladder model expected to finish within the budget.
+        
+        Args:
+            chunks (int): Chunks to summarize
+            time_budget (float or None): Seconds allowed (default: grows with the
+                document, ``PDF_AUTO_SECONDS_PER_CHUNK`` per chunk, up to
+                ``PDF_AUTO_TIME_BUDGET``)
+            profile (str): Profile whose measured throughput applies
+            
+        Returns:
+            str: Model name; the fastest model when none fits the budget
+        """
+        if time_budget is None:
+            time_budget = min(PDF_AUTO_TIME_BUDGET, PDF_AUTO_SECONDS_PER_CHUNK * max(1, chunks))
+        estimates = [(self.estimate_seconds(rung, chunks, profile), rung["model"]) for rung in self.ladder]
+        fitting = [model for seconds, model in estimates if seconds <= time_budget]
+        return fitting[-1] if fitting else min(estimates)[1]
     
-    def _get_model(self):
-        """Lazy load the summarization model."""
-        if self.model is None:
-            self.model = pipeline("summarization", model=PDF_SUMMARIZER_MODEL)
-        return self.model
+    def resolve_profile(self, profile=None):
+        """
+        Generation settings of a summary profile.
+        
+        Args:
+            profile (str or None): Profile name (default: this summarizer's)
+            
+        Returns:
+            dict: 'model' plus the pipeline's generation arguments
+        """
+        name = profile or self.profile
+        if name not in self.profiles:
+            raise ValueError(f"Unknown summary profile '{name}' (choose from {', '.join(self.profiles)})")
+        settings = dict(self.profiles[name])
+        settings["model"] = settings.get("model") or self.model_name
+        return settings
     
-    def summarize(self, text, chunk_size=PDF_CHUNK_SIZE, max_length=PDF_MAX_LENGTH, min_length=PDF_MIN_LENGTH):
+    def summarize(self, text, chunk_size=PDF_CHUNK_SIZE, max_length=None, min_length=None, profile=None):
         """
         Summarize text using AI model.
         
         Args:
             text (str): Text to summarize
             chunk_size (int): Size of text chunks
-            max_length (int): Maximum summary length
-            min_length (int): Minimum summary length
+            max_length (int or None): Maximum summary length (default: the profile's)
+            min_length (int or None): Minimum summary length (default: the profile's)
+            profile (str or None): Summary profile (default: this summarizer's)
             
         Returns:
             str: Summarized text
         """
         if not text.strip():
             return "❌ Could not extract text from the PDF."
+        return self.join_parts(self.iter_summary(text, chunk_size, max_length, min_length, profile=profile))
+    
+    @staticmethod
+    def join_parts(parts):
+        """
+        Format (part number, text) pairs as one summary.
         
-        # Split into chunks
-        chunks = [text[i:i+chunk_size] for i in range(0, len(text), chunk_size)]
-        summarizer = self._get_model()
+        Args:
+            parts (iterable): Pairs from ``iter_summary``
+            
+        Returns:
+            str: "Part N:" sections, notices on their own lines
+        """
         summary = ""
+        for part_number, sub_summary in parts:
+            if part_number is None:
+                summary += f"{sub_summary}\n"
+            else:
+                summary += f"Part {part_number}:\n{sub_summary}\n\n"
+        return summary.strip()
+    
+    def iter_summary(self, text, chunk_size=PDF_CHUNK_SIZE, max_length=None, min_length=None,
+                     batch_size=PDF_SUMMARY_BATCH_SIZE, on_progress=None, profile=None, time_budget=None):
+        """
+        Summarize text chunk by chunk, yielding each part as soon as it is ready.
         
-        for idx, chunk in enumerate(chunks):
-            if idx >= PDF_MAX_CHUNKS:
-                summary += "(Summary truncated... PDF is very long)\n"
-                break
+        Chunks are cut as the text arrives, so a lazy page iterator is only
+        read as far as the summary goes.
+        
+        Args:
+            text (str or iterable): Text to summarize, or text pieces (e.g. pages)
+            chunk_size (int): Size of text chunks
+            max_length (int or None): Maximum summary length (default: the profile's)
+            min_length (int or None): Minimum summary length (default: the profile's)
+            batch_size (int): Chunks per model call; parts of a batch are
+                yielded together once it completes
+            on_progress (callable or None): ``on_progress(done, total, eta)``
+                with chunks done, chunks to summarize and the estimated seconds
+                left (None until a chunk has been timed); called before the
+                first chunk and after every batch
+            profile (str or None): Summary profile (model, beams and lengths;
+                default: this summarizer's)
+            time_budget (float or None): Seconds the "auto" profile aims for
+                when choosing a model (see ``choose_model``)
             
+        Yields:
+            tuple: (part number, summary text); the part number is None for
+                the truncation notice on very long documents
+        """
+        settings = self.resolve_profile(profile)
+        profile = profile or self.profile
+        model_name = settings.pop("model")
+        if max_length is not None:
+            settings["max_length"] = max_length
+        if min_length is not None:
+            settings["min_length"] = min_length
+        
+        chunks = iter_chunks([text] if isinstance(text, str) else text, chunk_size)
+        # At most PDF_MAX_CHUNKS chunks are summarized; reading them first gives
+        # an exact total for progress without reading the rest of the document
+        planned = []
+        for idx, chunk in enumerate(itertools.islice(chunks, PDF_MAX_CHUNKS)):
             chunk = " ".join(chunk.split())
-            if len(chunk) < 60:
-                continue
-            
-            try:
-                out = summarizer(chunk, max_length=max_length, min_length=min_length, do_sample=False)
-                sub_summary = out[0]['summary_text']
-                summary += f"Part {idx+1}:\n{sub_summary}\n\n"
-            except Exception as e:
-                print(f"Summarization error for chunk {idx}: {e}")
-                continue
+            if len(chunk) >= 60:
+                planned.append((idx + 1, chunk))
+        truncated = next(chunks, None) is not None
         
-        return summary.strip()
+        if planned:
+            if model_name == AUTO_MODEL:
+                model_name = self.choose_model(len(planned), time_budget, profile)
+            self.last_model = model_name
+            key = (profile, model_name)
+            summarizer = self._get_model(model_name)
+            # Torch's worker threads inherit the affinity of the thread that runs the model
+            self.resources.apply()
+            self.resources.pin_current_thread()
+            if on_progress is not None:
+                on_progress(0, len(planned), self._eta(key, len(planned)))
+            batch_size = max(1, batch_size)
+            for start in range(0, len(planned), batch_size):
+                batch = planned[start:start + batch_size]
+                began = time.perf_counter()
+                try:
+                    with span("pdf.summarize_chunk", chunk=batch[0][0], chunks=len(batch),
+                              chars=sum(len(c) for _, c in batch), model=model_name):
+                        out = summarizer([c for _, c in batch], do_sample=False, **settings)
+                    parts = [(number, result['summary_text']) for (number, _), result in zip(batch, out)]
+                    self._record_time(key, (time.perf_counter() - began) / len(batch))
+                except Exception as e:
+                    print(f"Summarization error for chunk {batch[0][0] - 1}: {e}")
+                    parts = []
+                yield from parts
+                if on_progress is not None:
+                    done = start + len(batch)
+                    on_progress(done, len(planned), self._eta(key, len(planned) - done))
+        
+        if truncated:
+            yield None, "(Summary truncated... PDF is very long)"
+    
+    def _record_time(self, key, seconds):
+        """Fold one chunk's time into the (profile, model) throughput estimate (kept across documents)."""
+        previous = self.seconds_per_chunk.get(key)
+        self.seconds_per_chunk[key] = seconds if previous is None else previous + 0.3 * (seconds - previous)
+    
+    def _eta(self, key, remaining):
+        """Estimated seconds for the remaining chunks, or None before any chunk is timed."""
+        seconds = self.seconds_per_chunk.get(key)
+        return None if seconds is None else remaining * seconds
 
 
 class PDFSummarizer:
     """Unified PDF summarizer combining extraction and AI summarization."""
     
-    def __init__(self):
+    def __init__(self, index=None, qa_index=None, ocr=None):
+        """
+        Args:
+            index (LocalIndex or None): Local index that receives every finished summary
+            qa_index (EmbeddingIndex or None): Question-answering index that receives
+                the text of every summarized PDF, on a background thread
+            ocr (OCRPipeline or None): OCR for pages without a text layer (default:
+                from settings when ``PDF_OCR_ENABLED``)
+        """
         self.processor = PDFProcessor()
         self.ai_summarizer = AISummarizer()
+        self.index = index
+        self.qa_index = qa_index
+        self.ocr = ocr or (OCRPipeline() if PDF_OCR_ENABLED else None)
+        # One document at a time, in order; the thread is started on the first job
+        self._qa_jobs = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-qa-index")
+    
+    def iter_pages(self, pdf_path):
+        """
+        Read page texts lazily, with OCR text for pages that have no text layer.
+        
+        Args:
+            pdf_path (str): Path to PDF file
+            
+        Returns:
+            iterator: Page texts
+        """
+        pages = self.processor.iter_pages(pdf_path)
+        return pages if self.ocr is None else self.ocr.iter_pages(pdf_path, pages)
     
-    def summarize_file(self, pdf_path):
+    def summarize_file(self, pdf_path, profile=None):
         """
         Summarize a PDF file.
         
         Args:
             pdf_path (str): Path to PDF file
+            profile (str or None): Summary profile (default: the summarizer's)
             
         Returns:
             str: Summarized content
         """
-        text = self.processor.extract_text(pdf_path)
-        return self.ai_summarizer.summarize(text)
+        return self.ai_summarizer.join_parts(self.iter_summary_file(pdf_path, profile=profile))
+    
+    def summarize_to_file(self, pdf_path, output_path, profile=None):
+        """
+        Summarize a PDF file, appending each part to a text file as soon as it is ready.
+        
+        Args:
+            pdf_path (str): Path to PDF file
+            output_path (str): Summary file (overwritten)
+            profile (str or None): Summary profile (default: the summarizer's)
+            
+        Returns:
+            int: Parts written
+        """
+        written = 0
+        with open(output_path, "w", encoding="utf-8") as f:
+            for part_number, text in self.iter_summary_file(pdf_path, profile=profile):
+                f.write(f"{text}\n" if part_number is None else f"Part {part_number}:\n{text}\n\n")
+                f.flush()
+                written += part_number is not None
+        return written
+    
+    def iter_summary_file(self, pdf_path, on_progress=None, profile=None, on_indexed=None):
+        """
+        Summarize a PDF file part by part.
+        
+        Pages are read lazily, so memory stays bounded however long the PDF
+        is, and reading stops once the summary is complete. Scanned pages
+        are read by OCR (see ``modules.pdf_ocr``).
+        
+        Args:
+            pdf_path (str): Path to PDF file
+            on_progress (callable or None): ``on_progress(done, total, eta)``, see
+                ``AISummarizer.iter_summary``
+            profile (str or None): Summary profile (default: the summarizer's)
+            on_indexed (callable or None): See ``index_for_questions``
+            
+        Yields:
+            tuple: (part number or None, summary text)
+        """
+        yield from self.iter_summary_pages(pdf_path, self.iter_pages(pdf_path), on_progress, profile, on_indexed)
+    
+    def iter_summary_pages(self, pdf_path, pages, on_progress=None, profile=None, on_indexed=None):
+        """
+        Summarize pages part by part, then index the result.
+        
+        The summary goes into the local index once it is complete. The
+        question index gets the document in the background, from the pages
+        the summary read and the rest of the same stream, so the file is not
+        read (or OCR'd) twice and the last part is not held up.
+        
+        Args:
+            pdf_path (str): Path of the PDF the pages came from
+            pages (list or iterable): Page texts; an iterator is consumed once,
+                partly here and the rest by the question index
+            on_progress (callable or None): ``on_progress(done, total, eta)``, see
+                ``AISummarizer.iter_summary``
+            profile (str or None): Summary profile (default: the summarizer's)
+            on_indexed (callable or None): See ``index_for_questions``
+            
+        Yields:
+            tuple: (part number or None, summary text)
+        """
+        source = iter(pages)
+        read = []  # pages taken by the summary, for the question index
+        remaining = _recorded(source, read) if self.qa_index is not None else source
+        first = next((page for page in remaining if page.strip()), None)
+        if first is None:
+            yield None, "❌ Could not extract text from the PDF."
+            return
+        text = (page + "\n" for page in itertools.chain([first], remaining) if page)
+        parts = []
+        try:
+            for part_number, part in self.ai_summarizer.iter_summary(text, on_progress=on_progress, profile=profile):
+                if part_number is not None:
+                    parts.append(part)
+                yield part_number, part
+        except BaseException:
+            close_pages(source)
+            raise
+        self._index_summary(pdf_path, "\n".join(parts))
+        self.index_for_questions(pdf_path, source, on_indexed, read)
+    
+    def _index_summary(self, pdf_path, summary):
+        """Add a finished summary to the local index."""
+        if self.index is not None and summary:
+            self.index.add("pdf", os.path.basename(pdf_path), summary, url=os.path.abspath(pdf_path))
+    
+    def index_for_questions(self, pdf_path, pages=None, on_indexed=None, read=()):
+        """
+        Embed a document for "ask pdf" questions on the background index thread.
+        
+        A document whose content is indexed already is skipped here, so its
+        page stream is closed at once instead of waiting in the queue.
+        
+        Args:
+            pdf_path (str): PDF file
+            pages (iterable or None): Page texts (default: read the file); a
+                generator is closed once the job is done or skipped
+            on_indexed (callable or None): ``on_indexed(chunks, error)`` when the
+                job is done (error: message or None); called on the index thread
+            read (list): Pages already taken from ``pages``, indexed first
+            
+        Returns:
+            Future or None: Chunks added (None when skipped)
+        """
+        try:
+            skip = self.qa_index is None or self.qa_index.contains(pdf_path)
+        except OSError as e:
+            print(f"PDF question index error: {e}")
+            skip = True
+        if skip:
+            close_pages(pages)
+            return None
+        return self._qa_jobs.submit(self._index_for_questions, pdf_path, pages, on_indexed, read)
+    
+    def _index_for_questions(self, pdf_path, pages, on_indexed, read):
+        """Run one question index job (index thread)."""
+        chunks, error = 0, None
+        try:
+            chunks = self.qa_index.add_document(pdf_path, itertools.chain(read, pages) if read else pages)
+        except Exception as e:
+            error = str(e)
+            print(f"PDF question index error: {e}")
+        finally:
+            close_pages(pages)
+        if on_indexed is not None:
+            on_indexed(chunks, error)
+        return chunks
@@ -3,17 +3,25 @@ Web search functionality including Wikipedia, web search, and YouTube.
 """
 
 import requests
-import wikipedia
 from bs4 import BeautifulSoup
 from urllib.parse import quote_plus
-import re
-from config.settings import USER_AGENT, WEB_SEARCH_RESULTS, YOUTUBE_RESULTS, WIKIPEDIA_SENTENCES
+from utils.profiling import span, timed
+from config.settings import (
+    USER_AGENT, WEB_SEARCH_RESULTS, YOUTUBE_RESULTS, WIKIPEDIA_SENTENCES, YOUTUBE_CACHE_SIZE, YOUTUBE_CACHE_TTL
+)
+from modules.wikipedia_client import WikipediaClient
+from modules import youtube
+from modules.local_index import index_search_results
+from utils.cache import LRUCache
 
 
 class WikipediaSearch:
     """Wikipedia search functionality."""
     
+    client = WikipediaClient()
+    
     @staticmethod
+    @timed("search.wikipedia")
     def get_summary(query):
         """
         Get Wikipedia summary for a query.
@@ -24,21 +32,35 @@ class WikipediaSearch:
         Returns:
             str: Wikipedia summary or error message
         """
-        try:
-            return wikipedia.summary(query, sentences=WIKIPEDIA_SENTENCES)
-        except wikipedia.DisambiguationError as e:
-            options = '\n- '.join(e.options[:5])
-            return f"❓ Wikipedia ambiguous. Try being more specific. Some options:\n- {options}"
-        except wikipedia.PageError:
-            return "❌ Wikipedia: No page found."
-        except Exception as e:
-            return f"❌ Wikipedia error: {e}"
+        return WikipediaSearch.client.get_summary(query, WIKIPEDIA_SENTENCES)
 
 
 class WebSearch:
     """Web search using multiple search engines."""
     
     @staticmethod
+    def parse_duckduckgo(html, num_results=WEB_SEARCH_RESULTS):
+        """
+        Extract results from a DuckDuckGo HTML results page.
+        
+        Args:
+            html (str): Page source
+            num_results (int): Maximum results
+            
+        Returns:
+            list: Result dicts with 'title' and 'url'
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+        results = []
+        for result in soup.find_all('a', class_='result__a', limit=num_results):
+            title = result.get_text()
+            href = result.get('href')
+            if href:
+                results.append({'title': title, 'url': href})
+        return results
+    
+    @staticmethod
+    @timed("search.duckduckgo")
     def search_duckduckgo(query, num_results=WEB_SEARCH_RESULTS):
         """Search using DuckDuckGo."""
         try:
@@ -47,15 +69,7 @@ class WebSearch:
             response = requests.get(url, headers=headers, timeout=10)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                results = []
-                
-                for result in soup.find_all('a', class_='result__a', limit=num_results):
-                    title = result.get_text()
-                    href = result.get('href')
-                    if href:
-                        results.append({'title': title, 'url': href})
-                
+                results = WebSearch.parse_duckduckgo(response.text, num_results)
                 return results if results else None
             return None
         except Exception as e:
@@ -82,76 +96,110 @@ class WebSearch:
             pass
         return bing_url
     
+    @staticmethod
+    def parse_bing(html, num_results=WEB_SEARCH_RESULTS):
+        """
+        Extract results from a Bing results page, unwrapping Bing's redirect URLs.
+        
+        Args:
+            html (str): Page source
+            num_results (int): Maximum results
+            
+        Returns:
+            list: Result dicts with 'title' and 'url'
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+        results = []
+        
+        # Find all li.b_algo elements
+        for result in soup.find_all('li', class_='b_algo'):
+            try:
+                title_tag = result.find('h2')
+                if not title_tag:
+                    continue
+                
+                link_tag = title_tag.find('a') if title_tag else None
+                if not link_tag:
+                    link_tag = result.find('a')
+                if not link_tag:
+                    continue
+                
+                title = title_tag.get_text().strip()
+                bing_url = link_tag.get('href', "")
+                
+                if not title or not bing_url:
+                    continue
+                
+                actual_url = WebSearch._decode_bing_url(bing_url)
+                
+                if not actual_url.startswith('http'):
+                    actual_url = bing_url
+                
+                if any(r['url'] == actual_url for r in results):
+                    continue
+                
+                results.append({'title': title, 'url': actual_url})
+                
+                if len(results) >= num_results:
+                    break
+            except:
+                pass
+        return results
+    
     @staticmethod
     def search_bing(query, num_results=WEB_SEARCH_RESULTS):
         """Search using Bing with proper URL decoding and multiple user agents."""
-        try:
-            # Try with a simpler approach - use requests with cookies  
-            session = requests.Session()
-            session.headers.update({
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                "Accept-Language": "en-US,en;q=0.9",
-            })
-            
-            url = f"https://www.bing.com/search?q={quote_plus(query)}"
-            print("[Bing] URL: " + url[:70])
-            
-            response = session.get(url, timeout=15)
-            print("[Bing] Status: " + str(response.status_code))
+        with span("search.bing") as timing:
+            try:
+                # Try with a simpler approach - use requests with cookies  
+                session = requests.Session()
+                session.headers.update({
+                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+                    "Accept-Language": "en-US,en;q=0.9",
+                })
+                
+                url = f"https://www.bing.com/search?q={quote_plus(query)}"
+                response = session.get(url, timeout=15)
+                timing.set(status=response.status_code)
+                
+                if response.status_code != 200:
+                    return None
+                
+                results = WebSearch.parse_bing(response.text, num_results)
+                timing.set(results=len(results))
+                return results if results else None
             
-            if response.status_code != 200:
+            except Exception as e:
+                print("[Bing] Error: " + str(e))
                 return None
+    
+    @staticmethod
+    def parse_brave(html, num_results=WEB_SEARCH_RESULTS):
+        """
+        Extract results from a Brave Search results page.
+        
+        Args:
+            html (str): Page source
+            num_results (int): Maximum results
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            results = []
-            print("[Bing] Searching...")
-            
-            # Find all li.b_algo elements
-            result_items = soup.find_all('li', class_='b_algo')
-            print("[Bing] Found: " + str(len(result_items)))
-            
-            for result in result_items:
-                try:
-                    title_tag = result.find('h2')
-                    if not title_tag:
-                        continue
-                    
-                    link_tag = title_tag.find('a') if title_tag else None
-                    if not link_tag:
-                        link_tag = result.find('a')
-                    if not link_tag:
-                        continue
-                    
-                    title = title_tag.get_text().strip()
-                    bing_url = link_tag.get('href', "")
-                    
-                    if not title or not bing_url:
-                        continue
-                    
-                    actual_url = WebSearch._decode_bing_url(bing_url)
-                    
-                    if not actual_url.startswith('http'):
-                        actual_url = bing_url
-                    
-                    if any(r['url'] == actual_url for r in results):
-                        continue
-                    
-                    results.append({'title': title, 'url': actual_url})
-                    
-                    if len(results) >= num_results:
-                        break
-                except:
-                    pass
+        Returns:
+            list: Result dicts with 'title' and 'url'
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+        results = []
+        for result in soup.find_all('div', class_='snippet', limit=num_results):
+            title_tag = result.find('span', class_='snippet-title')
+            link_tag = result.find_parent('a')
             
-            print("[Bing] Got " + str(len(results)))
-            return results if results else None
-        
-        except Exception as e:
-            print("[Bing] Error: " + str(e))
-            return None
+            if title_tag and link_tag:
+                title = title_tag.get_text()
+                url = link_tag.get('href')
+                if url and url.startswith('http'):
+                    results.append({'title': title, 'url': url})
+        return results
     
     @staticmethod
+    @timed("search.brave")
     def search_brave(query, num_results=WEB_SEARCH_RESULTS):
         """Search using Brave."""
         try:
@@ -160,19 +208,7 @@ class WebSearch:
             response = requests.get(url, headers=headers, timeout=10)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                results = []
-                
-                for result in soup.find_all('div', class_='snippet', limit=num_results):
-                    title_tag = result.find('span', class_='snippet-title')
-                    link_tag = result.find_parent('a')
-                    
-                    if title_tag and link_tag:
-                        title = title_tag.get_text()
-                        url = link_tag.get('href')
-                        if url and url.startswith('http'):
-                            results.append({'title': title, 'url': url})
-                
+                results = WebSearch.parse_brave(response.text, num_results)
                 return results if results else None
             return None
         except Exception as e:
@@ -180,6 +216,7 @@ class WebSearch:
             return None
     
     @staticmethod
+    @timed("search.web")
     def get_results(query, num_results=WEB_SEARCH_RESULTS):
         """
         Get search results ONLY from Bing as the primary web search engine.
@@ -205,68 +242,75 @@ class WebSearch:
 class YouTubeSearch:
     """YouTube search functionality."""
     
+    cache = LRUCache(YOUTUBE_CACHE_SIZE, YOUTUBE_CACHE_TTL)
+    
     @staticmethod
+    def parse_results_page(html, num=YOUTUBE_RESULTS):
+        """
+        Extract videos from a YouTube results page.
+        
+        Args:
+            html (str): Page source
+            num (int): Maximum videos
+            
+        Returns:
+            list: Video dicts with 'title', 'url', 'duration', 'channel' and 'views'
+        """
+        return youtube.parse_results_page(html, num)
+    
+    @staticmethod
+    def cache_key(query, num):
+        """Key of a query in ``YouTubeSearch.cache``."""
+        return " ".join(query.lower().split()), num
+    
+    @staticmethod
+    @timed("search.youtube")
     def search(query, num=YOUTUBE_RESULTS):
         """
-        Search YouTube with multiple fallback methods.
+        Search YouTube, reading the results page only until ``num`` videos are found.
         
         Args:
             query (str): Search query
             num (int): Number of results
             
         Returns:
-            list: List of videos with title and url
+            list: List of videos with title, url and duration
         """
-        # Try youtubesearchpython library first
-        try:
-            from youtubesearchpython import VideosSearch
-            search = VideosSearch(query, limit=num)
-            result = search.result().get("result", [])
-            
-            if result:
-                videos = []
-                for v in result:
-                    videos.append({
-                        'title': v.get("title", "No title"),
-                        'url': v.get("link", "")
-                    })
-                return videos
-        except Exception as e:
-            print(f"YouTube search library error: {e}")
+        key = YouTubeSearch.cache_key(query, num)
+        videos = YouTubeSearch.cache.get(key)
+        if videos is not None:
+            return videos
         
-        # Fallback to web scraping
         try:
             headers = {"User-Agent": USER_AGENT}
-            q = quote_plus(query)
-            response = requests.get(f"https://www.youtube.com/results?search_query={q}", 
-                                  headers=headers, timeout=10)
-            
-            if response.status_code == 200:
-                video_ids = re.findall(r"watch\?v=([a-zA-Z0-9_-]{11})", response.text)
-                seen = set()
-                unique_ids = [x for x in video_ids if not (x in seen or seen.add(x))]
-                
-                videos = []
-                for vid_id in unique_ids[:num]:
-                    videos.append({
-                        'title': f"Video: {vid_id}",
-                        'url': f"https://www.youtube.com/watch?v={vid_id}"
-                    })
-                
-                return videos if videos else None
+            with requests.get(youtube.results_url(query), headers=headers, timeout=10, stream=True) as response:
+                if response.status_code != 200:
+                    return None
+                scanner = youtube.InitialDataScanner(num)
+                for chunk in response.iter_content(youtube.READ_CHUNK_SIZE):
+                    if scanner.feed(chunk):
+                        break
+            if scanner.videos:
+                YouTubeSearch.cache.set(key, scanner.videos)
+                return scanner.videos
             return None
         except Exception as e:
-            print(f"YouTube fallback error: {e}")
+            print(f"YouTube search error: {e}")
             return None
 
 
 class SearchManager:
     """Unified search manager coordinating all search types."""
     
-    def __init__(self):
+    def __init__(self, index=None):
+        """
+        Args:
+            index (LocalIndex or None): Local index that receives every result
+        """
         self.wikipedia = WikipediaSearch()
         self.web = WebSearch()
         self.youtube = YouTubeSearch()
+        self.index = index
     
     def search_all(self, query):
         """
@@ -275,8 +319,10 @@ class SearchManager:
         Returns:
             dict: Dictionary with 'wikipedia', 'web', and 'youtube' results
         """
-        return {
+        results = {
             'wikipedia': self.wikipedia.get_summary(query),
             'web': self.web.get_results(query),
             'youtube': self.youtube.search(query)
         }
+        index_search_results(self.index, query, results, WikipediaSearch.client.title_for(query))
+        return results
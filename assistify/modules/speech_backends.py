@@ -0,0 +1,226 @@
+"""
+Speech recognition backends: online (Google), offline (Sphinx, Vosk,
+Whisper) and a file-based fake for tests and benchmarks.
+"""
+
+import hashlib
+import json
+import os
+import time
+import speech_recognition as sr
+from config.settings import VOICE_RECOGNIZER_BACKEND, VOICE_LANGUAGE, VOSK_MODEL_PATH, WHISPER_MODEL, FAKE_TRANSCRIPTS_DIR
+
+
+class RecognizerBackend:
+    """
+    Base class for speech-to-text engines.
+    
+    ``recognize`` raises ``sr.UnknownValueError`` when nothing intelligible
+    was heard and ``sr.RequestError`` when the engine itself fails, matching
+    the errors of the ``speech_recognition`` package.
+    """
+    
+    name = "base"
+    
+    def recognize(self, audio):
+        """
+        Transcribe audio.
+        
+        Args:
+            audio (sr.AudioData): Captured audio
+            
+        Returns:
+            str: Recognized text
+        """
+        raise NotImplementedError
+    
+    def recognize_file(self, path):
+        """
+        Transcribe a WAV/AIFF/FLAC file.
+        
+        Args:
+            path (str): Audio file path
+            
+        Returns:
+            str: Recognized text
+        """
+        return self.recognize(load_audio_file(path))
+
+
+class GoogleBackend(RecognizerBackend):
+    """Google Web Speech API (needs network access)."""
+    
+    name = "google"
+    
+    def __init__(self, recognizer=None, language=VOICE_LANGUAGE):
+        self.recognizer = recognizer or sr.Recognizer()
+        self.language = language
+    
+    def recognize(self, audio):
+        return self.recognizer.recognize_google(audio, language=self.language)
+
+
+class SphinxBackend(RecognizerBackend):
+    """CMU PocketSphinx, fully offline (requires ``pocketsphinx``)."""
+    
+    name = "sphinx"
+    
+    def __init__(self, recognizer=None, language=VOICE_LANGUAGE):
+        self.recognizer = recognizer or sr.Recognizer()
+        self.language = language
+    
+    def recognize(self, audio):
+        return self.recognizer.recognize_sphinx(audio, language=self.language)
+
+
+class VoskBackend(RecognizerBackend):
+    """Vosk/Kaldi local model, fully offline (requires ``vosk`` and a model directory)."""
+    
+    name = "vosk"
+    sample_rate = 16000
+    
+    def __init__(self, model_path=VOSK_MODEL_PATH):
+        self.model_path = model_path
+        self._model = None
+    
+    def _get_model(self):
+        """Load the model once on first use."""
+        if self._model is None:
+            try:
+                import vosk
+            except ImportError as e:
+                raise sr.RequestError("Vosk backend requires the 'vosk' package") from e
+            if not os.path.isdir(self.model_path):
+                raise sr.RequestError(f"Vosk model not found: {self.model_path}")
+            vosk.SetLogLevel(-1)
+            self._model = vosk.Model(self.model_path)
+        return self._model
+    
+    def recognize(self, audio):
+        import vosk
+        recognizer = vosk.KaldiRecognizer(self._get_model(), self.sample_rate)
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2))
+        text = json.loads(recognizer.FinalResult()).get("text", "").strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+class WhisperBackend(RecognizerBackend):
+    """Whisper running locally on CPU via ``faster-whisper`` (int8)."""
+    
+    name = "whisper"
+    sample_rate = 16000
+    
+    def __init__(self, model_name=WHISPER_MODEL):
+        self.model_name = model_name
+        self._model = None
+    
+    def _get_model(self):
+        """Load the model once on first use."""
+        if self._model is None:
+            try:
+                from faster_whisper import WhisperModel
+            except ImportError as e:
+                raise sr.RequestError("Whisper backend requires the 'faster-whisper' package") from e
+            self._model = WhisperModel(self.model_name, device="cpu", compute_type="int8")
+        return self._model
+    
+    def recognize(self, audio):
+        import numpy as np
+        raw = audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2)
+        samples = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+        segments, _ = self._get_model().transcribe(samples, language=VOICE_LANGUAGE.split("-")[0], beam_size=1)
+        text = " ".join(segment.text.strip() for segment in segments).strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+class FakeBackend(RecognizerBackend):
+    """
+    Returns known transcripts for fixture audio files.
+    
+    Each ``name.wav`` in the fixture directory is paired with ``name.txt``.
+    Audio is matched by a fingerprint of its samples, so it works both with
+    files and with ``AudioData`` loaded from them.
+    """
+    
+    name = "fake"
+    
+    def __init__(self, fixtures_dir=FAKE_TRANSCRIPTS_DIR, seconds_per_audio_second=0.0):
+        """
+        Args:
+            fixtures_dir (str): Directory of WAV files with sidecar transcripts
+            seconds_per_audio_second (float): Simulated processing delay
+        """
+        self.fixtures_dir = fixtures_dir
+        self.seconds_per_audio_second = seconds_per_audio_second
+        self._transcripts = None
+    
+    def _load_transcripts(self):
+        """Fingerprint every fixture once."""
+        if self._transcripts is None:
+            self._transcripts = {}
+            if os.path.isdir(self.fixtures_dir):
+                for name in sorted(os.listdir(self.fixtures_dir)):
+                    base, ext = os.path.splitext(name)
+                    transcript_path = os.path.join(self.fixtures_dir, base + ".txt")
+                    if ext.lower() != ".wav" or not os.path.exists(transcript_path):
+                        continue
+                    audio = load_audio_file(os.path.join(self.fixtures_dir, name))
+                    with open(transcript_path, "r", encoding="utf-8") as f:
+                        self._transcripts[audio_fingerprint(audio)] = f.read().strip()
+        return self._transcripts
+    
+    def recognize(self, audio):
+        if self.seconds_per_audio_second:
+            time.sleep(audio_duration(audio) * self.seconds_per_audio_second)
+        text = self._load_transcripts().get(audio_fingerprint(audio))
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+BACKENDS = {
+    GoogleBackend.name: GoogleBackend,
+    SphinxBackend.name: SphinxBackend,
+    VoskBackend.name: VoskBackend,
+    WhisperBackend.name: WhisperBackend,
+    FakeBackend.name: FakeBackend,
+}
+
+
+def create_backend(name=VOICE_RECOGNIZER_BACKEND, recognizer=None):
+    """
+    Build a recognizer backend by name.
+    
+    Args:
+        name (str): One of ``BACKENDS``
+        recognizer (sr.Recognizer or None): Shared recognizer for backends built on it
+        
+    Returns:
+        RecognizerBackend: Backend instance
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown speech backend '{name}'. Choose from: {', '.join(BACKENDS)}")
+    backend_class = BACKENDS[name]
+    if backend_class in (GoogleBackend, SphinxBackend):
+        return backend_class(recognizer)
+    return backend_class()
+
+
+def load_audio_file(path):
+    """Read an audio file into ``sr.AudioData``."""
+    with sr.AudioFile(path) as source:
+        return sr.Recognizer().record(source)
+
+
+def audio_fingerprint(audio):
+    """Hash of the raw samples, used to match fixture audio."""
+    return hashlib.sha1(audio.get_raw_data()).hexdigest()
+
+
+def audio_duration(audio):
+    """Length of ``sr.AudioData`` in seconds."""
+    return len(audio.frame_data) / float(audio.sample_rate * audio.sample_width)
@@ -0,0 +1,268 @@
+"""
+Batch transcription of recorded audio through the voice command path.
+
+Files are read in blocks, recognized across a worker pool and answered by
+the chatbot in input order, with one JSON line per file:
+
+    python -m modules.transcription recordings/ --backend vosk -o results.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+import speech_recognition as sr
+from config.settings import (
+    VOICE_RECOGNIZER_BACKEND, TRANSCRIBE_WORKERS, TRANSCRIBE_READ_SECONDS,
+    TRANSCRIBE_SEGMENT_SECONDS, TRANSCRIBE_EXTENSIONS
+)
+from core.chatbot import Chatbot
+from modules.speech_backends import BACKENDS, create_backend, load_audio_file, audio_duration
+from modules.vad import EnergyVAD
+
+
+def expand_paths(paths):
+    """
+    Collect audio files from files and directories.
+
+    Args:
+        paths (list): Files or directories (searched recursively)
+
+    Returns:
+        list: Audio file paths in sorted order per directory
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                files.extend(os.path.join(root, n) for n in sorted(names)
+                             if n.lower().endswith(TRANSCRIBE_EXTENSIONS))
+        else:
+            files.append(path)
+    return files
+
+
+def wav_duration(path):
+    """
+    Length of a WAV file from its header, silence included.
+
+    Returns:
+        float or None: Seconds, or None for other formats
+    """
+    if not path.lower().endswith(".wav"):
+        return None
+    with wave.open(path, "rb") as f:
+        return f.getnframes() / float(f.getframerate())
+
+
+def iter_audio_segments(path, segment_seconds=TRANSCRIBE_SEGMENT_SECONDS, read_seconds=TRANSCRIBE_READ_SECONDS):
+    """
+    Read an audio file as recognizer-sized pieces.
+
+    Short 16-bit mono WAV files come back whole. Longer ones are read block
+    by block and cut at pauses, so memory stays bounded by one segment.
+    Other formats are decoded by ``speech_recognition`` in one piece.
+
+    Args:
+        path (str): Audio file
+        segment_seconds (float): Longest piece handed to the recognizer
+        read_seconds (float): Size of each read from disk
+
+    Yields:
+        sr.AudioData: Audio pieces in file order
+    """
+    if path.lower().endswith(".wav"):
+        with wave.open(path, "rb") as f:
+            native = f.getnchannels() == 1 and f.getsampwidth() == 2
+    else:
+        native = False
+    if not native:
+        # Let speech_recognition handle other formats, down-mixing and sample conversion
+        yield load_audio_file(path)
+        return
+
+    with wave.open(path, "rb") as f:
+        rate, width = f.getframerate(), f.getsampwidth()
+        block = max(1, int(rate * read_seconds))
+        if f.getnframes() <= rate * segment_seconds:
+            data = bytearray()
+            chunk = f.readframes(block)
+            while chunk:
+                data += chunk
+                chunk = f.readframes(block)
+            yield sr.AudioData(bytes(data), rate, width)
+            return
+
+        vad = EnergyVAD(rate, width, max_speech_s=segment_seconds)
+        frame_bytes = vad.frame_bytes
+        pending = b""
+        chunk = f.readframes(block)
+        while chunk:
+            pending += chunk
+            usable = len(pending) - len(pending) % frame_bytes
+            for offset in range(0, usable, frame_bytes):
+                utterance = vad.process(pending[offset:offset + frame_bytes])
+                if utterance:
+                    yield sr.AudioData(utterance, rate, width)
+            pending = pending[usable:]
+            chunk = f.readframes(block)
+        if pending:
+            vad.process(pending)
+        utterance = vad.flush()
+        if utterance:
+            yield sr.AudioData(utterance, rate, width)
+
+
+class BatchTranscriber:
+    """Transcribes audio files in parallel and answers them like voice commands."""
+
+    def __init__(self, backend=None, chatbot=None, workers=TRANSCRIBE_WORKERS,
+                 segment_seconds=TRANSCRIBE_SEGMENT_SECONDS, respond=True):
+        """
+        Args:
+            backend (RecognizerBackend or None): Speech engine (default from settings)
+            chatbot (Chatbot or None): Chatbot answering each transcript; a
+                fresh in-memory one is used when omitted
+            workers (int): Files recognized concurrently
+            segment_seconds (float): Longest piece handed to the recognizer
+            respond (bool): Run transcripts through the chatbot
+        """
+        self.backend = backend or create_backend()
+        if chatbot is None and respond:
+            chatbot = Chatbot(data_dir=None)
+        self.chatbot = chatbot
+        self.workers = max(1, workers)
+        self.segment_seconds = segment_seconds
+        self.respond = respond
+
+    def transcribe_file(self, path):
+        """
+        Recognize one file (safe to call from worker threads).
+
+        Returns:
+            dict: Transcript, audio length ('duration_s' for the whole file,
+                'speech_s' for the segments recognized), timings and any error
+        """
+        record = {"file": path, "duration_s": 0.0, "speech_s": 0.0, "segments": 0, "text": "", "error": None}
+        texts = []
+        recognize_time = 0.0
+        duration = None
+        start = time.perf_counter()
+        try:
+            duration = wav_duration(path)
+            for audio in iter_audio_segments(path, self.segment_seconds):
+                record["speech_s"] += audio_duration(audio)
+                record["segments"] += 1
+                t = time.perf_counter()
+                try:
+                    texts.append(self.backend.recognize(audio))
+                except sr.UnknownValueError:
+                    pass
+                finally:
+                    recognize_time += time.perf_counter() - t
+        except sr.RequestError as e:
+            record["error"] = f"Speech service error: {e}"
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+        total = time.perf_counter() - start
+
+        record["text"] = " ".join(t.strip() for t in texts if t and t.strip())
+        if not record["text"] and record["error"] is None:
+            record["error"] = "No speech recognized"
+        # Other formats are decoded whole, so their one segment is the whole file
+        record["duration_s"] = round(duration if duration is not None else record["speech_s"], 3)
+        record["speech_s"] = round(record["speech_s"], 3)
+        record["load_ms"] = round((total - recognize_time) * 1000, 2)
+        record["recognize_ms"] = round(recognize_time * 1000, 2)
+        # Relative to the input length: skipping silence is part of what is measured
+        record["rtf"] = round(total / record["duration_s"], 4) if record["duration_s"] else None
+        return record
+
+    def iter_results(self, paths):
+        """
+        Transcribe files concurrently and answer them in input order.
+
+        Responses are generated on the calling thread, one file at a time,
+        so commands such as "add task" apply in the order they were recorded.
+
+        Args:
+            paths (list): Audio files or directories
+
+        Yields:
+            dict: One record per file, in input order
+        """
+        files = expand_paths(paths)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="transcribe") as pool:
+            for record in pool.map(self.transcribe_file, files):
+                record["response"] = None
+                record["respond_ms"] = 0.0
+                if self.respond and record["text"]:
+                    t = time.perf_counter()
+                    record["response"] = self.chatbot.get_response(record["text"])
+                    record["respond_ms"] = round((time.perf_counter() - t) * 1000, 2)
+                yield record
+
+    def run(self, paths, output=None):
+        """
+        Transcribe files and write JSON lines as each result is ready.
+
+        Args:
+            paths (list): Audio files or directories
+            output (file or None): Writable text stream for JSONL records
+
+        Returns:
+            dict: Totals and throughput for the batch
+        """
+        start = time.perf_counter()
+        summary = {"files": 0, "failed": 0, "audio_seconds": 0.0, "speech_seconds": 0.0, "recognize_seconds": 0.0}
+        for record in self.iter_results(paths):
+            summary["files"] += 1
+            summary["failed"] += record["error"] is not None
+            summary["audio_seconds"] += record["duration_s"]
+            summary["speech_seconds"] += record["speech_s"]
+            summary["recognize_seconds"] += record["recognize_ms"] / 1000
+            if output is not None:
+                output.write(json.dumps(record, ensure_ascii=False) + "\n")
+                output.flush()
+
+        wall = time.perf_counter() - start
+        summary["wall_seconds"] = wall
+        summary["files_per_second"] = summary["files"] / wall if wall else 0.0
+        summary["real_time_factor"] = wall / summary["audio_seconds"] if summary["audio_seconds"] else None
+        return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcribe recorded voice commands and answer them offline")
+    parser.add_argument("paths", nargs="+", help="Audio files or directories")
+    parser.add_argument("-o", "--output", default="-", help="JSONL output file ('-' for stdout)")
+    parser.add_argument("--backend", default=VOICE_RECOGNIZER_BACKEND, choices=sorted(BACKENDS))
+    parser.add_argument("--workers", type=int, default=TRANSCRIBE_WORKERS, help="Files recognized concurrently")
+    parser.add_argument("--no-respond", action="store_true", help="Only transcribe; skip chatbot responses")
+    parser.add_argument("--data-dir", default=None,
+                        help="Persist chatbot state (tasks, memory) here instead of keeping it in memory")
+    args = parser.parse_args()
+
+    chatbot = Chatbot(data_dir=args.data_dir) if args.data_dir and not args.no_respond else None
+    transcriber = BatchTranscriber(create_backend(args.backend), chatbot=chatbot,
+                                   workers=args.workers, respond=not args.no_respond)
+
+    if args.output == "-":
+        summary = transcriber.run(args.paths, sys.stdout)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            summary = transcriber.run(args.paths, f)
+
+    rtf = f"{summary['real_time_factor']:.3f}" if summary["real_time_factor"] is not None else "-"
+    print(f"\n✅ {summary['files']} files ({summary['failed']} failed), "
+          f"{summary['audio_seconds']:.1f}s audio ({summary['speech_seconds']:.1f}s speech) "
+          f"in {summary['wall_seconds']:.2f}s "
+          f"({summary['files_per_second']:.1f} files/s, RTF {rtf})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Voice activity detection on raw PCM frames, shared by live and file input.
+"""
+
+import math
+from array import array
+from collections import deque
+from config.settings import (
+    VOICE_PHRASE_TIME_LIMIT, VOICE_VAD_FRAME_MS, VOICE_VAD_SILENCE_MS, VOICE_VAD_PREROLL_MS,
+    VOICE_VAD_MIN_SPEECH_MS, VOICE_VAD_ENERGY_RATIO, VOICE_VAD_MIN_ENERGY
+)
+
+try:
+    import audioop
+except ImportError:  # removed from the standard library in Python 3.13
+    audioop = None
+
+
+def frame_energy(frame, sample_width):
+    """Root-mean-square energy of a PCM frame."""
+    if audioop is not None:
+        return audioop.rms(frame, sample_width)
+    samples = array("h", frame[:len(frame) - len(frame) % 2]) if sample_width == 2 else array("b", frame)
+    if not samples:
+        return 0
+    return int(math.sqrt(sum(x * x for x in samples) / len(samples)))
+
+
+class EnergyVAD:
+    """
+    Energy-based voice activity detector over fixed-size PCM frames.
+    
+    Tracks the background noise floor while nobody is talking, keeps a short
+    ring buffer of pre-speech audio so word onsets are not clipped, and
+    emits an utterance as soon as enough trailing silence is seen.
+    """
+    
+    def __init__(self, sample_rate, sample_width, frame_ms=VOICE_VAD_FRAME_MS,
+                 silence_ms=VOICE_VAD_SILENCE_MS, preroll_ms=VOICE_VAD_PREROLL_MS,
+                 min_speech_ms=VOICE_VAD_MIN_SPEECH_MS, max_speech_s=VOICE_PHRASE_TIME_LIMIT,
+                 energy_ratio=VOICE_VAD_ENERGY_RATIO, min_energy=VOICE_VAD_MIN_ENERGY):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.frame_bytes = int(sample_rate * frame_ms / 1000) * sample_width
+        self.energy_ratio = energy_ratio
+        self.min_energy = min_energy
+        self.noise_floor = None
+        self._silence_frames = max(1, silence_ms // frame_ms)
+        self._min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self._max_frames = int(max_speech_s * 1000 // frame_ms)
+        self._preroll = deque(maxlen=max(1, preroll_ms // frame_ms))
+        self._speech = None
+        self._voiced = 0
+        self._trailing_silence = 0
+    
+    def calibrate(self, frames):
+        """Set the noise floor from frames of background audio."""
+        energies = [frame_energy(f, self.sample_width) for f in frames]
+        if energies:
+            self.noise_floor = sum(energies) / len(energies)
+    
+    def threshold(self):
+        """Current energy level that counts as speech."""
+        return max(self.min_energy, (self.noise_floor or 0) * self.energy_ratio)
+    
+    def process(self, frame):
+        """
+        Feed one frame.
+        
+        Args:
+            frame (bytes): ``frame_bytes`` of PCM audio
+            
+        Returns:
+            bytes or None: Raw audio of a finished utterance, if one just ended
+        """
+        energy = frame_energy(frame, self.sample_width)
+        is_speech = energy > self.threshold()
+        
+        if self._speech is None:
+            if is_speech:
+                self._speech = list(self._preroll)
+                self._speech.append(frame)
+                self._voiced = 1
+                self._trailing_silence = 0
+                self._preroll.clear()
+            else:
+                # Slowly follow changes in background noise
+                self.noise_floor = energy if self.noise_floor is None else 0.95 * self.noise_floor + 0.05 * energy
+                self._preroll.append(frame)
+            return None
+        
+        self._speech.append(frame)
+        if is_speech:
+            self._voiced += 1
+            self._trailing_silence = 0
+        else:
+            self._trailing_silence += 1
+        
+        if self._trailing_silence >= self._silence_frames or len(self._speech) >= self._max_frames:
+            return self._finish()
+        return None
+    
+    def flush(self):
+        """
+        End of input: close any utterance still in progress.
+        
+        Returns:
+            bytes or None: Raw audio of the last utterance
+        """
+        if self._speech is None:
+            return None
+        return self._finish()
+    
+    def _finish(self):
+        """Close the current utterance; drop it if it was only a click."""
+        speech, voiced = self._speech, self._voiced
+        self._speech = None
+        self._voiced = 0
+        self._trailing_silence = 0
+        if voiced < self._min_speech_frames:
+            return None
+        return b"".join(speech)
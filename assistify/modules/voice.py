@@ -5,7 +5,134 @@ Voice input and output functionality - Simplified and Fixed.
 import pyttsx3
 import speech_recognition as sr
 import threading
-from config.settings import VOICE_RATE, VOICE_VOLUME, VOICE_TIMEOUT, VOICE_PHRASE_TIME_LIMIT
+import queue
+from collections import deque
+from config.settings import (
+    VOICE_RATE, VOICE_VOLUME, VOICE_TIMEOUT, VOICE_PHRASE_TIME_LIMIT, VOICE_QUEUE_SIZE,
+    VOICE_STREAM_MAX_SENTENCES, VOICE_CALIBRATION_SECONDS, VOICE_VAD_FRAME_MS
+)
+from utils.tokenizer import SentenceSplitter
+from modules.speech_backends import create_backend
+from modules.vad import EnergyVAD
+from utils.profiling import span
+
+
+class SpeechWorker:
+    """Single long-lived speech thread that owns one pyttsx3 engine."""
+    
+    def __init__(self, rate=VOICE_RATE, volume=VOICE_VOLUME, max_queue=VOICE_QUEUE_SIZE):
+        """
+        Args:
+            rate (int): Speech rate in words per minute
+            volume (float): Volume between 0.0 and 1.0
+            max_queue (int): Pending sentences kept; the oldest are dropped when full
+        """
+        self.rate = rate
+        self.volume = volume
+        self._pending = deque(maxlen=max_queue)
+        self._cond = threading.Condition()
+        self._engine = None
+        self._thread = None
+        self._next_id = 0
+        self._speaking_id = None
+        self._interrupt = threading.Event()
+    
+    def begin(self):
+        """
+        Start a new utterance. Anything still queued from older utterances is
+        stale and gets dropped, and the utterance being spoken is interrupted.
+        
+        Returns:
+            int: ID to pass to ``say`` for each piece of the utterance
+        """
+        with self._cond:
+            self._next_id += 1
+            self._pending.clear()
+            if self._speaking_id is not None:
+                self._interrupt.set()
+            return self._next_id
+    
+    def say(self, text, utterance_id=None):
+        """
+        Queue text to speak.
+        
+        Args:
+            text (str): Text to speak
+            utterance_id (int or None): Utterance from ``begin`` to append to,
+                or None to start a new utterance
+            
+        Returns:
+            int: ID of the utterance the text was queued under
+        """
+        if utterance_id is None:
+            utterance_id = self.begin()
+        with self._cond:
+            if utterance_id != self._next_id:
+                # Superseded by a newer utterance
+                return utterance_id
+            self._pending.append((utterance_id, text))
+            self._ensure_thread()
+            self._cond.notify()
+        return utterance_id
+    
+    def stop(self):
+        """Stop speaking and discard everything queued."""
+        with self._cond:
+            self._pending.clear()
+            if self._speaking_id is not None:
+                self._interrupt.set()
+    
+    def is_busy(self):
+        """Check whether speech is playing or queued."""
+        with self._cond:
+            return self._speaking_id is not None or bool(self._pending)
+    
+    def _ensure_thread(self):
+        """Start the worker thread on first use (called with the lock held)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="speech-worker", daemon=True)
+            self._thread.start()
+    
+    def _next_text(self):
+        """Block for the next text to speak, coalescing stale utterances."""
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            newest_id = self._pending[-1][0]
+            # Older utterances were superseded while waiting; merge what is left
+            texts = [text for utterance_id, text in self._pending if utterance_id == newest_id]
+            self._pending.clear()
+            self._speaking_id = newest_id
+            self._interrupt.clear()
+            return " ".join(texts)
+    
+    def _run(self):
+        """Worker loop: initialize the engine once, then speak queued text."""
+        try:
+            self._engine = pyttsx3.init()
+            self._engine.setProperty("rate", self.rate)
+            self._engine.setProperty("volume", self.volume)
+            self._engine.connect("started-word", self._on_word)
+        except Exception as e:
+            print(f"❌ Text-to-speech error: {e}")
+            return
+        
+        while True:
+            text = self._next_text()
+            try:
+                with span("tts.say", chars=len(text)):
+                    self._engine.say(text)
+                    self._engine.runAndWait()
+            except Exception as e:
+                print(f"❌ Text-to-speech error: {e}")
+            finally:
+                with self._cond:
+                    self._speaking_id = None
+    
+    def _on_word(self, name, location, length):
+        """Engine callback used to cut speech short when interrupted."""
+        if self._interrupt.is_set():
+            self._engine.stop()
 
 
 class TextToSpeech:
@@ -13,6 +140,7 @@ class TextToSpeech:
     
     def __init__(self):
         self.enabled = True
+        self.worker = SpeechWorker()
     
     def speak(self, text):
         """
@@ -22,22 +150,54 @@ class TextToSpeech:
             text (str): Text to speak
         """
         if self.enabled and text and len(text.strip()) > 0:
-            def run_speech():
-                try:
-                    engine = pyttsx3.init()
-                    engine.setProperty("rate", VOICE_RATE)
-                    engine.setProperty("volume", VOICE_VOLUME)
-                    engine.say(text)
-                    engine.runAndWait()
-                except Exception as e:
-                    print(f"❌ Text-to-speech error: {e}")
+            self.worker.say(text)
+    
+    def speak_stream(self, chunks, text_of=None, max_sentences=VOICE_STREAM_MAX_SENTENCES):
+        """
+        Speak streamed text sentence by sentence while passing it through.
+        
+        The first sentence is queued as soon as it is complete, so speech
+        starts before the rest of the text has been produced. Iterate the
+        returned generator to drive the stream.
+        
+        Args:
+            chunks (iterable): Items produced by a search or summarizer
+            text_of (callable or None): Maps an item to the text to speak
+                (None to skip it); items are spoken as-is by default
+            max_sentences (int or None): Stop speaking after this many sentences
             
-            thread = threading.Thread(target=run_speech, daemon=True)
-            thread.start()
+        Yields:
+            Each item of ``chunks`` unchanged
+        """
+        if not self.enabled:
+            yield from chunks
+            return
+        
+        utterance_id = self.worker.begin()
+        splitter = SentenceSplitter()
+        spoken = 0
+        for item in chunks:
+            text = text_of(item) if text_of else item
+            if text and (max_sentences is None or spoken < max_sentences):
+                for sentence in splitter.feed(text):
+                    if max_sentences is not None and spoken >= max_sentences:
+                        break
+                    self.worker.say(sentence, utterance_id)
+                    spoken += 1
+            yield item
+        rest = splitter.flush()
+        if rest and (max_sentences is None or spoken < max_sentences):
+            self.worker.say(rest, utterance_id)
+    
+    def stop(self):
+        """Interrupt current speech and drop queued utterances."""
+        self.worker.stop()
     
     def toggle(self):
         """Toggle voice on/off."""
         self.enabled = not self.enabled
+        if not self.enabled:
+            self.worker.stop()
         return self.enabled
     
     def is_enabled(self):
@@ -48,9 +208,17 @@ class TextToSpeech:
 class SpeechRecognition:
     """Handles speech-to-text conversion - Simple and Reliable."""
     
-    def __init__(self):
+    def __init__(self, backend=None):
+        """
+        Args:
+            backend (RecognizerBackend or None): Speech-to-text engine; defaults
+                to ``VOICE_RECOGNIZER_BACKEND``
+        """
         self.recognizer = sr.Recognizer()
         self.recognizer.energy_threshold = 4000
+        self.recognizer.dynamic_energy_threshold = True
+        self.backend = backend or create_backend(recognizer=self.recognizer)
+        self._calibrated = False
     
     def listen(self, timeout=VOICE_TIMEOUT, phrase_time_limit=VOICE_PHRASE_TIME_LIMIT):
         """
@@ -65,18 +233,23 @@ class SpeechRecognition:
         """
         try:
             with sr.Microphone() as source:
+                if not self._calibrated:
+                    # Measure the room once instead of relying on the fixed threshold
+                    self.recognizer.adjust_for_ambient_noise(source, duration=VOICE_CALIBRATION_SECONDS)
+                    self._calibrated = True
                 print("🎙 Listening... Speak now!")
                 
                 # Listen with timeout
-                audio = self.recognizer.listen(
-                    source, 
-                    timeout=timeout, 
-                    phrase_time_limit=phrase_time_limit
-                )
+                with span("stt.capture"):
+                    audio = self.recognizer.listen(
+                        source, 
+                        timeout=timeout, 
+                        phrase_time_limit=phrase_time_limit
+                    )
             
-            # Recognize speech using Google API
-            print("🎙 Processing...")
-            command = self.recognizer.recognize_google(audio, language='en-US')
+            print(f"🎙 Processing ({self.backend.name})...")
+            with span("stt.recognize", backend=self.backend.name):
+                command = self.backend.recognize(audio)
             print(f"✅ You said: {command}")
             return command
             
@@ -94,6 +267,100 @@ class SpeechRecognition:
             return None
 
 
+class ContinuousListener:
+    """Keeps the microphone open and recognizes each utterance as soon as it ends."""
+    
+    def __init__(self, backend, on_text, is_muted=None):
+        """
+        Args:
+            backend (RecognizerBackend): Speech-to-text engine
+            on_text (callable): Called with each recognized phrase (on a worker thread)
+            is_muted (callable or None): Returns True while input should be
+                ignored, e.g. while the assistant itself is speaking
+        """
+        self.backend = backend
+        self.on_text = on_text
+        self.is_muted = is_muted or (lambda: False)
+        self._running = threading.Event()
+        self._utterances = queue.Queue(maxsize=4)
+        self._threads = []
+    
+    def start(self):
+        """Open the microphone and start capturing in the background."""
+        if self._running.is_set():
+            return
+        self._running.set()
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name="voice-capture", daemon=True),
+            threading.Thread(target=self._recognize_loop, name="voice-recognize", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    def stop(self):
+        """Stop capturing; the microphone is released by the capture thread."""
+        self._running.clear()
+        try:
+            self._utterances.put_nowait(None)
+        except queue.Full:
+            pass
+    
+    def is_running(self):
+        """Check whether continuous capture is active."""
+        return self._running.is_set()
+    
+    def _capture_loop(self):
+        """Read frames from the open stream and run them through the VAD."""
+        try:
+            frame_samples = 16000 * VOICE_VAD_FRAME_MS // 1000
+            with sr.Microphone(sample_rate=16000, chunk_size=frame_samples) as source:
+                vad = EnergyVAD(source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+                calibration_frames = int(VOICE_CALIBRATION_SECONDS * 1000 // VOICE_VAD_FRAME_MS)
+                vad.calibrate([source.stream.read(frame_samples) for _ in range(calibration_frames)])
+                print("🎙 Hands-free listening started")
+                
+                while self._running.is_set():
+                    frame = source.stream.read(frame_samples)
+                    if self.is_muted():
+                        continue
+                    utterance = vad.process(frame)
+                    if utterance:
+                        audio = sr.AudioData(utterance, source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+                        try:
+                            self._utterances.put_nowait(audio)
+                        except queue.Full:
+                            print("❌ Recognition is falling behind; dropped an utterance")
+        except Exception as e:
+            print(f"❌ Microphone error: {e}")
+        finally:
+            self._running.clear()
+            try:
+                self._utterances.put_nowait(None)
+            except queue.Full:
+                pass
+    
+    def _recognize_loop(self):
+        """Recognize finished utterances while capture continues."""
+        while True:
+            audio = self._utterances.get()
+            if audio is None:
+                if not self._running.is_set():
+                    return
+                continue
+            try:
+                with span("stt.recognize", backend=self.backend.name, mode="continuous"):
+                    text = self.backend.recognize(audio)
+            except sr.UnknownValueError:
+                continue
+            except sr.RequestError as e:
+                print(f"❌ Speech service error: {e}")
+                continue
+            except Exception as e:
+                print(f"❌ Error: {e}")
+                continue
+            if text and text.strip():
+                print(f"✅ You said: {text}")
+                self.on_text(text)
 
 
 class VoiceManager:
@@ -103,12 +370,21 @@ class VoiceManager:
         self.tts = TextToSpeech()
         self.stt = SpeechRecognition()
         self.is_listening = False
+        self.continuous = None
     
     def speak(self, text):
         """Speak text."""
         if text and len(text.strip()) > 0:
             self.tts.speak(text)
     
+    def speak_stream(self, chunks, text_of=None):
+        """Speak streamed text sentence by sentence; yields the items through."""
+        return self.tts.speak_stream(chunks, text_of)
+    
+    def stop_speaking(self):
+        """Interrupt speech, e.g. when the user starts a new input."""
+        self.tts.stop()
+    
     def listen(self):
         """Listen to user."""
         if self.is_listening:
@@ -121,6 +397,28 @@ class VoiceManager:
         finally:
             self.is_listening = False
     
+    def start_continuous(self, on_text):
+        """
+        Start hands-free listening.
+        
+        Args:
+            on_text (callable): Called with each recognized phrase
+        """
+        if self.continuous and self.continuous.is_running():
+            return
+        self.continuous = ContinuousListener(self.stt.backend, on_text, is_muted=self.tts.worker.is_busy)
+        self.continuous.start()
+    
+    def stop_continuous(self):
+        """Stop hands-free listening."""
+        if self.continuous:
+            self.continuous.stop()
+            self.continuous = None
+    
+    def is_continuous(self):
+        """Check if hands-free listening is active."""
+        return bool(self.continuous and self.continuous.is_running())
+    
     def toggle_voice(self):
         """Toggle voice output."""
         return self.tts.toggle()
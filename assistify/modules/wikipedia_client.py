@@ -0,0 +1,204 @@
+"""
+Lean MediaWiki API client for Wikipedia summaries.
+
+One request searches, follows redirects and fetches the intro extract and
+disambiguation flag of the top candidates; only when the best hit is a
+disambiguation page does a second request fetch its links as options.
+Resolved titles and summaries are cached, so repeated questions need no
+request.
+"""
+
+import requests
+from config.settings import (
+    USER_AGENT, SEARCH_TIMEOUT, WIKIPEDIA_API_URL, WIKIPEDIA_SENTENCES,
+    WIKIPEDIA_SEARCH_CANDIDATES, WIKIPEDIA_CACHE_SIZE, WIKIPEDIA_CACHE_TTL
+)
+from utils.cache import LRUCache
+
+MAX_OPTIONS = 5
+
+
+class WikipediaClient:
+    """
+    Wikipedia summaries in one API request (two for disambiguation pages).
+
+    The request parameters and response handling are separate from the
+    transport so ``AsyncWikipediaSearch`` shares them and the caches.
+    """
+
+    def __init__(self, api_url=WIKIPEDIA_API_URL, cache_size=WIKIPEDIA_CACHE_SIZE,
+                 cache_ttl=WIKIPEDIA_CACHE_TTL, timeout=SEARCH_TIMEOUT):
+        """
+        Args:
+            api_url (str): MediaWiki ``api.php`` endpoint
+            cache_size (int): Summaries (and resolved queries) kept
+            cache_ttl (float or None): Seconds before cached entries expire
+            timeout (float): Request timeout in seconds
+        """
+        self.api_url = api_url
+        self.timeout = timeout
+        self.summaries = LRUCache(cache_size, cache_ttl)      # (title, sentences) -> page
+        self.titles = LRUCache(cache_size * 4, cache_ttl)     # query or redirect -> title
+        self.requests_made = 0
+        self._session = None
+
+    @staticmethod
+    def _key(text):
+        """Cache key for a query or title (case and spacing insensitive)."""
+        return " ".join(text.replace("_", " ").split()).lower()
+
+    def query_params(self, query, sentences=WIKIPEDIA_SENTENCES):
+        """
+        Parameters of the combined search + extract request.
+
+        Args:
+            query (str): Search query
+            sentences (int): Sentences of the intro to return
+
+        Returns:
+            dict: Query string parameters
+        """
+        return {
+            "action": "query", "format": "json", "formatversion": "2", "redirects": "1",
+            "generator": "search", "gsrsearch": query, "gsrlimit": str(WIKIPEDIA_SEARCH_CANDIDATES),
+            "prop": "extracts|pageprops", "ppprop": "disambiguation",
+            "exintro": "1", "explaintext": "1", "exsentences": str(sentences), "exlimit": "max",
+        }
+
+    @staticmethod
+    def disambiguation_title(data):
+        """
+        Title of the best hit in a ``query_params`` response if it is a disambiguation page.
+
+        Returns:
+            str or None: Title whose links should be fetched with ``links_params``
+        """
+        pages = data.get("query", {}).get("pages", [])
+        if not pages:
+            return None
+        best = min(pages, key=lambda p: p.get("index", 0))
+        return best["title"] if "disambiguation" in best.get("pageprops", {}) else None
+
+    @staticmethod
+    def links_params(title):
+        """
+        Parameters of the follow-up request for a disambiguation page's options.
+
+        Args:
+            title (str): Disambiguation page
+
+        Returns:
+            dict: Query string parameters
+        """
+        return {
+            "action": "query", "format": "json", "formatversion": "2", "titles": title,
+            "prop": "links", "plnamespace": "0", "pllimit": str(MAX_OPTIONS),
+        }
+
+    def cached(self, query, sentences=WIKIPEDIA_SENTENCES):
+        """
+        Summary message for a query answered before, without a request.
+
+        Returns:
+            str or None: Message, or None on a cache miss
+        """
+        title = self.titles.get(self._key(query))
+        if title is None:
+            return None
+        page = self.summaries.get((title, sentences))
+        return self.format(page) if page is not None else None
+
+    def title_for(self, query):
+        """
+        Article a query was resolved to.
+
+        Returns:
+            str or None: Title, or None if the query has not been answered yet
+        """
+        return self.titles.get(self._key(query))
+
+    def store(self, query, sentences, data, links_data=None):
+        """
+        Pick the answer from an API response and cache it.
+
+        Args:
+            query (str): The query the response is for
+            sentences (int): Sentences requested
+            data (dict): Decoded ``query_params`` response
+            links_data (dict or None): Decoded ``links_params`` response when the
+                best hit is a disambiguation page
+
+        Returns:
+            str: Summary, disambiguation options or not-found message
+        """
+        result = data.get("query", {})
+        pages = sorted(result.get("pages", []), key=lambda p: p.get("index", 0))
+        if not pages:
+            return "❌ Wikipedia: No page found."
+
+        best = pages[0]
+        page = {"title": best["title"], "extract": best.get("extract", "")}
+        if "disambiguation" in best.get("pageprops", {}):
+            linked = (links_data or {}).get("query", {}).get("pages", [])
+            options = [link["title"] for link in linked[0].get("links", [])] if linked else []
+            # Without links (failed follow-up) the other search hits are a fair fallback
+            options = options or [p["title"] for p in pages[1:]]
+            page["options"] = options[:MAX_OPTIONS]
+
+        self.summaries.set((page["title"], sentences), page)
+        self.titles.set(self._key(query), page["title"])
+        self.titles.set(self._key(page["title"]), page["title"])
+        for redirect in result.get("redirects", []):
+            self.titles.set(self._key(redirect["from"]), redirect["to"])
+        return self.format(page)
+
+    @staticmethod
+    def format(page):
+        """Message shown for a cached or fetched page."""
+        if "options" in page:
+            options = '\n- '.join(page["options"]) or page["title"]
+            return f"❓ Wikipedia ambiguous. Try being more specific. Some options:\n- {options}"
+        return page["extract"] or "❌ Wikipedia: No page found."
+
+    def get_summary(self, query, sentences=WIKIPEDIA_SENTENCES):
+        """
+        Get the intro of the best matching article.
+
+        Args:
+            query (str): Search query
+            sentences (int): Sentences of the intro to return
+
+        Returns:
+            str: Summary or error message
+        """
+        message = self.cached(query, sentences)
+        if message is not None:
+            return message
+        if self._session is None:
+            self._session = requests.Session()
+            self._session.headers["User-Agent"] = USER_AGENT
+        try:
+            self.requests_made += 1
+            response = self._session.get(self.api_url, params=self.query_params(query, sentences),
+                                         timeout=self.timeout)
+            if response.status_code != 200:
+                return f"❌ Wikipedia error: HTTP {response.status_code}"
+            data = response.json()
+        except Exception as e:
+            return f"❌ Wikipedia error: {e}"
+        title = self.disambiguation_title(data)
+        return self.store(query, sentences, data, self._get_links(title) if title else None)
+
+    def _get_links(self, title):
+        """Links of a disambiguation page, or None if the request fails."""
+        try:
+            self.requests_made += 1
+            response = self._session.get(self.api_url, params=self.links_params(title), timeout=self.timeout)
+            return response.json() if response.status_code == 200 else None
+        except Exception:
+            return None
+
+    def clear_cache(self):
+        """Forget cached summaries and resolved titles."""
+        self.summaries.clear()
+        self.titles.clear()
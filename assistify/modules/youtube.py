@@ -0,0 +1,163 @@
+"""
+YouTube results extraction from the page's embedded ``ytInitialData`` JSON.
+
+The scanner is fed the page as it downloads, decodes only the
+``videoRenderer`` objects it needs and reports when it has enough, so the
+rest of the (several hundred KB) page is never read.
+"""
+
+import codecs
+import json
+from urllib.parse import quote_plus
+
+INITIAL_DATA_MARKER = "ytInitialData"
+RENDERER_KEY = '"videoRenderer":'
+SCRIPT_END = "</script>"
+RESULTS_URL = "https://www.youtube.com/results?search_query={}"
+READ_CHUNK_SIZE = 16 * 1024
+
+_DECODER = json.JSONDecoder()
+
+
+def results_url(query):
+    """URL of the results page for a query."""
+    return RESULTS_URL.format(quote_plus(query))
+
+
+def _text(field):
+    """Text of a ``{"simpleText": ...}`` or ``{"runs": [...]}`` field."""
+    if not field:
+        return ""
+    if "simpleText" in field:
+        return field["simpleText"]
+    return "".join(run.get("text", "") for run in field.get("runs", []))
+
+
+def video_from_renderer(renderer):
+    """
+    Convert a ``videoRenderer`` object to a result dict.
+
+    Returns:
+        dict or None: 'title', 'url', 'id', 'duration', 'channel', 'views' and
+            'published', or None for entries without a video id
+    """
+    video_id = renderer.get("videoId")
+    if not video_id:
+        return None
+    return {
+        'title': _text(renderer.get("title")) or "No title",
+        'url': f"https://www.youtube.com/watch?v={video_id}",
+        'id': video_id,
+        'duration': _text(renderer.get("lengthText")) or None,  # None for live streams
+        'channel': _text(renderer.get("ownerText") or renderer.get("longBylineText")) or None,
+        'views': _text(renderer.get("viewCountText") or renderer.get("shortViewCountText")) or None,
+        'published': _text(renderer.get("publishedTimeText")) or None,
+    }
+
+
+class InitialDataScanner:
+    """
+    Incremental extractor of videos from a results page.
+
+    Feed it the page in pieces (bytes or text); ``feed`` returns True once
+    ``num`` videos were found or the ``ytInitialData`` script ended. Only
+    the object being decoded is kept in memory.
+    """
+
+    def __init__(self, num):
+        self.num = num
+        self.videos = []
+        self.done = False
+        self.bytes_read = 0
+        self._seen = set()
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._buf = ""
+        self._started = False
+        self._obj_start = None   # index of the '{' of the renderer being decoded
+
+    def feed(self, data):
+        """
+        Add the next piece of the page.
+
+        Args:
+            data (bytes or str): Page data
+
+        Returns:
+            bool: True when no more data is needed
+        """
+        if self.done:
+            return True
+        if isinstance(data, bytes):
+            self.bytes_read += len(data)
+            data = self._decoder.decode(data)
+        else:
+            self.bytes_read += len(data)
+        self._buf += data
+
+        if not self._started:
+            start = self._buf.find(INITIAL_DATA_MARKER)
+            if start == -1:
+                self._buf = self._buf[-len(INITIAL_DATA_MARKER):]
+                return False
+            self._started = True
+            self._buf = self._buf[start + len(INITIAL_DATA_MARKER):]
+
+        while not self.done:
+            if self._obj_start is None and not self._find_renderer():
+                break
+            if not self._scan_object():
+                break
+        return self.done
+
+    def _find_renderer(self):
+        """Move to the next ``videoRenderer`` object; False if more data is needed."""
+        key = self._buf.find(RENDERER_KEY)
+        end = self._buf.find(SCRIPT_END)
+        if end != -1 and (key == -1 or end < key):
+            self.done = True  # ytInitialData is over; fewer results than asked for
+            return False
+        if key == -1:
+            # Keep a tail in case the key or the script end is split across pieces
+            self._buf = self._buf[-max(len(RENDERER_KEY), len(SCRIPT_END)):]
+            return False
+        brace = self._buf.find("{", key + len(RENDERER_KEY))
+        if brace == -1:
+            self._buf = self._buf[key:]
+            return False
+        self._buf = self._buf[brace:]
+        self._obj_start = 0
+        return True
+
+    def _scan_object(self):
+        """Decode the current object; False if it has not fully arrived yet."""
+        try:
+            renderer, end = _DECODER.raw_decode(self._buf, self._obj_start)
+        except ValueError:
+            if self._buf.find(SCRIPT_END, self._obj_start) == -1:
+                return False  # cut off at the end of what has arrived
+            renderer, end = {}, self._obj_start + 1  # malformed; skip it
+        video = video_from_renderer(renderer) if isinstance(renderer, dict) else None
+        if video and video['id'] not in self._seen:
+            self._seen.add(video['id'])
+            self.videos.append(video)
+            if len(self.videos) >= self.num:
+                self.done = True
+        self._buf = self._buf[end:]
+        self._obj_start = None
+        return True
+
+
+def parse_results_page(html, num):
+    """
+    Extract videos from a complete results page.
+
+    Args:
+        html (str): Page source
+        num (int): Maximum videos
+
+    Returns:
+        list: Video dicts (see ``video_from_renderer``)
+    """
+    scanner = InitialDataScanner(num)
+    scanner.feed(html)
+    return scanner.videos
@@ -139,7 +139,7 @@ class InputArea:
 class ControlBar:
     """Manages bottom control bar."""
     
-    def __init__(self, parent, on_voice_toggle, on_listen):
+    def __init__(self, parent, on_voice_toggle, on_listen, on_continuous_toggle=None):
         self.frame = ctk.CTkFrame(parent, height=48)
         self.frame.pack(side="bottom", fill="x", padx=18, pady=10)
         
@@ -160,6 +160,26 @@ class ControlBar:
             fg_color=COLOR_BUTTON_VOICE_SPEAK
         )
         self.listen_btn.pack(side="right")
+        
+        self.continuous_btn = None
+        if on_continuous_toggle:
+            self.continuous_btn = ctk.CTkButton(
+                self.frame,
+                text="🎧 Hands-free: OFF",
+                width=150,
+                command=on_continuous_toggle,
+                fg_color=COLOR_BUTTON_VOICE_OFF
+            )
+            self.continuous_btn.pack(side="right", padx=8)
+    
+    def update_continuous_button(self, enabled):
+        """Update hands-free button state."""
+        if self.continuous_btn is None:
+            return
+        if enabled:
+            self.continuous_btn.configure(text="🎧 Hands-free: ON", fg_color=COLOR_BUTTON_VOICE_ON)
+        else:
+            self.continuous_btn.configure(text="🎧 Hands-free: OFF", fg_color=COLOR_BUTTON_VOICE_OFF)
     
     def update_voice_button(self, enabled):
         """Update voice button state."""
@@ -172,7 +192,8 @@ class ControlBar:
 class Sidebar:
     """Manages sidebar with navigation and options."""
     
-    def __init__(self, parent, on_new_chat, on_pdf_summarize, author_name):
+    def __init__(self, parent, on_new_chat, on_pdf_summarize, author_name, on_pdf_batch=None,
+                 summary_profiles=None, summary_profile=None, on_profile_change=None):
         self.frame = ctk.CTkFrame(parent, width=SIDEBAR_WIDTH)
         self.frame.pack(side="left", fill="y")
         
@@ -201,6 +222,13 @@ class Sidebar:
         # Buttons
         ctk.CTkButton(self.frame, text="＋ New Chat", anchor="w", command=on_new_chat).pack(fill="x", padx=12, pady=(12, 4))
         ctk.CTkButton(self.frame, text="🤖 AI PDF Summarize", anchor="w", command=on_pdf_summarize).pack(fill="x", padx=12)
+        if on_pdf_batch:
+            ctk.CTkButton(self.frame, text="📚 Batch Summarize PDFs", anchor="w", command=on_pdf_batch).pack(fill="x", padx=12, pady=(4, 0))
+        if summary_profiles and on_profile_change:
+            ctk.CTkLabel(self.frame, text="Summary profile", anchor="w").pack(fill="x", padx=14, pady=(8, 0))
+            self.profile_menu = ctk.CTkOptionMenu(self.frame, values=list(summary_profiles), command=on_profile_change)
+            self.profile_menu.set(summary_profile or summary_profiles[0])
+            self.profile_menu.pack(fill="x", padx=12)
         
         # Chat history
         chat_list_frame = ctk.CTkFrame(self.frame)
@@ -221,6 +249,52 @@ class Sidebar:
         ctk.CTkLabel(bottom_info, text=author_name, anchor="w").pack(side="left", padx=8, pady=8)
 
 
+class ProgressIndicator:
+    """Status line with a progress bar, shown only while a long task runs."""
+    
+    def __init__(self, parent, before=None):
+        """
+        Args:
+            parent: Container to show the indicator in
+            before: Widget the indicator is packed above when shown
+        """
+        self.before = before
+        self.frame = ctk.CTkFrame(parent, fg_color="transparent")
+        self.label = ctk.CTkLabel(self.frame, text="", anchor="w")
+        self.label.pack(fill="x")
+        self.bar = ctk.CTkProgressBar(self.frame, width=600)
+        self.bar.pack(fill="x", pady=(2, 0))
+        self.visible = False
+    
+    def show(self, text=""):
+        """Show the indicator in busy mode until the first update."""
+        self.label.configure(text=text)
+        self.bar.configure(mode="indeterminate")
+        self.bar.start()
+        if not self.visible:
+            if self.before is not None:
+                self.frame.pack(fill="x", padx=24, pady=(0, 4), before=self.before)
+            else:
+                self.frame.pack(fill="x", padx=24, pady=(0, 4))
+            self.visible = True
+    
+    def update(self, fraction, text=None):
+        """Show progress as a fraction between 0 and 1."""
+        if not self.visible:
+            self.show()
+        self.bar.stop()
+        self.bar.configure(mode="determinate")
+        self.bar.set(max(0.0, min(1.0, fraction)))
+        if text is not None:
+            self.label.configure(text=text)
+    
+    def hide(self):
+        """Hide the indicator."""
+        self.bar.stop()
+        self.frame.pack_forget()
+        self.visible = False
+
+
 class ApplicationWindow:
     """Main application window."""
     
@@ -233,11 +307,15 @@ class ApplicationWindow:
         self.input_area = None
         self.control_bar = None
         self.sidebar = None
+        self.progress = None
     
-    def setup_ui(self, on_new_chat, on_pdf_summarize, on_voice_toggle, on_listen, on_send_callback, author_name):
+    def setup_ui(self, on_new_chat, on_pdf_summarize, on_voice_toggle, on_listen, on_send_callback, author_name,
+                 on_continuous_toggle=None, on_pdf_batch=None, summary_profiles=None, summary_profile=None,
+                 on_profile_change=None):
         """Setup all UI components."""
         # Sidebar
-        self.sidebar = Sidebar(self.root, on_new_chat, on_pdf_summarize, author_name)
+        self.sidebar = Sidebar(self.root, on_new_chat, on_pdf_summarize, author_name, on_pdf_batch,
+                               summary_profiles, summary_profile, on_profile_change)
         
         # Main area
         main_area = ctk.CTkFrame(self.root)
@@ -252,8 +330,11 @@ class ApplicationWindow:
         # Input area
         self.input_area = InputArea(main_area, on_send_callback)
         
+        # Progress of long tasks (hidden until used), just above the input
+        self.progress = ProgressIndicator(main_area, before=self.input_area.frame)
+        
         # Control bar
-        self.control_bar = ControlBar(self.root, on_voice_toggle, on_listen)
+        self.control_bar = ControlBar(self.root, on_voice_toggle, on_listen, on_continuous_toggle)
     
     def run(self):
         """Run the application."""
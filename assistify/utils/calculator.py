@@ -0,0 +1,427 @@
+"""
+Expression engine for the calculator: parses once to an AST, compiles to
+closures and caches the compiled result.
+"""
+
+import ast
+import math
+import operator
+import time
+from utils.cache import LRUCache
+from config.settings import (
+    CALC_CACHE_SIZE, CALC_MAX_LENGTH, CALC_MAX_EXPONENT, CALC_MAX_BITS, CALC_TIME_LIMIT,
+    BULK_CHUNK_SIZE, BULK_MAX_POINTS, BULK_SAMPLE_POINTS, BULK_TIME_LIMIT
+)
+
+
+class CalculatorError(ValueError):
+    """Raised when an expression is invalid or exceeds the evaluation limits."""
+
+
+TIMEOUT_MESSAGE = "Calculation took too long"
+_clock = time.perf_counter  # read at every operator, so bound once
+
+
+FUNCTIONS = {
+    "sqrt": math.sqrt,
+    "pow": None,  # bound to the guarded power operator per engine
+    "abs": abs,
+    "round": round,
+    "floor": math.floor,
+    "ceil": math.ceil,
+    "exp": math.exp,
+    "log": math.log,
+    "log10": math.log10,
+    "log2": math.log2,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "asin": math.asin,
+    "acos": math.acos,
+    "atan": math.atan,
+    "degrees": math.degrees,
+    "radians": math.radians,
+}
+
+CONSTANTS = {
+    "pi": math.pi,
+    "e": math.e,
+    "tau": math.tau,
+}
+
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+}
+
+UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+# NumPy ufunc names used when an expression is evaluated over an array
+VECTOR_FUNCTIONS = {
+    "sqrt": "sqrt",
+    "pow": "power",
+    "abs": "abs",
+    "round": "round",
+    "floor": "floor",
+    "ceil": "ceil",
+    "exp": "exp",
+    "log": "log",
+    "log10": "log10",
+    "log2": "log2",
+    "sin": "sin",
+    "cos": "cos",
+    "tan": "tan",
+    "asin": "arcsin",
+    "acos": "arccos",
+    "atan": "arctan",
+    "degrees": "degrees",
+    "radians": "radians",
+}
+
+
+class ExpressionEngine:
+    """Compiles arithmetic expressions into cached, guarded callables."""
+
+    def __init__(self, cache_size=CALC_CACHE_SIZE, max_exponent=CALC_MAX_EXPONENT,
+                 max_bits=CALC_MAX_BITS, time_limit=CALC_TIME_LIMIT):
+        """
+        Args:
+            cache_size (int): Number of compiled expressions kept
+            max_exponent (int): Largest absolute exponent allowed in ``**``/``pow``
+            max_bits (int): Largest integer result (in bits) a power may produce
+            time_limit (float): Seconds an evaluation may run before it is aborted
+        """
+        self.max_exponent = max_exponent
+        self.max_bits = max_bits
+        self.time_limit = time_limit
+        self._cache = LRUCache(cache_size)
+        self._functions = dict(FUNCTIONS, pow=self._power)
+
+    def evaluate(self, expr):
+        """
+        Evaluate an expression.
+
+        Args:
+            expr (str): Arithmetic expression, e.g. ``"sqrt(16) + 2**3"``
+
+        Returns:
+            int or float: Result
+
+        Raises:
+            CalculatorError: If the expression is invalid or exceeds the limits
+        """
+        compiled = self.compile(expr)
+        deadline = time.perf_counter() + self.time_limit
+        try:
+            result = compiled(deadline)
+        except CalculatorError:
+            raise
+        except (ArithmeticError, ValueError, TypeError, RecursionError) as e:
+            raise CalculatorError(str(e)) from e
+        if isinstance(result, complex):
+            raise CalculatorError("Result is not a real number")
+        if isinstance(result, int) and result.bit_length() > self.max_bits:
+            raise CalculatorError("Result too large")
+        return result
+
+    def compile(self, expr):
+        """
+        Parse and compile an expression, using the cache when possible.
+
+        Returns:
+            callable: Function taking a ``time.perf_counter()`` deadline
+        """
+        key = expr.strip()
+        compiled = self._cache.get(key)
+        if compiled is None:
+            try:
+                compiled = self._compile_source(key)
+            except CalculatorError as e:
+                compiled = e
+            self._cache.set(key, compiled)
+        if isinstance(compiled, CalculatorError):
+            raise CalculatorError(str(compiled))
+        return compiled
+
+    def _compile_source(self, expr):
+        """Parse source text into a compiled callable."""
+        if not expr:
+            raise CalculatorError("Empty expression")
+        if len(expr) > CALC_MAX_LENGTH:
+            raise CalculatorError("Expression too long")
+        try:
+            tree = ast.parse(expr, mode="eval")
+            return self._compile_node(tree.body)
+        except (SyntaxError, ValueError, RecursionError) as e:
+            if isinstance(e, CalculatorError):
+                raise
+            raise CalculatorError(f"Invalid expression: {expr}") from e
+
+    def _compile_node(self, node):
+        """Recursively turn an AST node into a closure; every operator checks the deadline."""
+        if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+            value = node.value
+            return lambda deadline: value
+
+        if isinstance(node, ast.Name):
+            if node.id not in CONSTANTS:
+                raise CalculatorError(f"Unknown name: {node.id}")
+            value = CONSTANTS[node.id]
+            return lambda deadline: value
+
+        if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+            op = UNARY_OPERATORS[type(node.op)]
+            operand = self._compile_node(node.operand)
+            def evaluate_unary(deadline):
+                value = operand(deadline)
+                if _clock() > deadline:
+                    raise CalculatorError(TIMEOUT_MESSAGE)
+                return op(value)
+            return evaluate_unary
+
+        if isinstance(node, ast.BinOp):
+            left = self._compile_node(node.left)
+            right = self._compile_node(node.right)
+            if isinstance(node.op, ast.Pow):
+                power = self._power
+                def evaluate_power(deadline):
+                    base, exponent = left(deadline), right(deadline)
+                    self._check_deadline(deadline)
+                    return power(base, exponent)
+                return evaluate_power
+            if type(node.op) in BINARY_OPERATORS:
+                op = BINARY_OPERATORS[type(node.op)]
+                def evaluate_binary(deadline):
+                    a, b = left(deadline), right(deadline)
+                    if _clock() > deadline:
+                        raise CalculatorError(TIMEOUT_MESSAGE)
+                    return op(a, b)
+                return evaluate_binary
+
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+            func = self._functions.get(node.func.id)
+            if func is None:
+                raise CalculatorError(f"Unknown function: {node.func.id}")
+            args = [self._compile_node(arg) for arg in node.args]
+            def evaluate_call(deadline):
+                values = [arg(deadline) for arg in args]
+                self._check_deadline(deadline)
+                return func(*values)
+            return evaluate_call
+
+        raise CalculatorError(f"Unsupported syntax: {type(node).__name__}")
+
+    def evaluate_many(self, expressions):
+        """
+        Evaluate a batch of scalar expressions.
+        
+        Repeated expressions are compiled and evaluated once.
+        
+        Args:
+            expressions (list): Expression strings
+            
+        Returns:
+            dict: ``results`` (value or None per expression), ``errors`` count
+                and summary statistics over the numeric results
+        """
+        seen = {}
+        results = []
+        for expr in expressions:
+            key = expr.strip()
+            if key not in seen:
+                try:
+                    seen[key] = self.evaluate(key)
+                except CalculatorError:
+                    seen[key] = None
+            results.append(seen[key])
+        
+        values = [r for r in results if r is not None]
+        summary = {"results": results, "errors": len(results) - len(values), "count": len(values)}
+        if values:
+            floats = [float(v) for v in values]
+            mean = math.fsum(floats) / len(floats)
+            summary.update({
+                "min": min(floats),
+                "max": max(floats),
+                "mean": mean,
+                "std": math.sqrt(math.fsum((v - mean) ** 2 for v in floats) / len(floats)),
+            })
+        return summary
+
+    def evaluate_range(self, expr, variable, start, stop, step=1, samples=BULK_SAMPLE_POINTS):
+        """
+        Evaluate an expression over an inclusive range of values with NumPy.
+        
+        The range is processed in ``BULK_CHUNK_SIZE`` slices so memory stays
+        flat regardless of the range length; only summary statistics and an
+        evenly spaced sample of the results are kept.
+        
+        Args:
+            expr (str): Expression using ``variable``, e.g. ``"x**2 + 1"``
+            variable (str): Variable name
+            start (float): First value
+            stop (float): Last value (inclusive)
+            step (float): Increment
+            samples (int): Number of (value, result) pairs to return
+            
+        Returns:
+            dict: ``count``, ``invalid`` (non-finite results), ``min``, ``max``,
+                ``mean``, ``std`` and ``samples``
+            
+        Raises:
+            CalculatorError: If the expression or range is invalid or too large
+        """
+        import numpy as np
+        
+        if step == 0 or (stop - start) * step < 0:
+            raise CalculatorError("Invalid range")
+        total = int(math.floor((stop - start) / step + 1e-9)) + 1
+        if total > BULK_MAX_POINTS:
+            raise CalculatorError(f"Range too large (max {BULK_MAX_POINTS:,} values)")
+        
+        compiled = self.compile_vectorized(expr, variable)
+        sample_at = np.unique(np.linspace(0, total - 1, min(samples, total)).astype(np.int64))
+        deadline = time.perf_counter() + BULK_TIME_LIMIT
+        
+        count = invalid = 0
+        mean = m2 = 0.0
+        low, high = math.inf, -math.inf
+        sampled = []
+        for offset in range(0, total, BULK_CHUNK_SIZE):
+            self._check_deadline(deadline)
+            size = min(BULK_CHUNK_SIZE, total - offset)
+            x = start + step * np.arange(offset, offset + size, dtype=np.float64)
+            try:
+                with np.errstate(all="ignore"):
+                    y = np.broadcast_to(np.asarray(compiled(x), dtype=np.float64), x.shape)
+            except (ArithmeticError, ValueError, TypeError) as e:
+                raise CalculatorError(str(e)) from e
+            
+            picks = sample_at[(sample_at >= offset) & (sample_at < offset + size)] - offset
+            sampled.extend(zip(x[picks].tolist(), y[picks].tolist()))
+            
+            finite = y[np.isfinite(y)]
+            invalid += size - finite.size
+            if finite.size:
+                # Chan et al. parallel update of the running mean and variance
+                chunk_mean = float(finite.mean())
+                chunk_m2 = float(((finite - chunk_mean) ** 2).sum())
+                n = count + finite.size
+                delta = chunk_mean - mean
+                mean += delta * finite.size / n
+                m2 += chunk_m2 + delta * delta * count * finite.size / n
+                count = n
+                low = min(low, float(finite.min()))
+                high = max(high, float(finite.max()))
+        
+        result = {"count": count, "invalid": invalid, "samples": sampled}
+        if count:
+            result.update({"min": low, "max": high, "mean": mean, "std": math.sqrt(m2 / count)})
+        return result
+
+    def compile_vectorized(self, expr, variable):
+        """
+        Compile an expression into a function of one NumPy array.
+        
+        Args:
+            expr (str): Expression source
+            variable (str): Name bound to the input array
+            
+        Returns:
+            callable: Function mapping an array to an array (or scalar)
+        """
+        import numpy as np
+        
+        key = ("vector", variable, expr.strip())
+        compiled = self._cache.get(key)
+        if compiled is None:
+            expr = expr.strip()
+            if not expr or len(expr) > CALC_MAX_LENGTH:
+                raise CalculatorError("Invalid expression length")
+            try:
+                tree = ast.parse(expr, mode="eval")
+                compiled = self._compile_vector_node(tree.body, variable, np)
+            except (SyntaxError, ValueError, RecursionError) as e:
+                if isinstance(e, CalculatorError):
+                    raise
+                raise CalculatorError(f"Invalid expression: {expr}") from e
+            self._cache.set(key, compiled)
+        return compiled
+
+    def _compile_vector_node(self, node, variable, np):
+        """Recursively turn an AST node into a closure over a NumPy array."""
+        if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+            value = float(node.value)
+            return lambda x: value
+
+        if isinstance(node, ast.Name):
+            if node.id == variable:
+                return lambda x: x
+            if node.id not in CONSTANTS:
+                raise CalculatorError(f"Unknown name: {node.id}")
+            value = CONSTANTS[node.id]
+            return lambda x: value
+
+        if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+            op = UNARY_OPERATORS[type(node.op)]
+            operand = self._compile_vector_node(node.operand, variable, np)
+            return lambda x: op(operand(x))
+
+        if isinstance(node, ast.BinOp):
+            left = self._compile_vector_node(node.left, variable, np)
+            right = self._compile_vector_node(node.right, variable, np)
+            if isinstance(node.op, ast.Pow):
+                return lambda x: self._vector_power(np, left(x), right(x))
+            if type(node.op) in BINARY_OPERATORS:
+                op = BINARY_OPERATORS[type(node.op)]
+                return lambda x: op(left(x), right(x))
+
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+            name = VECTOR_FUNCTIONS.get(node.func.id)
+            if name is None:
+                raise CalculatorError(f"Unknown function: {node.func.id}")
+            args = [self._compile_vector_node(arg, variable, np) for arg in node.args]
+            if name == "power":
+                if len(args) != 2:
+                    raise CalculatorError("pow() takes two arguments")
+                base, exponent = args
+                return lambda x: self._vector_power(np, base(x), exponent(x))
+            func = getattr(np, name)
+            return lambda x: func(*[arg(x) for arg in args])
+
+        raise CalculatorError(f"Unsupported syntax: {type(node).__name__}")
+
+    def _vector_power(self, np, base, exponent):
+        """Element-wise power with the same exponent guard as scalar evaluation."""
+        if np.max(np.abs(exponent)) > self.max_exponent:
+            raise CalculatorError("Exponent too large")
+        return np.power(np.asarray(base, dtype=np.float64), exponent)
+
+    def _power(self, base, exponent):
+        """Exponentiation that rejects results too large to compute quickly."""
+        if abs(exponent) > self.max_exponent:
+            raise CalculatorError("Exponent too large")
+        if isinstance(base, int) and isinstance(exponent, int) and exponent > 0:
+            if abs(base).bit_length() * exponent > self.max_bits:
+                raise CalculatorError("Result too large")
+        result = operator.pow(base, exponent)
+        if isinstance(result, complex):
+            # A negative base with a fractional exponent
+            raise CalculatorError("Result is not a real number")
+        return result
+
+    @staticmethod
+    def _check_deadline(deadline):
+        """Abort evaluations that run past their time budget."""
+        if _clock() > deadline:
+            raise CalculatorError(TIMEOUT_MESSAGE)
+
+
+default_engine = ExpressionEngine()
@@ -0,0 +1,164 @@
+"""
+CPU resources for model inference.
+
+Torch sizes its thread pools to every logical CPU by default, so the
+summarizer competes with the Tk, speech and search threads and with its
+own hyperthread siblings. ``InferenceResources`` derives thread counts from
+settings and the CPU topology, applies them once per process, and can pin
+the thread that runs the model to chosen cores.
+"""
+
+import os
+import threading
+from config.settings import (
+    INFERENCE_THREADS, INFERENCE_INTEROP_THREADS, INFERENCE_RESERVED_CORES, INFERENCE_CPU_CORES
+)
+
+
+def parse_cores(spec):
+    """
+    Parse a core list such as ``"0-3,6"``.
+
+    Args:
+        spec (str, iterable or None): Core spec, core numbers, or None
+
+    Returns:
+        list or None: Sorted core numbers, or None for no pinning
+    """
+    if spec is None or spec == "":
+        return None
+    if not isinstance(spec, str):
+        return sorted(set(int(core) for core in spec))
+    cores = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-", 1)
+            cores.update(range(int(first), int(last) + 1))
+        else:
+            cores.add(int(part))
+    return sorted(cores)
+
+
+def available_cores():
+    """Cores this process may run on (all CPUs where affinity is unsupported)."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def physical_cores(cores):
+    """
+    Number of physical cores among logical CPUs (hyperthread siblings count once).
+
+    Args:
+        cores (list): Logical CPU numbers
+
+    Returns:
+        int: Physical cores; ``len(cores)`` when the topology is unknown
+    """
+    siblings = set()
+    for core in cores:
+        try:
+            with open(f"/sys/devices/system/cpu/cpu{core}/topology/thread_siblings_list", "r") as f:
+                siblings.add(f.read().strip())
+        except OSError:
+            break
+    else:
+        if siblings:
+            return len(siblings)
+    try:
+        import psutil
+    except ImportError:
+        return len(cores)
+    logical, physical = psutil.cpu_count(), psutil.cpu_count(logical=False)
+    if not logical or not physical:
+        return len(cores)
+    return max(1, len(cores) * physical // logical)
+
+
+class InferenceResources:
+    """Thread counts and core pinning for torch inference."""
+
+    _applied = None  # plan applied to this process; torch allows setting inter-op threads once
+    _apply_lock = threading.Lock()
+
+    def __init__(self, threads=INFERENCE_THREADS, interop_threads=INFERENCE_INTEROP_THREADS,
+                 cores=INFERENCE_CPU_CORES, reserved=INFERENCE_RESERVED_CORES):
+        """
+        Args:
+            threads (int or None): Intra-op threads (None: from the topology)
+            interop_threads (int or None): Inter-op threads (None: torch default)
+            cores (str, list or None): Cores to pin the inference thread to
+            reserved (int): Cores left to other threads when ``threads`` is None
+        """
+        self.threads = threads
+        self.interop_threads = interop_threads
+        self.cores = parse_cores(cores)
+        self.reserved = reserved
+
+    def plan(self):
+        """
+        Resolve the settings against this machine.
+
+        Returns:
+            dict: 'threads', 'interop_threads' and 'cores' (None: not pinned)
+        """
+        usable = available_cores()
+        cores = [core for core in self.cores if core in usable] if self.cores else None
+        if self.threads:
+            threads = self.threads
+        elif cores:
+            # Pinned cores are the model's alone
+            threads = physical_cores(cores)
+        else:
+            threads = max(1, physical_cores(usable) - self.reserved)
+        return {"threads": threads, "interop_threads": self.interop_threads, "cores": cores or None}
+
+    def apply(self):
+        """
+        Set torch's thread pools (first call in the process wins; later plans
+        only change the intra-op count, which torch allows at any time).
+
+        Returns:
+            dict: The plan in effect (not applied when torch is not installed)
+        """
+        plan = self.plan()
+        try:
+            import torch
+        except ImportError:
+            return plan
+        with InferenceResources._apply_lock:
+            if InferenceResources._applied is None and plan["interop_threads"]:
+                try:
+                    torch.set_num_interop_threads(plan["interop_threads"])
+                except RuntimeError as e:
+                    # Raised once any inter-op work has run
+                    print(f"Inference inter-op threads not set: {e}")
+            torch.set_num_threads(plan["threads"])
+            InferenceResources._applied = plan
+        return plan
+
+    def pin_current_thread(self):
+        """
+        Pin the calling thread to the configured cores. Torch creates its
+        worker threads from the first thread that runs a model, and they
+        inherit its affinity, so call this before the first inference.
+
+        Returns:
+            bool: Whether the thread is pinned
+        """
+        cores = self.plan()["cores"]
+        if not cores:
+            return False
+        if not hasattr(os, "sched_setaffinity"):
+            print("Inference core pinning is only supported on Linux")
+            return False
+        try:
+            os.sched_setaffinity(0, cores)  # 0: the calling thread
+            return True
+        except OSError as e:
+            print(f"Inference core pinning error: {e}")
+            return False
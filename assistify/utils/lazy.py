@@ -0,0 +1,69 @@
+"""
+Deferred imports and on-first-use construction, to keep startup fast.
+"""
+
+import importlib.util
+import sys
+import threading
+
+_MISSING = object()
+
+
+def lazy_import(name):
+    """
+    Import a module on first attribute access instead of now.
+
+    A missing module still raises ``ImportError`` immediately; only executing
+    the module body is deferred.
+
+    Args:
+        name (str): Absolute module name
+
+    Returns:
+        module: The module (already loaded if it was imported before)
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+class lazy_property:
+    """
+    Attribute computed on first access and then stored on the instance.
+
+    Construction runs once even when several threads ask at the same time;
+    later reads hit the instance ``__dict__`` directly.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.name = factory.__name__
+        self.__doc__ = factory.__doc__
+        self._lock = threading.RLock()
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = instance.__dict__.get(self.name, _MISSING)
+        if value is _MISSING:
+            with self._lock:
+                value = instance.__dict__.get(self.name, _MISSING)
+                if value is _MISSING:
+                    value = self.factory(instance)
+                    instance.__dict__[self.name] = value
+        return value
+
+    def is_loaded(self, instance):
+        """Check whether the value has been built for ``instance``."""
+        return self.name in instance.__dict__
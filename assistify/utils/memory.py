@@ -0,0 +1,47 @@
+"""
+Process memory readings for memory-bounded processing and benchmarks.
+
+Current resident set size comes from ``/proc/self/statm`` on Linux and from
+``psutil`` elsewhere when it is installed; without either, ``rss_mb``
+returns None and callers fall back to fixed limits.
+"""
+
+import os
+import sys
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_mb():
+    """
+    Current resident set size of this process.
+
+    Returns:
+        float or None: Megabytes, or None if it cannot be measured here
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+def peak_rss_mb():
+    """
+    Highest resident set size this process has reached.
+
+    Returns:
+        float or None: Megabytes, or None where ``resource`` is unavailable (Windows)
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
@@ -0,0 +1,261 @@
+"""
+Lightweight timing spans for startup and hot paths.
+
+Spans go to an in-memory ring buffer and can be summarized as percentiles
+or exported as JSON / Chrome trace (open in chrome://tracing or Perfetto).
+Profiling is off unless ``ASSISTIFY_PROFILE=1``; when off, ``span`` returns
+a shared no-op object and ``timed`` adds one attribute check per call.
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from config.settings import PROFILING_ENABLED, PROFILING_BUFFER_SIZE, PROFILING_TRACE_FILE
+
+
+class _NullSpan:
+    """Stand-in returned while profiling is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """A timed region; use as a context manager."""
+
+    __slots__ = ("profiler", "name", "args", "start")
+
+    def __init__(self, profiler, name, args):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.profiler.record(self.name, self.start, end - self.start, self.args)
+        return False
+
+    def set(self, **args):
+        """Attach details learned inside the span (result counts, status codes, ...)."""
+        self.args.update(args)
+
+
+class Profiler:
+    """Collects spans from all threads into a bounded buffer."""
+
+    def __init__(self, enabled=PROFILING_ENABLED, buffer_size=PROFILING_BUFFER_SIZE):
+        self.enabled = enabled
+        self._events = deque(maxlen=buffer_size)
+        self._origin = time.perf_counter()
+
+    def enable(self):
+        """Start recording spans."""
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording spans; recorded ones are kept."""
+        self.enabled = False
+
+    def clear(self):
+        """Drop all recorded spans."""
+        self._events.clear()
+
+    def span(self, name, **args):
+        """
+        Time a block of code.
+
+        Args:
+            name (str): Span name, dotted by area (e.g. ``"search.wikipedia"``)
+            **args: Details stored with the span
+
+        Returns:
+            Span: Context manager (a no-op one while profiling is off)
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, args)
+
+    def timed(self, name=None):
+        """
+        Decorator that records a span for every call.
+
+        Args:
+            name (str or None): Span name (defaults to the function's qualified name)
+        """
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with Span(self, span_name, {}):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, name, start, duration, args=None):
+        """
+        Store a finished span.
+
+        Args:
+            name (str): Span name
+            start (float): ``time.perf_counter()`` at the start
+            duration (float): Seconds
+            args (dict or None): Details
+        """
+        thread = threading.current_thread()
+        # deque.append is atomic, so no lock is needed on the hot path
+        self._events.append((name, start, duration, thread.ident, thread.name, args or {}))
+
+    def events(self):
+        """
+        Recorded spans, oldest first.
+
+        Returns:
+            list: Dicts with name, start/duration in ms, thread and args
+        """
+        return [
+            {"name": name, "start_ms": (start - self._origin) * 1000, "duration_ms": duration * 1000,
+             "thread": thread_name, "args": args}
+            for name, start, duration, _, thread_name, args in list(self._events)
+        ]
+
+    def stats(self):
+        """
+        Aggregate recorded spans by name.
+
+        Returns:
+            dict: Name -> count, total/mean/max and p50/p95/p99 in milliseconds
+        """
+        durations = {}
+        for name, _, duration, _, _, _ in list(self._events):
+            durations.setdefault(name, []).append(duration * 1000)
+
+        summary = {}
+        for name, values in durations.items():
+            values.sort()
+            summary[name] = {
+                "count": len(values),
+                "total_ms": sum(values),
+                "mean_ms": sum(values) / len(values),
+                "p50_ms": percentile(values, 50),
+                "p95_ms": percentile(values, 95),
+                "p99_ms": percentile(values, 99),
+                "max_ms": values[-1],
+            }
+        return summary
+
+    def report(self):
+        """
+        Format ``stats()`` as a table, slowest total first.
+
+        Returns:
+            str: Printable table
+        """
+        lines = [f"{'span':<36}{'count':>7}{'p50 (ms)':>11}{'p95 (ms)':>11}{'p99 (ms)':>11}{'total (ms)':>13}"]
+        for name, s in sorted(self.stats().items(), key=lambda item: -item[1]["total_ms"]):
+            lines.append(f"{name:<36}{s['count']:>7}{s['p50_ms']:>11.2f}{s['p95_ms']:>11.2f}"
+                         f"{s['p99_ms']:>11.2f}{s['total_ms']:>13.1f}")
+        return "\n".join(lines)
+
+    def to_json(self, path=None):
+        """
+        Export spans and aggregates as JSON.
+
+        Args:
+            path (str or None): File to write; the JSON text is returned either way
+
+        Returns:
+            str: JSON document
+        """
+        data = json.dumps({"stats": self.stats(), "events": self.events()}, indent=2, default=str)
+        if path:
+            _write(path, data)
+        return data
+
+    def to_chrome_trace(self, path=None):
+        """
+        Export spans in Chrome trace event format.
+
+        Args:
+            path (str or None): File to write; the JSON text is returned either way
+
+        Returns:
+            str: JSON document for chrome://tracing or Perfetto
+        """
+        pid = os.getpid()
+        events, threads = [], {}
+        for name, start, duration, tid, thread_name, args in list(self._events):
+            threads[tid] = thread_name
+            events.append({
+                "name": name, "cat": name.split(".", 1)[0], "ph": "X", "pid": pid, "tid": tid,
+                "ts": (start - self._origin) * 1e6, "dur": duration * 1e6, "args": args,
+            })
+        for tid, thread_name in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}})
+        data = json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, default=str)
+        if path:
+            _write(path, data)
+        return data
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[min(int(rank), len(sorted_values)) - 1]
+
+
+def _write(path, data):
+    """Write an export, creating the directory if needed."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(data)
+
+
+profiler = Profiler()
+span = profiler.span
+timed = profiler.timed
+
+
+def _export_at_exit():
+    """Print the summary and save a Chrome trace when ``ASSISTIFY_PROFILE_TRACE`` names a file."""
+    if not profiler._events:
+        return
+    if profiler.enabled:
+        print(profiler.report())
+    if PROFILING_TRACE_FILE:
+        try:
+            profiler.to_chrome_trace(PROFILING_TRACE_FILE)
+            print(f"Profile trace written to {PROFILING_TRACE_FILE}")
+        except OSError as e:
+            print(f"Profile export error: {e}")
+
+
+atexit.register(_export_at_exit)
@@ -0,0 +1,226 @@
+"""
+Single-pass message preprocessing shared by the chatbot handlers and validators.
+"""
+
+import re
+
+# Punctuation split off into separate tokens. "*", "/" and "." are left alone
+# so "**", "//" and decimals stay intact.
+SEPARATE_PUNCTUATION = "+-^%(),;!?:\""
+NUMBER_PATTERN = re.compile(r"\d*\.?\d+(?:e[+-]?\d+)?$")
+TIMES_PATTERN = re.compile(r"(?<=\d)\s*x\s*(?=\.?\d)")  # "5 x 4" and "5x4"
+OPERATOR_CHARACTERS = "+-*/^%()"
+
+# Spoken operators mapped to the symbols the calculator understands. Filler
+# words map to "" so phrases like "divided by" or "to the power of" collapse.
+MATH_WORDS = {
+    "plus": "+",
+    "add": "+",
+    "minus": "-",
+    "subtract": "-",
+    "times": "*",
+    "multiply": "*",
+    "multiplied": "*",
+    "divide": "/",
+    "divided": "/",
+    "power": "**",
+    "^": "**",
+    "what's": "",
+    "what": "",
+    "is": "",
+    "calculate": "",
+    "compute": "",
+    "evaluate": "",
+    "equals": "",
+    "raised": "",
+    "by": "",
+    "to": "",
+    "the": "",
+    "of": "",
+}
+# Operator words that are also plain English ("game over"); they only count
+# between two numbers
+INFIX_WORDS = {
+    "over": "/",
+    "mod": "%",
+}
+# Tokens that make a message math: operator symbols (split off by the
+# tokenizer, except "*" and "/") and spoken operators
+MATH_TOKENS = frozenset(c for c in OPERATOR_CHARACTERS if c in SEPARATE_PUNCTUATION) | frozenset(
+    word for word, symbol in MATH_WORDS.items() if symbol
+)
+_AFTER_PATTERNS = {}  # compiled ``Message.after`` patterns by word run
+
+
+class Message:
+    """A user message tokenized once and shared by every handler."""
+
+    __slots__ = ("raw", "text", "tokens", "token_set", "_math_expression")
+
+    def __init__(self, raw):
+        """
+        Args:
+            raw (str): Message as typed or recognized
+        """
+        self.raw = raw
+        self.text = raw.lower().strip()
+        text = self.text.rstrip(".").replace(". ", " ")
+        # One C-level scan per character beats str.translate with a multi-character table
+        for c in SEPARATE_PUNCTUATION:
+            if c in text:
+                text = text.replace(c, f" {c} ")
+        self.tokens = text.split()
+        self.token_set = frozenset(self.tokens)
+        self._math_expression = None
+
+    def has(self, *words):
+        """Check that every word appears as a token."""
+        return self.token_set.issuperset(words)
+
+    def has_any(self, *words):
+        """Check that at least one word appears as a token."""
+        return not self.token_set.isdisjoint(words)
+
+    def find(self, *words):
+        """
+        Locate a consecutive run of tokens.
+
+        Returns:
+            int: Index of the token after the run, or -1 if not found
+        """
+        if not self.has(*words):
+            return -1
+        n = len(words)
+        tokens = self.tokens
+        for i in range(len(tokens) - n + 1):
+            if tokens[i] == words[0] and tuple(tokens[i:i + n]) == words:
+                return i + n
+        return -1
+
+    def after(self, *words):
+        """
+        Get the text following a run of words.
+
+        Returns:
+            str or None: Remaining text (stripped) or None if the run is absent
+        """
+        if not self.has(*words):
+            return None
+        pattern = _AFTER_PATTERNS.get(words)
+        if pattern is None:
+            pattern = _AFTER_PATTERNS[words] = re.compile(r"\b" + r"\s+".join(map(re.escape, words)) + r"\b")
+        match = pattern.search(self.text)
+        if not match:
+            return None
+        return self.text[match.end():].strip()
+
+    def number_after(self, *words):
+        """
+        Get the number directly following a run of tokens.
+
+        Returns:
+            int or float or None: The number or None
+        """
+        end = self.find(*words)
+        if end < 0 or end >= len(self.tokens):
+            return None
+        token = self.tokens[end]
+        if not NUMBER_PATTERN.match(token):
+            return None
+        return float(token) if "." in token or "e" in token else int(token)
+
+    def without(self, *words):
+        """Join the tokens that are not in ``words``."""
+        skip = set(words)
+        return " ".join(t for t in self.tokens if t not in skip)
+
+    @property
+    def has_math(self):
+        """Check for operator symbols, spoken operators or "x" between numbers without building the expression."""
+        if not MATH_TOKENS.isdisjoint(self.token_set) or "*" in self.text or "/" in self.text:
+            return True
+        if not self.token_set.isdisjoint(INFIX_WORDS):
+            tokens = self.tokens
+            if any(t in INFIX_WORDS and _between_numbers(tokens, i) for i, t in enumerate(tokens)):
+                return True
+        return "x" in self.text and TIMES_PATTERN.search(self.text) is not None
+
+    @property
+    def math_expression(self):
+        """Calculator expression with spoken operators rewritten (computed once)."""
+        if self._math_expression is None:
+            tokens = self.tokens
+            symbols = list(map(MATH_WORDS.get, tokens, tokens))
+            if not self.token_set.isdisjoint(INFIX_WORDS):
+                for i, token in enumerate(tokens):
+                    if token in INFIX_WORDS and _between_numbers(tokens, i):
+                        symbols[i] = INFIX_WORDS[token]
+            expression = " ".join(symbols)
+            if "x" in expression:
+                # "x" only means multiply between two numbers, spaced or not
+                expression = TIMES_PATTERN.sub(" * ", expression)
+            self._math_expression = expression
+        return self._math_expression
+
+
+def _between_numbers(tokens, i):
+    """Whether the tokens on both sides of position ``i`` are numbers."""
+    if not 0 < i < len(tokens) - 1:
+        return False
+    return NUMBER_PATTERN.match(tokens[i - 1]) is not None and NUMBER_PATTERN.match(tokens[i + 1]) is not None
+
+
+def tokenize(text):
+    """
+    Preprocess a message once for all handlers.
+
+    Args:
+        text (str or Message): User input
+
+    Returns:
+        Message: Tokenized message (returned unchanged if already tokenized)
+    """
+    if isinstance(text, Message):
+        return text
+    return Message(text)
+
+
+SENTENCE_END_PATTERN = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+class SentenceSplitter:
+    """Incremental sentence splitter for text that arrives in pieces."""
+    
+    def __init__(self):
+        self._buffer = ""
+    
+    def feed(self, text):
+        """
+        Add text and collect the sentences it completes.
+        
+        Args:
+            text (str): Next piece of text
+            
+        Returns:
+            list: Complete sentences, stripped
+        """
+        self._buffer += text
+        sentences = []
+        start = 0
+        for match in SENTENCE_END_PATTERN.finditer(self._buffer):
+            sentence = self._buffer[start:match.start()].strip()
+            if sentence:
+                sentences.append(sentence)
+            start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+    
+    def flush(self):
+        """
+        Return the trailing partial sentence, if any, and reset.
+        
+        Returns:
+            str or None: Remaining text
+        """
+        rest, self._buffer = self._buffer.strip(), ""
+        return rest or None
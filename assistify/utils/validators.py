@@ -3,44 +3,66 @@ Utility functions for calculator, validators, and common operations.
 """
 
 import re
-import math
+import datetime
+from utils.calculator import default_engine, CalculatorError
+from utils.tokenizer import tokenize
 
 
 def safe_eval(expr):
     """
     Safely evaluate mathematical expressions with allowed operations.
     
+    Expressions are compiled once by the shared ``ExpressionEngine`` and
+    cached, so repeated calculations skip parsing.
+    
     Args:
         expr (str): Mathematical expression
         
     Returns:
         float or None: Result of calculation or None if invalid
     """
-    if not re.match(r"^[\d+\-*/().\s]+$", expr):
-        return None
     try:
-        result = eval(expr, {"__builtins__": None}, {"sqrt": math.sqrt, "pow": pow})
-        return result
-    except Exception:
+        return default_engine.evaluate(expr)
+    except CalculatorError:
         return None
 
 
+def parse_range_expression(text):
+    """
+    Parse a bulk calculation such as "x^2+1 for x in 1..1e6 step 2".
+    
+    Args:
+        text (str or Message): User input
+        
+    Returns:
+        tuple or None: (expression, variable, start, stop, step) or None
+    """
+    message = tokenize(text)
+    if not message.has("for", "in"):
+        return None
+    number = r"-?\d+(?:\.\d+)?(?:e\d+)?"
+    match = re.search(
+        rf"^(?:calculate |compute |evaluate )?(.+?)\s+for\s+([a-z])\s+in\s+({number})\s*\.\.\s*({number})"
+        rf"(?:\s+step\s+({number}))?$",
+        message.text
+    )
+    if not match:
+        return None
+    expr, variable, start, stop, step = match.groups()
+    return expr.replace("^", "**"), variable, float(start), float(stop), float(step) if step else 1.0
+
+
 def parse_math_expression(text):
     """
     Convert natural language to mathematical expression.
     
     Args:
-        text (str): Natural language input
+        text (str or Message): Natural language input
         
     Returns:
         str: Mathematical expression
     """
-    expr = text.replace("plus", "+").replace("add", "+")
-    expr = expr.replace("minus", "-").replace("subtract", "-")
-    expr = expr.replace("times", "*").replace("multiply", "*").replace("x", "*")
-    expr = expr.replace("divide", "/").replace("divided by", "/")
-    expr = expr.replace("power", "**").replace("^", "**")
-    return expr
+    return tokenize(text).math_expression
 
 
 def extract_name_from_input(text):
@@ -48,14 +70,14 @@ def extract_name_from_input(text):
     Extract name from "my name is ..." pattern.
     
     Args:
-        text (str): User input
+        text (str or Message): User input
         
     Returns:
         str or None: Extracted name or None
     """
-    match = re.search(r"my name is (.+)", text.lower())
-    if match:
-        return match.group(1).strip().title()
+    name = tokenize(text).after("my", "name", "is")
+    if name:
+        return name.title()
     return None
 
 
@@ -64,12 +86,61 @@ def extract_task_number(text):
     Extract task number from delete task commands.
     
     Args:
-        text (str): User input
+        text (str or Message): User input
         
     Returns:
         int or None: Task number (1-indexed) or None
     """
-    match = re.search(r"delete task (\d+)", text.lower())
-    if match:
-        return int(match.group(1))
+    number = tokenize(text).number_after("delete", "task")
+    if isinstance(number, int):
+        return number
     return None
+
+
+def extract_due_date(text):
+    """
+    Extract a due date from task text such as "... by 2024-05-01" or "... due tomorrow".
+    
+    Args:
+        text (str): Task text
+        
+    Returns:
+        tuple: (task text without the due phrase, ISO date string or None)
+    """
+    match = re.search(
+        r"\s*\b(?:by|due|on)\s+(\d{4}-\d{2}-\d{2}|today|tomorrow|in (\d+) days?)\s*$",
+        text, re.IGNORECASE
+    )
+    if not match:
+        return text.strip(), None
+    
+    when = match.group(1).lower()
+    today = datetime.date.today()
+    if when == "today":
+        due = today
+    elif when == "tomorrow":
+        due = today + datetime.timedelta(days=1)
+    elif match.group(2):
+        due = today + datetime.timedelta(days=int(match.group(2)))
+    else:
+        try:
+            due = datetime.date.fromisoformat(when)
+        except ValueError:
+            return text.strip(), None
+    return text[:match.start()].strip(), due.isoformat()
+
+
+def extract_page_number(text):
+    """
+    Extract a page number from "... page N" requests.
+    
+    Args:
+        text (str or Message): User input
+        
+    Returns:
+        int: Page number (1-indexed), defaults to 1
+    """
+    number = tokenize(text).number_after("page")
+    if isinstance(number, int):
+        return number
+    return 1